@@ -16,7 +16,7 @@ from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from genesis.db.base import Base
-from genesis.models import artifact, chapter, chapter_scene, media_file, project, run, scene, transcript  # noqa: F401
+from genesis.models import artifact, caption_cache, chapter, chapter_scene, media_file, media_probe, project, run, run_job, scene, transcript, transcript_segment  # noqa: F401
 from genesis.db import session as db_session
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,35 @@
+"""add caption cache
+
+Revision ID: 0003_caption_cache
+Revises: 0002_scene_preview_metadata
+Create Date: 2024-06-02 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_caption_cache"
+down_revision = "0002_scene_preview_metadata"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "captioncache",
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("image_hash", sa.String(length=64), nullable=False),
+        sa.Column("model_name", sa.String(length=255), nullable=False),
+        sa.Column("caption", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("image_hash", "model_name", name="uq_captioncache_hash_model"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("captioncache")
@@ -0,0 +1,79 @@
+"""index transcript segments by time and backfill from transcript json
+
+Revision ID: 0005_transcript_segment_time_index
+Revises: 0004_transcript_segments
+Create Date: 2024-06-04 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_transcript_segment_time_index"
+down_revision = "0004_transcript_segments"
+branch_labels = None
+depends_on = None
+
+
+_SEGMENT_METADATA_KEYS = ("avg_logprob", "temperature", "compression_ratio", "words")
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_transcriptsegment_media_time",
+        "transcriptsegment",
+        ["media_file_id", "start_ms", "end_ms"],
+    )
+
+    transcript = sa.table(
+        "transcript",
+        sa.column("id", sa.Uuid()),
+        sa.column("media_file_id", sa.Uuid()),
+        sa.column("metadata_json", sa.JSON()),
+    )
+    segment = sa.table(
+        "transcriptsegment",
+        sa.column("created_at", sa.DateTime()),
+        sa.column("updated_at", sa.DateTime()),
+        sa.column("id", sa.Uuid()),
+        sa.column("transcript_id", sa.Uuid()),
+        sa.column("media_file_id", sa.Uuid()),
+        sa.column("segment_index", sa.Integer()),
+        sa.column("start_ms", sa.Integer()),
+        sa.column("end_ms", sa.Integer()),
+        sa.column("text", sa.Text()),
+        sa.column("metadata_json", sa.JSON()),
+    )
+
+    bind = op.get_bind()
+    already_normalized = set(bind.execute(sa.select(segment.c.transcript_id).distinct()).scalars())
+    now = datetime.utcnow()
+    for transcript_id, media_file_id, metadata in bind.execute(sa.select(transcript)).all():
+        if transcript_id in already_normalized:
+            continue
+        rows = [
+            {
+                "created_at": now,
+                "updated_at": now,
+                "id": uuid.uuid4(),
+                "transcript_id": transcript_id,
+                "media_file_id": media_file_id,
+                "segment_index": item.get("id", position),
+                "start_ms": int(item["start"] * 1000),
+                "end_ms": int(item["end"] * 1000),
+                "text": item.get("text", ""),
+                "metadata_json": {key: item[key] for key in _SEGMENT_METADATA_KEYS if key in item},
+            }
+            for position, item in enumerate((metadata or {}).get("segments") or [], start=1)
+        ]
+        if rows:
+            bind.execute(segment.insert(), rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transcriptsegment_media_time", table_name="transcriptsegment")
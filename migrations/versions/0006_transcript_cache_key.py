@@ -0,0 +1,35 @@
+"""add transcript cache key columns
+
+Revision ID: 0006_transcript_cache_key
+Revises: 0005_transcript_segment_time_index
+Create Date: 2024-06-05 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_transcript_cache_key"
+down_revision = "0005_transcript_segment_time_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("transcript") as batch_op:
+        batch_op.add_column(sa.Column("source_checksum", sa.String(length=128), nullable=True))
+        batch_op.add_column(sa.Column("model_name", sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column("compute_type", sa.String(length=32), nullable=True))
+        batch_op.create_index(
+            "ix_transcript_cache_key", ["source_checksum", "model_name", "compute_type"]
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("transcript") as batch_op:
+        batch_op.drop_index("ix_transcript_cache_key")
+        batch_op.drop_column("compute_type")
+        batch_op.drop_column("model_name")
+        batch_op.drop_column("source_checksum")
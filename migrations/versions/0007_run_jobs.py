@@ -0,0 +1,54 @@
+"""add run job queue
+
+Revision ID: 0007_run_jobs
+Revises: 0006_transcript_cache_key
+Create Date: 2024-06-06 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_run_jobs"
+down_revision = "0006_transcript_cache_key"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    run_job_status = sa.Enum(
+        "QUEUED",
+        "RUNNING",
+        "COMPLETED",
+        "FAILED",
+        name="run_job_status",
+    )
+    run_job_status.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "runjob",
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("run_id", sa.Uuid(), nullable=False),
+        sa.Column("status", run_job_status, nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("lease_owner", sa.String(length=255), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("options_json", sa.JSON(), nullable=True),
+        sa.Column("error_message", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(["run_id"], ["run.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("run_id"),
+    )
+    op.create_index("ix_runjob_status_lease", "runjob", ["status", "lease_expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_runjob_status_lease", table_name="runjob")
+    op.drop_table("runjob")
+
+    run_job_status = sa.Enum(name="run_job_status")
+    run_job_status.drop(op.get_bind(), checkfirst=True)
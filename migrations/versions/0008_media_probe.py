@@ -0,0 +1,44 @@
+"""add media probe cache
+
+Revision ID: 0008_media_probe
+Revises: 0007_run_jobs
+Create Date: 2024-06-07 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_media_probe"
+down_revision = "0007_run_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "mediaprobe",
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("source_checksum", sa.String(length=128), nullable=False),
+        sa.Column("duration_ms", sa.Integer(), nullable=True),
+        sa.Column("fps", sa.Float(), nullable=True),
+        sa.Column("width", sa.Integer(), nullable=True),
+        sa.Column("height", sa.Integer(), nullable=True),
+        sa.Column("video_codec", sa.String(length=32), nullable=True),
+        sa.Column("audio_codec", sa.String(length=32), nullable=True),
+        sa.Column("audio_channels", sa.Integer(), nullable=True),
+        sa.Column("audio_channel_layout", sa.String(length=64), nullable=True),
+        sa.Column("audio_sample_rate", sa.Integer(), nullable=True),
+        sa.Column("keyframes", sa.JSON(), nullable=True),
+        sa.Column("metadata_json", sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("source_checksum"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("mediaprobe")
@@ -0,0 +1,36 @@
+"""add video stream format to media probes
+
+Revision ID: 0009_media_probe_stream_format
+Revises: 0008_media_probe
+Create Date: 2024-06-09 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_media_probe_stream_format"
+down_revision = "0008_media_probe"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("mediaprobe") as batch_op:
+        batch_op.add_column(sa.Column("video_profile", sa.String(length=32), nullable=True))
+        batch_op.add_column(sa.Column("video_level", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("pix_fmt", sa.String(length=32), nullable=True))
+        batch_op.add_column(sa.Column("video_time_base", sa.String(length=32), nullable=True))
+    # Rows probed before these columns existed would never qualify for stream
+    # copy; drop them so the next render probes again.
+    op.execute("DELETE FROM mediaprobe")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("mediaprobe") as batch_op:
+        batch_op.drop_column("video_time_base")
+        batch_op.drop_column("pix_fmt")
+        batch_op.drop_column("video_level")
+        batch_op.drop_column("video_profile")
@@ -0,0 +1,29 @@
+"""record which run produced a project's stage outputs
+
+Revision ID: 0010_project_stage_outputs
+Revises: 0009_media_probe_stream_format
+Create Date: 2024-06-10 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010_project_stage_outputs"
+down_revision = "0009_media_probe_stream_format"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Left empty: the stored rows can't be attributed to a run after the fact,
+    # so each project's first run after the upgrade recomputes every stage.
+    with op.batch_alter_table("project") as batch_op:
+        batch_op.add_column(sa.Column("stage_outputs", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("project") as batch_op:
+        batch_op.drop_column("stage_outputs")
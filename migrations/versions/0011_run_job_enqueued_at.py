@@ -0,0 +1,32 @@
+"""order the run queue by a python-side enqueue timestamp
+
+Revision ID: 0011_run_job_enqueued_at
+Revises: 0010_project_stage_outputs
+Create Date: 2024-06-11 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011_run_job_enqueued_at"
+down_revision = "0010_project_stage_outputs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("runjob") as batch_op:
+        batch_op.add_column(sa.Column("enqueued_at", sa.DateTime(), nullable=True))
+    op.execute("UPDATE runjob SET enqueued_at = created_at")
+    with op.batch_alter_table("runjob") as batch_op:
+        batch_op.alter_column("enqueued_at", existing_type=sa.DateTime(), nullable=False)
+    op.create_index("ix_runjob_status_enqueued", "runjob", ["status", "enqueued_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_runjob_status_enqueued", table_name="runjob")
+    with op.batch_alter_table("runjob") as batch_op:
+        batch_op.drop_column("enqueued_at")
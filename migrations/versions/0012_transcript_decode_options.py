@@ -0,0 +1,37 @@
+"""add whisper decode options to the transcript cache key
+
+Revision ID: 0012_transcript_decode_options
+Revises: 0011_run_job_enqueued_at
+Create Date: 2024-06-12 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012_transcript_decode_options"
+down_revision = "0011_run_job_enqueued_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows keep NULL: their decode options are unknown, so they never match.
+    with op.batch_alter_table("transcript") as batch_op:
+        batch_op.add_column(sa.Column("decode_options", sa.String(length=64), nullable=True))
+        batch_op.drop_index("ix_transcript_cache_key")
+        batch_op.create_index(
+            "ix_transcript_cache_key",
+            ["source_checksum", "model_name", "compute_type", "decode_options"],
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("transcript") as batch_op:
+        batch_op.drop_index("ix_transcript_cache_key")
+        batch_op.create_index(
+            "ix_transcript_cache_key", ["source_checksum", "model_name", "compute_type"]
+        )
+        batch_op.drop_column("decode_options")
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from genesis.api.deps import get_db_session
-from genesis.schemas.run import RunRead
+from genesis.schemas.run import RunCreate, RunRead
 from genesis.services.runs import RunService
 
 router = APIRouter(prefix="/v1/projects/{project_id}", tags=["runs"])
@@ -15,9 +15,18 @@ router = APIRouter(prefix="/v1/projects/{project_id}", tags=["runs"])
 @router.post(":start", response_model=RunRead, status_code=status.HTTP_202_ACCEPTED)
 async def start_run(
     project_id: uuid.UUID,
+    payload: RunCreate | None = None,
     session: AsyncSession = Depends(get_db_session),
 ) -> RunRead:
-    run = await RunService(session).start_run(project_id)
+    payload = payload or RunCreate()
+    try:
+        run = await RunService(session).start_run(
+            project_id, render_profile=payload.render_profile
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
     if run is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     return RunRead.model_validate(run)
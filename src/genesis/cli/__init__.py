@@ -1 +1 @@
-__all__ = ["process_project"]
+__all__ = ["main", "process_project", "worker"]
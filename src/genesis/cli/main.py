@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import argparse
+from typing import Sequence
+
+from genesis.cli import process_project, worker
+
+COMMANDS = {
+    "process-project": process_project.main,
+    "worker": worker.main,
+}
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="genesis", description="Genesis pipeline commands")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments for the command")
+    args = parser.parse_args(argv)
+    COMMANDS[args.command](args.args)
+
+
+if __name__ == "__main__":
+    main()
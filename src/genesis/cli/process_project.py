@@ -4,7 +4,9 @@ import argparse
 import asyncio
 import uuid
 from pathlib import Path
+from typing import Sequence
 
+from genesis.config import get_settings
 from genesis.db.session import SessionLocal
 from genesis.services.pipeline import ProjectPipelineService
 
@@ -17,6 +19,7 @@ async def _process(
     voiceover_offset: float = 0.0,
     voiceover_gain: float = 1.0,
     bed_gain: float = 0.3,
+    render_profile: str | None = None,
 ) -> None:
     async with SessionLocal() as session:
         orchestrator = ProjectPipelineService(session)
@@ -27,6 +30,7 @@ async def _process(
             voiceover_offset=voiceover_offset,
             voiceover_gain=voiceover_gain,
             bed_gain=bed_gain,
+            render_profile=render_profile,
         )
         print(
             "Run completed",
@@ -40,7 +44,7 @@ async def _process(
         )
 
 
-def main() -> None:
+def main(argv: Sequence[str] | None = None) -> None:
     parser = argparse.ArgumentParser(description="Process a Genesis project pipeline run")
     parser.add_argument("--project-id", required=True, help="UUID of the project to process")
     parser.add_argument("--run-id", help="Optional existing run UUID")
@@ -61,9 +65,17 @@ def main() -> None:
         "--bed-gain",
         type=float,
         default=0.3,
-        help="Multiplier applied to the natural audio when narration is mixed",
+        help=(
+            "Multiplier applied to the natural audio when narration is mixed "
+            "(only while narration speaks with GENESIS_VOICEOVER_DUCKING=true)"
+        ),
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--render-profile",
+        choices=sorted(get_settings().render_profiles),
+        help="Encoder profile for the render (defaults to GENESIS_RENDER_PROFILE)",
+    )
+    args = parser.parse_args(argv)
 
     project_id = uuid.UUID(args.project_id)
     run_id = uuid.UUID(args.run_id) if args.run_id else None
@@ -77,6 +89,7 @@ def main() -> None:
             voiceover_offset=args.voiceover_offset,
             voiceover_gain=args.voiceover_gain,
             bed_gain=args.bed_gain,
+            render_profile=args.render_profile,
         )
     )
 
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import signal
+from typing import Sequence
+
+from genesis.db.session import SessionLocal
+from genesis.logging import configure_logging
+from genesis.worker import RunWorker
+
+
+async def _work(*, worker_id: str | None, concurrency: int | None, drain: bool) -> None:
+    worker = RunWorker(SessionLocal, worker_id=worker_id, concurrency=concurrency)
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.stop)
+    await worker.run(drain=drain)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Process queued Genesis pipeline runs")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Runs processed at once (defaults to GENESIS_WORKER_CONCURRENCY)",
+    )
+    parser.add_argument("--worker-id", help="Lease owner name (defaults to host:pid)")
+    parser.add_argument(
+        "--drain",
+        action="store_true",
+        help="Exit once the queue is empty instead of polling for new runs",
+    )
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    asyncio.run(_work(worker_id=args.worker_id, concurrency=args.concurrency, drain=args.drain))
+
+
+if __name__ == "__main__":
+    main()
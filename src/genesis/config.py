@@ -1,9 +1,34 @@
 from __future__ import annotations
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings
-from pydantic import Field
+from pydantic import BaseModel, Field
+
+
+class RenderProfile(BaseModel):
+    """Encoder settings for trims and renders; part of every render cache key."""
+
+    video_codec: str = "libx264"
+    preset: str = "medium"
+    crf: int = Field(default=20, ge=0)
+    # Outputs taller than this are downscaled (aspect kept); ``None`` keeps source size.
+    max_height: int | None = Field(default=None, ge=16)
+    audio_codec: str = "aac"
+    audio_bitrate: str = "192k"
+    # Render from the low-resolution ingest proxies instead of the originals.
+    use_proxy: bool = False
+
+
+def _default_render_profiles() -> dict[str, RenderProfile]:
+    return {
+        "draft": RenderProfile(
+            preset="ultrafast", crf=30, max_height=360, audio_bitrate="96k", use_proxy=True
+        ),
+        "review": RenderProfile(preset="veryfast", crf=24, max_height=720, audio_bitrate="128k"),
+        "final": RenderProfile(),
+    }
 
 
 class Settings(BaseSettings):
@@ -15,14 +40,73 @@ class Settings(BaseSettings):
     step_function_arn: str | None = None
     whisper_model_size: str = Field(default="small")
     whisper_compute_type: str = Field(default="int8")
+    whisper_num_workers: int = Field(default=1, ge=1)
+    whisper_cpu_threads: int = Field(default=0, ge=0)
+    whisper_batch_size: int = Field(default=0, ge=0)
+    whisper_beam_size: int = Field(default=5, ge=1)
+    whisper_word_timestamps: bool = Field(default=False)
+    transcript_streaming: bool = Field(default=False)
+    transcript_segment_batch_size: int = Field(default=32, ge=1)
     caption_model_name: str = Field(default="Salesforce/blip-image-captioning-base")
+    caption_batch_size: int = Field(default=8, ge=1)
+    caption_num_threads: int | None = Field(default=None, ge=1)
+    scene_detect_threshold: float = Field(default=27.0, gt=0)
+    scene_detect_min_scene_len: int = Field(default=15, ge=1)
+    scene_detect_downscale: int = Field(default=0, ge=0)
+    scene_detect_frame_skip: int = Field(default=0, ge=0)
+    scene_detect_refine_window_seconds: float = Field(default=0.0, ge=0)
+    scene_detect_workers: int | None = Field(default=None, ge=1)
+    scene_preview_mode: Literal["ffmpeg", "fused"] = Field(default="ffmpeg")
+    scene_preview_buffer_frames: int = Field(default=32, ge=1)
+    scene_preview_max_width: int = Field(default=640, ge=16)
     ffmpeg_binary: str = Field(default="ffmpeg")
+    ffprobe_binary: str = Field(default="ffprobe")
+    ffmpeg_max_processes: int | None = Field(default=None, ge=1)
+    ffmpeg_timeout_seconds: float | None = Field(default=None, gt=0)
     artifact_root: str = Field(default="output")
+    pipeline_mode: Literal["staged", "streaming"] = Field(default="staged")
+    pipeline_queue_size: int = Field(default=2, ge=1)
+    pipeline_cpu_slots: int = Field(default=2, ge=1)
+    pipeline_model_slots: int = Field(default=1, ge=1)
+    render_concurrency: int | None = Field(default=None, ge=1)
+    trim_mode: Literal["reencode", "smart"] = Field(default="reencode")
+    render_engine: Literal["segments", "filtergraph"] = Field(default="segments")
+    render_profile: str = Field(default="final")
+    render_profiles: dict[str, RenderProfile] = Field(default_factory=_default_render_profiles)
+    segment_cache_enabled: bool = Field(default=True)
+    segment_cache_max_bytes: int = Field(default=20 * 1024**3, ge=0)
+    audio_cache_max_bytes: int = Field(default=20 * 1024**3, ge=0)
+    proxy_enabled: bool = Field(default=True)
+    proxy_max_height: int = Field(default=360, ge=16)
+    proxy_crf: int = Field(default=28, ge=0)
+    proxy_cache_max_bytes: int = Field(default=20 * 1024**3, ge=0)
+    voiceover_ducking: bool = Field(default=False)
+    voiceover_analysis_frame_seconds: float = Field(default=0.05, gt=0)
+    voiceover_vad_threshold_db: float = Field(default=-40.0)
+    voiceover_duck_attack_seconds: float = Field(default=0.1, ge=0)
+    voiceover_duck_release_seconds: float = Field(default=0.5, ge=0)
+    # EBU R128 integrated loudness narration is normalized to; ``None`` keeps its level.
+    voiceover_loudness_target: float | None = Field(default=None)
+    voiceover_peak_ceiling_db: float = Field(default=-1.0, le=0)
+    worker_concurrency: int = Field(default=1, ge=1)
+    job_lease_seconds: float = Field(default=300.0, gt=0)
+    job_heartbeat_seconds: float = Field(default=30.0, gt=0)
+    job_poll_seconds: float = Field(default=2.0, gt=0)
+    job_max_attempts: int = Field(default=3, ge=1)
 
     class Config:
         env_prefix = "GENESIS_"
         case_sensitive = False
 
+    def get_render_profile(self, name: str | None = None) -> RenderProfile:
+        name = name or self.render_profile
+        try:
+            return self.render_profiles[name]
+        except KeyError:
+            raise ValueError(
+                f"Unknown render profile {name!r}; expected one of {sorted(self.render_profiles)}"
+            ) from None
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -1,16 +1,26 @@
 from __future__ import annotations
 
+import threading
 from functools import lru_cache
 from pathlib import Path
+from typing import Any, Sequence
 
+import torch
+from PIL import Image
 from transformers import pipeline
 
 from genesis.config import get_settings
 
+# One inference at a time: concurrent scene-detection workers would otherwise
+# run the pipeline in parallel threads and contend for the same cores.
+_inference_lock = threading.Lock()
+
 
 @lru_cache
 def _load_captioner():
     settings = get_settings()
+    if settings.caption_num_threads:
+        torch.set_num_threads(settings.caption_num_threads)
     return pipeline("image-to-text", model=settings.caption_model_name)
 
 
@@ -20,9 +30,44 @@ def get_captioner():
     return _load_captioner()
 
 
-def caption_image(image_path: str | Path, max_new_tokens: int = 60) -> str:
-    pipe = get_captioner()
-    result = pipe(str(image_path), max_new_tokens=max_new_tokens)
+def _generated_text(result: list[dict[str, Any]]) -> str:
     if not result:
         return ""
     return result[0]["generated_text"].strip()
+
+
+def caption_images(
+    image_paths: Sequence[str | Path],
+    max_new_tokens: int = 60,
+    batch_size: int | None = None,
+) -> list[str]:
+    """Caption many images, running inference ``batch_size`` images at a time."""
+
+    if not image_paths:
+        return []
+    settings = get_settings()
+    with _inference_lock:
+        pipe = get_captioner()
+        results = pipe(
+            [str(path) for path in image_paths],
+            max_new_tokens=max_new_tokens,
+            batch_size=batch_size or settings.caption_batch_size,
+        )
+    return [_generated_text(result) for result in results]
+
+
+def perceptual_hash(image_path: str | Path, hash_size: int = 8) -> str:
+    """Difference hash (dHash) of an image as a hex string.
+
+    Near-identical frames (static shots, recompression noise) hash to the same
+    value, so the hash works as a cache key for captions.
+    """
+
+    with Image.open(image_path) as image:
+        pixels = image.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS).tobytes()
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return f"{bits:0{hash_size * hash_size // 4}x}"
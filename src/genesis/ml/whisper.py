@@ -2,16 +2,27 @@ from __future__ import annotations
 
 from functools import lru_cache
 
-from faster_whisper import WhisperModel
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 
 from genesis.config import get_settings
 
 
 @lru_cache
 def get_whisper_model() -> WhisperModel:
+    """Shared model; ``num_workers`` lets that many ``transcribe`` calls run in parallel threads."""
+
     settings = get_settings()
     return WhisperModel(
         settings.whisper_model_size,
         device="auto",
         compute_type=settings.whisper_compute_type,
+        cpu_threads=settings.whisper_cpu_threads,
+        num_workers=settings.whisper_num_workers,
     )
+
+
+@lru_cache
+def get_batched_pipeline() -> BatchedInferencePipeline:
+    """Batched VAD-chunked inference on top of the shared model."""
+
+    return BatchedInferencePipeline(model=get_whisper_model())
@@ -1,23 +1,32 @@
 from genesis.models.artifact import Artifact, ArtifactType
+from genesis.models.caption_cache import CaptionCache
 from genesis.models.chapter import Chapter
 from genesis.models.chapter_scene import ChapterScene
 from genesis.models.media_file import MediaFile, MediaFileStatus
+from genesis.models.media_probe import MediaProbe
 from genesis.models.project import Project, ProjectStatus
 from genesis.models.run import Run, RunState
+from genesis.models.run_job import RunJob, RunJobStatus
 from genesis.models.scene import Scene
 from genesis.models.transcript import Transcript
+from genesis.models.transcript_segment import TranscriptSegment
 
 __all__ = [
     "Artifact",
     "ArtifactType",
+    "CaptionCache",
     "Chapter",
     "ChapterScene",
     "MediaFile",
     "MediaFileStatus",
+    "MediaProbe",
     "Project",
     "ProjectStatus",
     "Run",
     "RunState",
+    "RunJob",
+    "RunJobStatus",
     "Scene",
     "Transcript",
+    "TranscriptSegment",
 ]
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import String, Text, UniqueConstraint, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from genesis.db.base import Base
+from genesis.models.mixins import TimestampMixin
+
+
+def _uuid() -> uuid.UUID:
+    return uuid.uuid4()
+
+
+class CaptionCache(TimestampMixin, Base):
+    id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        primary_key=True,
+        default=_uuid,
+    )
+    image_hash: Mapped[str] = mapped_column(String(length=64), nullable=False)
+    model_name: Mapped[str] = mapped_column(String(length=255), nullable=False)
+    caption: Mapped[str] = mapped_column(Text, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("image_hash", "model_name", name="uq_captioncache_hash_model"),
+    )
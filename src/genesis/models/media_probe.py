@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import uuid
+from typing import Any
+
+from sqlalchemy import JSON, Float, Integer, String, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from genesis.db.base import Base
+from genesis.models.mixins import TimestampMixin
+
+
+def _uuid() -> uuid.UUID:
+    return uuid.uuid4()
+
+
+class MediaProbe(TimestampMixin, Base):
+    """ffprobe results for one piece of media, shared by every upload with the same checksum."""
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        primary_key=True,
+        default=_uuid,
+    )
+    source_checksum: Mapped[str] = mapped_column(String(length=128), nullable=False, unique=True)
+    duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    fps: Mapped[float | None] = mapped_column(Float, nullable=True)
+    width: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    height: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    video_codec: Mapped[str | None] = mapped_column(String(length=32), nullable=True)
+    video_profile: Mapped[str | None] = mapped_column(String(length=32), nullable=True)
+    video_level: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    pix_fmt: Mapped[str | None] = mapped_column(String(length=32), nullable=True)
+    video_time_base: Mapped[str | None] = mapped_column(String(length=32), nullable=True)
+    audio_codec: Mapped[str | None] = mapped_column(String(length=32), nullable=True)
+    audio_channels: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    audio_channel_layout: Mapped[str | None] = mapped_column(String(length=64), nullable=True)
+    audio_sample_rate: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    keyframes: Mapped[list[float] | None] = mapped_column(JSON, nullable=True)
+    metadata_json: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import UTC, datetime
 
 from sqlalchemy import func
 from sqlalchemy.orm import Mapped, mapped_column
 
 
+def utcnow() -> datetime:
+    """Current UTC time as a naive datetime, matching the naive DateTime columns."""
+
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
 class TimestampMixin:
     created_at: Mapped[datetime] = mapped_column(
         default=func.now(),
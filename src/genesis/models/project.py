@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import uuid
 from enum import StrEnum, auto
-from typing import List
+from typing import Any, List
 
-from sqlalchemy import CheckConstraint, Enum, String, Uuid
+from sqlalchemy import JSON, CheckConstraint, Enum, String, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from genesis.db.base import Base
@@ -33,6 +33,8 @@ class Project(TimestampMixin, Base):
         nullable=False,
         default=ProjectStatus.DRAFT,
     )
+    # Per pipeline stage, the fingerprint and run that produced the rows stored now.
+    stage_outputs: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
 
     media_files: Mapped[List["MediaFile"]] = relationship(
         back_populates="project",
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from enum import StrEnum, auto
+from typing import Any
+
+from sqlalchemy import JSON, Enum, ForeignKey, Index, Integer, String, Uuid
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from genesis.db.base import Base
+from genesis.models.mixins import TimestampMixin, utcnow
+
+
+class RunJobStatus(StrEnum):
+    QUEUED = auto()
+    RUNNING = auto()
+    COMPLETED = auto()
+    FAILED = auto()
+
+
+def _uuid() -> uuid.UUID:
+    return uuid.uuid4()
+
+
+class RunJob(TimestampMixin, Base):
+    """A queued pipeline run, leased by one worker at a time."""
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        primary_key=True,
+        default=_uuid,
+    )
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("run.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    status: Mapped[RunJobStatus] = mapped_column(
+        Enum(RunJobStatus, name="run_job_status"),
+        default=RunJobStatus.QUEUED,
+        nullable=False,
+    )
+    # Set in Python at microsecond resolution: ``created_at`` comes from the
+    # database clock, which SQLite keeps to the second, so it can't order the queue.
+    enqueued_at: Mapped[datetime] = mapped_column(default=utcnow, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    lease_owner: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    options_json: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    error_message: Mapped[str | None] = mapped_column(nullable=True)
+
+    run: Mapped["Run"] = relationship()
+
+    __table_args__ = (
+        Index("ix_runjob_status_lease", "status", "lease_expires_at"),
+        Index("ix_runjob_status_enqueued", "status", "enqueued_at"),
+    )
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import uuid
-from typing import Any
+from typing import Any, List
 
-from sqlalchemy import ForeignKey, JSON, String, Text, Uuid
+from sqlalchemy import ForeignKey, Index, JSON, String, Text, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from genesis.db.base import Base
@@ -31,5 +31,25 @@ class Transcript(TimestampMixin, Base):
     metadata_json: Mapped[dict[str, Any] | None] = mapped_column(
         JSON, nullable=True, default=None
     )
+    # Cache key for reusing this transcript on identical media elsewhere.
+    source_checksum: Mapped[str | None] = mapped_column(String(length=128), nullable=True)
+    model_name: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
+    compute_type: Mapped[str | None] = mapped_column(String(length=32), nullable=True)
+    decode_options: Mapped[str | None] = mapped_column(String(length=64), nullable=True)
 
     media_file: Mapped["MediaFile"] = relationship(back_populates="transcript")
+    segments: Mapped[List["TranscriptSegment"]] = relationship(
+        back_populates="transcript",
+        cascade="all, delete-orphan",
+        order_by="TranscriptSegment.segment_index",
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_transcript_cache_key",
+            "source_checksum",
+            "model_name",
+            "compute_type",
+            "decode_options",
+        ),
+    )
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import uuid
+from typing import Any
+
+from sqlalchemy import JSON, ForeignKey, Index, Integer, Text, UniqueConstraint, Uuid
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from genesis.db.base import Base
+from genesis.models.mixins import TimestampMixin
+
+
+def _uuid() -> uuid.UUID:
+    return uuid.uuid4()
+
+
+class TranscriptSegment(TimestampMixin, Base):
+    id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        primary_key=True,
+        default=_uuid,
+    )
+    transcript_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("transcript.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    media_file_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("mediafile.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    segment_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    start_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    end_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    metadata_json: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+
+    transcript: Mapped["Transcript"] = relationship(back_populates="segments")
+
+    __table_args__ = (
+        UniqueConstraint(
+            "transcript_id", "segment_index", name="uq_transcriptsegment_transcript_index"
+        ),
+        Index("ix_transcriptsegment_media_time", "media_file_id", "start_ms", "end_ms"),
+    )
@@ -1,3 +1,4 @@
+from genesis.orchestration.stage_graph import Stage, StageGraphExecutor
 from genesis.orchestration.workflow import WorkflowOrchestrator
 
-__all__ = ["WorkflowOrchestrator"]
+__all__ = ["Stage", "StageGraphExecutor", "WorkflowOrchestrator"]
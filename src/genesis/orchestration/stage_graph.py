@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from genesis.models.run import RunState
+
+StageDetails = dict[str, Any]
+StageFn = Callable[[AsyncSession], Awaitable[StageDetails]]
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline step: runs in its own session once ``depends_on`` have finished."""
+
+    name: str
+    run: StageFn
+    depends_on: tuple[str, ...] = ()
+    resource: str = "cpu"
+    state: RunState | None = None
+
+
+class StageGraphExecutor:
+    """Run a DAG of stages, starting each as soon as its dependencies complete.
+
+    Concurrency is bounded per ``Stage.resource`` (e.g. CPU-heavy ffmpeg work vs
+    model inference). Each stage gets a private session, committed when it
+    returns. ``on_start``/``on_finish`` and ``report`` callbacks are awaited one
+    at a time so callers can update shared run state from a single session.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        limits: dict[str, int],
+    ) -> None:
+        self.session_factory = session_factory
+        self.limits = limits
+        self._callback_lock = asyncio.Lock()
+
+    @staticmethod
+    def _check_graph(stages: list[Stage]) -> None:
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate stage names: {names}")
+
+        remaining = {stage.name: set(stage.depends_on) for stage in stages}
+        for name, deps in remaining.items():
+            unknown = deps - remaining.keys()
+            if unknown:
+                raise ValueError(f"Stage {name!r} depends on unknown stages {sorted(unknown)}")
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Stage graph has a cycle among {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    async def execute(
+        self,
+        stages: list[Stage],
+        *,
+        on_start: Callable[[Stage], Awaitable[None]],
+        on_finish: Callable[[Stage, StageDetails], Awaitable[None]],
+    ) -> dict[str, StageDetails]:
+        self._check_graph(stages)
+        slots = {
+            resource: asyncio.Semaphore(self.limits.get(resource, 1))
+            for resource in {stage.resource for stage in stages}
+        }
+        finished = {stage.name: asyncio.Event() for stage in stages}
+        results: dict[str, StageDetails] = {}
+
+        async def _run(stage: Stage) -> None:
+            for dependency in stage.depends_on:
+                await finished[dependency].wait()
+            async with slots[stage.resource]:
+                async with self._callback_lock:
+                    await on_start(stage)
+                async with self.session_factory() as session:
+                    details = await stage.run(session)
+                    await session.commit()
+            results[stage.name] = details
+            async with self._callback_lock:
+                await on_finish(stage, details)
+            finished[stage.name].set()
+
+        tasks = [asyncio.ensure_future(_run(stage)) for stage in stages]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return results
+
+    async def report(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Run a progress callback serialized with ``on_start``/``on_finish``."""
+
+        async with self._callback_lock:
+            await callback()
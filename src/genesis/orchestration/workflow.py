@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from typing import Any
+
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from genesis.models.run import Run
+from genesis.services.run_queue import RunQueueService
 
 logger = structlog.get_logger(__name__)
 
@@ -12,12 +15,14 @@ class WorkflowOrchestrator:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def enqueue(self, run: Run) -> None:
-        """Placeholder Step Functions invocation."""
+    async def enqueue(self, run: Run, options: dict[str, Any] | None = None) -> None:
+        """Queue the run for a ``genesis worker`` process; the caller commits."""
+
+        job = await RunQueueService(self.session).enqueue(run, options)
         logger.info(
             "workflow.enqueue",
             run_id=str(run.id),
             project_id=str(run.project_id),
+            job_id=str(job.id),
             state=run.state,
         )
-        # TODO: Connect to AWS Step Functions StartExecution call.
@@ -10,7 +10,7 @@ from genesis.models.run import RunState
 
 
 class RunCreate(BaseModel):
-    pass
+    render_profile: str | None = None
 
 
 class RunRead(BaseModel):
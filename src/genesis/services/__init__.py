@@ -1,9 +1,15 @@
 from genesis.services.artifacts import ArtifactService
 from genesis.services.assembly import AssemblyService
+from genesis.services.audio import AudioExtractionService
+from genesis.services.captions import CaptionService
 from genesis.services.chapters import ChapterService
+from genesis.services.media_probe import MediaProbeService
+from genesis.services.media_streaming import MediaStreamingService
 from genesis.services.narration import NarrationService
 from genesis.services.pipeline import ProjectPipelineService
 from genesis.services.projects import ProjectService
+from genesis.services.proxies import ProxyService
+from genesis.services.run_queue import RunQueueService
 from genesis.services.runs import RunService
 from genesis.services.scene_detection import SceneDetectionService
 from genesis.services.transcription import TranscriptionService
@@ -12,10 +18,16 @@ from genesis.services.uploads import UploadService
 __all__ = [
     "ArtifactService",
     "AssemblyService",
+    "AudioExtractionService",
+    "CaptionService",
     "ChapterService",
+    "MediaProbeService",
+    "MediaStreamingService",
     "NarrationService",
     "ProjectPipelineService",
     "ProjectService",
+    "ProxyService",
+    "RunQueueService",
     "RunService",
     "SceneDetectionService",
     "TranscriptionService",
@@ -1,17 +1,36 @@
 from __future__ import annotations
 
 import asyncio
+import os
+import shutil
 import uuid
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 from sqlalchemy import delete, select
 from sqlalchemy.orm import selectinload
 
-from genesis.config import get_settings
-from genesis.models import Artifact, ArtifactType, Run, Scene
+from genesis.config import RenderProfile, get_settings
+from genesis.models import Artifact, ArtifactType, MediaFile, MediaProbe, Run, Scene
 from genesis.services.base import ServiceBase
-from genesis.utils.ffmpeg import mix_voiceover, render_concatenation, trim_segment
+from genesis.services.media_probe import MediaProbeService
+from genesis.services.proxies import ProxyService
+from genesis.utils.cache import FileCache, cache_key, media_fingerprint
+from genesis.utils.ffmpeg import (
+    H264_PROFILES,
+    ProgressCallback,
+    VideoStreamFormat,
+    render_concatenation,
+    render_filtergraph,
+    trim_segment,
+)
+
+# Source codecs whose packets can be stream-copied next to each output encoder.
+STREAM_COPY_CODECS = {"libx264": {"h264"}}
+# Pixel formats the output encoders can match when re-encoding next to copied packets.
+STREAM_COPY_PIX_FMTS = {"yuv420p"}
 
 
 class AssemblyService(ServiceBase):
@@ -26,13 +45,10 @@ class AssemblyService(ServiceBase):
         voiceover_offset: float = 0.0,
         voiceover_gain: float = 1.0,
         bed_gain: float = 0.3,
+        ducking_script: Path | None = None,
+        render_profile: str | None = None,
+        progress: ProgressCallback | None = None,
     ) -> Artifact:
-        await self.session.execute(
-            delete(Artifact).where(
-                Artifact.run_id == run_id, Artifact.type == ArtifactType.COMBINED_VIDEO
-            )
-        )
-
         run = await self.session.get(Run, run_id)
         if not run:
             raise ValueError("Run not found for assembly.")
@@ -42,55 +58,47 @@ class AssemblyService(ServiceBase):
             raise ValueError("No scenes available for assembly.")
 
         settings = get_settings()
+        profile_name = render_profile or settings.render_profile
+        profile = settings.get_render_profile(profile_name)
         render_dir = Path(settings.artifact_root) / "renders"
         render_dir.mkdir(parents=True, exist_ok=True)
-        temp_dir = render_dir / f"segments_{run_id}"
-        temp_dir.mkdir(parents=True, exist_ok=True)
-
-        trimmed_segments: list[Path] = []
-        for scene in scenes:
-            media_path = Path(scene.media_file.s3_key)
-            if not media_path.exists():
-                raise FileNotFoundError(f"Scene media missing: {media_path}")
-
-            start_seconds = scene.start_ms / 1000
-            end_seconds = scene.end_ms / 1000
-            output_segment = temp_dir / f"scene_{scene.index:04d}.mp4"
+        mix_options: dict[str, Any] = {
+            "offset_seconds": voiceover_offset,
+            "voiceover_gain": voiceover_gain,
+            "bed_gain": bed_gain,
+            "ducking_script": ducking_script,
+        }
 
-            await asyncio.to_thread(
-                trim_segment,
-                media_path,
-                start_seconds,
-                end_seconds,
-                output_segment,
+        if settings.render_engine == "filtergraph":
+            final_path = await self._render_filtergraph(
+                scenes,
+                render_dir,
+                project_id,
+                run_id,
+                voiceover_wav,
+                mix_options,
+                profile,
+                progress,
             )
-            trimmed_segments.append(output_segment)
-
-        combined_path = render_dir / f"project_{project_id}_run_{run_id}.mp4"
-        await asyncio.to_thread(render_concatenation, trimmed_segments, combined_path)
-
-        for segment in trimmed_segments:
-            segment.unlink(missing_ok=True)
-        try:
-            temp_dir.rmdir()
-        except OSError:
-            pass
-
-        final_path = combined_path
-        if voiceover_wav:
-            voiced_path = render_dir / f"project_{project_id}_run_{run_id}_voiceover.mp4"
-            await asyncio.to_thread(
-                mix_voiceover,
-                combined_path,
+        else:
+            final_path = await self._render_segments(
+                scenes,
+                render_dir,
+                project_id,
+                run_id,
                 voiceover_wav,
-                voiced_path,
-                offset_seconds=voiceover_offset,
-                voiceover_gain=voiceover_gain,
-                bed_gain=bed_gain,
+                mix_options,
+                profile,
+                progress,
             )
-            final_path = voiced_path
-            combined_path.unlink(missing_ok=True)
 
+        # Replace the previous artifact only once rendering is done, so no write
+        # transaction stays open during the render.
+        await self.session.execute(
+            delete(Artifact).where(
+                Artifact.run_id == run_id, Artifact.type == ArtifactType.COMBINED_VIDEO
+            )
+        )
         artifact = Artifact(
             run_id=run.id,
             type=ArtifactType.COMBINED_VIDEO,
@@ -100,12 +108,333 @@ class AssemblyService(ServiceBase):
                 "generated_at": datetime.utcnow().isoformat(),
                 "scene_count": len(scenes),
                 "voiceover_applied": bool(voiceover_wav),
+                "voiceover_ducked": bool(voiceover_wav and ducking_script),
+                "render_engine": settings.render_engine,
+                "render_profile": profile_name,
             },
         )
         self.session.add(artifact)
         await self.session.flush()
         return artifact
 
+    async def prewarm_segments(
+        self,
+        project_id: uuid.UUID,
+        media_file_id: uuid.UUID,
+        *,
+        render_profile: str | None = None,
+    ) -> int:
+        """Trim one media file's scenes into the segment cache ahead of assembly.
+
+        Returns the number of segments now cached; a no-op unless the segment
+        render engine and cache are enabled.
+        """
+
+        settings = get_settings()
+        if settings.render_engine != "segments" or not settings.segment_cache_enabled:
+            return 0
+
+        result = await self.session.execute(
+            select(Scene)
+            .options(selectinload(Scene.media_file))
+            .where(Scene.project_id == project_id, Scene.media_file_id == media_file_id)
+            .order_by(Scene.index)
+        )
+        scenes = list(result.scalars().unique())
+        if not scenes:
+            return 0
+
+        temp_dir = Path(settings.artifact_root) / "renders" / f"prewarm_{media_file_id}"
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        profile = settings.get_render_profile(render_profile)
+        cache = FileCache("segments", settings.segment_cache_max_bytes)
+        sources, fingerprints = await self._render_sources(scenes, profile)
+        segments = await self._trim_scenes(
+            scenes, temp_dir, sources, fingerprints, profile, cache
+        )
+        self._cleanup_segments([s for s in segments if s.parent == temp_dir], temp_dir)
+        await asyncio.to_thread(cache.evict, segments)
+        return len(segments)
+
+    async def _render_segments(
+        self,
+        scenes: list[Scene],
+        render_dir: Path,
+        project_id: uuid.UUID,
+        run_id: uuid.UUID,
+        voiceover_wav: Path | None,
+        mix_options: dict[str, Any],
+        profile: RenderProfile,
+        progress: ProgressCallback | None = None,
+    ) -> Path:
+        temp_dir = render_dir / f"segments_{run_id}"
+        duration_seconds = _total_seconds(scenes)
+
+        settings = get_settings()
+        segment_cache: FileCache | None = None
+        render_cache: FileCache | None = None
+        if settings.segment_cache_enabled:
+            segment_cache = FileCache("segments", settings.segment_cache_max_bytes)
+            render_cache = FileCache("renders", settings.segment_cache_max_bytes)
+
+        sources, fingerprints = await self._render_sources(scenes, profile)
+        suffix = "_voiceover" if voiceover_wav else ""
+        output_path = render_dir / f"project_{project_id}_run_{run_id}{suffix}.mp4"
+
+        # The narration-free concat is cached; voiceover runs mix on top of it when present.
+        base_key = cache_key(
+            "base_render",
+            [
+                (fingerprints[scene.media_file.id], scene.start_ms, scene.end_ms)
+                for scene in scenes
+            ],
+            settings.trim_mode,
+            profile.model_dump(),
+        )
+        base_path: Path | None = None
+        if render_cache is not None:
+            base_path = render_cache.lookup(base_key, ".mp4")
+        if base_path is not None and not voiceover_wav:
+            await asyncio.to_thread(_link_or_copy, base_path, output_path)
+            return output_path
+
+        # Narration is mixed during the concat itself (video stream-copied, audio
+        # filtered), so the full render is only ever written once.
+        segments = [base_path] if base_path is not None else None
+        if segments is None:
+            temp_dir.mkdir(parents=True, exist_ok=True)
+            segments = await self._trim_scenes(
+                scenes, temp_dir, sources, fingerprints, profile, segment_cache
+            )
+        try:
+            await render_concatenation(
+                segments,
+                output_path,
+                voiceover_wav=voiceover_wav,
+                **mix_options,
+                profile=profile,
+                progress=_render_progress(progress, "concat", duration_seconds),
+            )
+        except BaseException:
+            output_path.unlink(missing_ok=True)
+            raise
+        finally:
+            if base_path is None:
+                self._cleanup_segments(
+                    [segment for segment in segments if segment.parent == temp_dir], temp_dir
+                )
+                if segment_cache is not None:
+                    await asyncio.to_thread(segment_cache.evict, segments)
+
+        if render_cache is not None and not voiceover_wav:
+            base_path = render_cache.store(base_key, output_path)
+            await asyncio.to_thread(render_cache.evict, [base_path])
+            await asyncio.to_thread(_link_or_copy, base_path, output_path)
+        return output_path
+
+    async def _render_filtergraph(
+        self,
+        scenes: list[Scene],
+        render_dir: Path,
+        project_id: uuid.UUID,
+        run_id: uuid.UUID,
+        voiceover_wav: Path | None,
+        mix_options: dict[str, Any],
+        profile: RenderProfile,
+        progress: ProgressCallback | None = None,
+    ) -> Path:
+        """Render every scene (and the voiceover mix) in a single ffmpeg encode.
+
+        Probe data decides how sources are normalized: mismatched resolutions are
+        letterboxed to the first source's size and sources without audio
+        contribute silence.
+        """
+
+        probes = await self._probes(scenes)
+        media_paths, _ = await self._render_sources(scenes, profile)
+        sources: list[Path] = []
+        source_probes: list[MediaProbe] = []
+        source_index: dict[uuid.UUID, int] = {}
+        spans: list[tuple[int, float, float]] = []
+        for scene in scenes:
+            if scene.media_file.id not in source_index:
+                source_index[scene.media_file.id] = len(sources)
+                sources.append(media_paths[scene.media_file.id])
+                source_probes.append(probes[scene.media_file.id])
+            spans.append(
+                (source_index[scene.media_file.id], scene.start_ms / 1000, scene.end_ms / 1000)
+            )
+
+        frame_sizes = {(probe.width, probe.height) for probe in source_probes}
+        frame_size = None
+        if len(frame_sizes) > 1 and source_probes[0].width and source_probes[0].height:
+            frame_size = (source_probes[0].width, source_probes[0].height)
+            if self._uses_proxies(profile):
+                frame_size = ProxyService.proxy_frame_size(*frame_size)
+        silent_sources = {
+            index for index, probe in enumerate(source_probes) if probe.audio_codec is None
+        }
+
+        suffix = "_voiceover" if voiceover_wav else ""
+        output_path = render_dir / f"project_{project_id}_run_{run_id}{suffix}.mp4"
+        try:
+            await render_filtergraph(
+                sources,
+                spans,
+                output_path,
+                voiceover_wav=voiceover_wav,
+                frame_size=frame_size,
+                silent_sources=silent_sources,
+                profile=profile,
+                **mix_options,
+                progress=_render_progress(progress, "filtergraph", _total_seconds(scenes)),
+            )
+        except BaseException:
+            output_path.unlink(missing_ok=True)
+            raise
+        return output_path
+
+    async def _render_sources(
+        self, scenes: list[Scene], profile: RenderProfile
+    ) -> tuple[dict[uuid.UUID, Path], dict[uuid.UUID, str]]:
+        """Path and cache identity of each scene's render source, keyed by media id.
+
+        Proxy-backed profiles render from the ingest proxies (encoding any that
+        are missing); the identity then covers the proxy settings too.
+        """
+
+        media_files: dict[uuid.UUID, MediaFile] = {}
+        for scene in scenes:
+            media_path = Path(scene.media_file.s3_key)
+            if not media_path.exists():
+                raise FileNotFoundError(f"Scene media missing: {media_path}")
+            media_files[scene.media_file.id] = scene.media_file
+
+        if self._uses_proxies(profile):
+            paths = await ProxyService(self.session).proxy_many(media_files.values())
+            return paths, {
+                media_id: ProxyService.proxy_key(media) for media_id, media in media_files.items()
+            }
+        return (
+            {media_id: Path(media.s3_key) for media_id, media in media_files.items()},
+            {
+                media_id: media_fingerprint(Path(media.s3_key), media.checksum)
+                for media_id, media in media_files.items()
+            },
+        )
+
+    @staticmethod
+    def _uses_proxies(profile: RenderProfile) -> bool:
+        return profile.use_proxy and get_settings().proxy_enabled
+
+    async def _trim_scenes(
+        self,
+        scenes: list[Scene],
+        temp_dir: Path,
+        sources: dict[uuid.UUID, Path],
+        fingerprints: dict[uuid.UUID, str],
+        profile: RenderProfile,
+        cache: FileCache | None = None,
+    ) -> list[Path]:
+        """Trim every scene concurrently, returning segments in ``Scene.index`` order.
+
+        With a ``cache``, previously rendered segments are reused and new ones are
+        moved into it; only cache misses leave files in ``temp_dir``.
+        """
+
+        settings = get_settings()
+        keyframes: dict[uuid.UUID, list[float] | None] = {}
+        stream_format: VideoStreamFormat | None = None
+        # Proxies are all-intra, so re-encoding from them already seeks exactly.
+        if settings.trim_mode == "smart" and not self._uses_proxies(profile):
+            keyframes, stream_format = await self._probe_keyframes(scenes, profile)
+
+        semaphore = asyncio.Semaphore(settings.render_concurrency or os.cpu_count() or 1)
+        failed = asyncio.Event()
+        outputs = [temp_dir / f"scene_{scene.index:04d}.mp4" for scene in scenes]
+
+        async def _trim(scene: Scene, output_segment: Path) -> Path:
+            key: str | None = None
+            if cache is not None:
+                key = cache_key(
+                    "segment",
+                    fingerprints[scene.media_file.id],
+                    scene.start_ms,
+                    scene.end_ms,
+                    settings.trim_mode,
+                    profile.model_dump(),
+                    # Smart-trimmed segments are encoded to match their siblings' sources.
+                    asdict(stream_format) if stream_format is not None else None,
+                )
+                cached = cache.lookup(key, output_segment.suffix)
+                if cached is not None:
+                    return cached
+
+            async with semaphore:
+                # Don't start new encodes once a sibling has failed.
+                if failed.is_set():
+                    return output_segment
+                try:
+                    await trim_segment(
+                        sources[scene.media_file.id],
+                        scene.start_ms / 1000,
+                        scene.end_ms / 1000,
+                        output_segment,
+                        keyframes=keyframes.get(scene.media_file.id),
+                        stream_format=stream_format,
+                        profile=profile,
+                    )
+                except BaseException:
+                    failed.set()
+                    raise
+
+            if cache is not None and key is not None:
+                return cache.store(key, output_segment)
+            return output_segment
+
+        results = await asyncio.gather(
+            *(_trim(scene, output) for scene, output in zip(scenes, outputs)),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            self._cleanup_segments(outputs, temp_dir)
+            raise errors[0]
+        return [result for result in results if isinstance(result, Path)]
+
+    async def _probe_keyframes(
+        self, scenes: list[Scene], profile: RenderProfile
+    ) -> tuple[dict[uuid.UUID, list[float] | None], VideoStreamFormat | None]:
+        """Keyframe index per media file plus the stream format shared by every source.
+
+        Every segment ends up in one stream-copied concat, so packets are only
+        copied when all sources share one format the profile's encoder can
+        reproduce (and that fits under its ``max_height``); otherwise every
+        scene is re-encoded and ``({}, None)`` is returned.
+        """
+
+        media_files = {scene.media_file.id: scene.media_file for scene in scenes}
+        probe_service = MediaProbeService(self.session)
+        probes = await probe_service.probe_many(media_files.values())
+        formats = {_stream_format(probe, profile) for probe in probes.values()}
+        if len(formats) != 1 or None in formats:
+            return {}, None
+        # Only now are the keyframe indexes worth a full packet scan.
+        return await probe_service.keyframes_many(media_files.values()), formats.pop()
+
+    async def _probes(self, scenes: list[Scene]) -> dict[uuid.UUID, MediaProbe]:
+        media_files = {scene.media_file.id: scene.media_file for scene in scenes}
+        return await MediaProbeService(self.session).probe_many(media_files.values())
+
+    @staticmethod
+    def _cleanup_segments(segments: list[Path], temp_dir: Path) -> None:
+        for segment in segments:
+            segment.unlink(missing_ok=True)
+        try:
+            temp_dir.rmdir()
+        except OSError:
+            pass
+
     async def _load_scenes(self, project_id: uuid.UUID) -> list[Scene]:
         result = await self.session.execute(
             select(Scene)
@@ -114,3 +443,58 @@ class AssemblyService(ServiceBase):
             .order_by(Scene.index)
         )
         return list(result.scalars().unique())
+
+
+def _link_or_copy(source: Path, destination: Path) -> None:
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def _total_seconds(scenes: list[Scene]) -> float:
+    return sum(scene.end_ms - scene.start_ms for scene in scenes) / 1000
+
+
+def _render_progress(
+    progress: ProgressCallback | None, step: str, duration_seconds: float
+) -> ProgressCallback | None:
+    """Tag ffmpeg progress with the render step and a percentage of the expected output."""
+
+    if progress is None:
+        return None
+
+    async def _report(fields: dict[str, Any]) -> None:
+        update = {"step": step, **fields}
+        if duration_seconds > 0 and "out_time_seconds" in fields:
+            update["percent"] = min(
+                round(100 * fields["out_time_seconds"] / duration_seconds, 1), 100.0
+            )
+        await progress(update)
+
+    return _report
+
+
+def _stream_format(probe: MediaProbe, profile: RenderProfile) -> VideoStreamFormat | None:
+    """The probe's video format if the profile's encoder can sit next to its packets."""
+
+    if probe.video_codec not in STREAM_COPY_CODECS.get(profile.video_codec, ()):
+        return None
+    if probe.video_profile not in H264_PROFILES or probe.pix_fmt not in STREAM_COPY_PIX_FMTS:
+        return None
+    if not probe.video_level or probe.video_level <= 0 or not probe.video_time_base:
+        return None
+    if not probe.width or not probe.height:
+        return None
+    if profile.max_height is not None and probe.height > profile.max_height:
+        return None
+    return VideoStreamFormat(
+        codec=probe.video_codec,
+        profile=probe.video_profile,
+        level=probe.video_level,
+        pix_fmt=probe.pix_fmt,
+        width=probe.width,
+        height=probe.height,
+        time_base=probe.video_time_base,
+    )
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+from pathlib import Path
+from typing import Iterable
+
+from sqlalchemy import select
+
+from genesis.config import get_settings
+from genesis.models import MediaFile
+from genesis.services.base import ServiceBase
+from genesis.services.media_probe import MediaProbeService
+from genesis.utils.cache import FileCache, cache_key, media_fingerprint
+from genesis.utils.ffmpeg import extract_audio_pcm
+
+# faster-whisper's native input rate; analysis stages reuse the same file.
+ANALYSIS_SAMPLE_RATE = 16000
+
+
+class AudioExtractionService(ServiceBase):
+    """Extract each media file's audio once as 16 kHz mono PCM, cached by checksum."""
+
+    async def extract_project(self, project_id: uuid.UUID) -> dict[uuid.UUID, Path]:
+        result = await self.session.execute(
+            select(MediaFile).where(MediaFile.project_id == project_id)
+        )
+        media_files = list(result.scalars().unique())
+        probes = await MediaProbeService(self.session).probe_many(media_files)
+        # Media without an audio stream has nothing to extract (or transcribe).
+        media_files = [media for media in media_files if probes[media.id].audio_codec]
+
+        settings = get_settings()
+        semaphore = asyncio.Semaphore(settings.render_concurrency or os.cpu_count() or 1)
+
+        async def _extract(media: MediaFile) -> Path:
+            async with semaphore:
+                return await self.audio_for(media)
+
+        paths = await asyncio.gather(*(_extract(media) for media in media_files))
+        await self.evict(paths)
+        return {media.id: path for media, path in zip(media_files, paths)}
+
+    async def audio_for(self, media: MediaFile) -> Path:
+        """Path to the cached PCM WAV for ``media``, extracting it on first use."""
+
+        media_path = Path(media.s3_key)
+        if not media_path.exists():
+            raise FileNotFoundError(f"Media path not found for audio extraction: {media_path}")
+
+        cache = FileCache("audio", get_settings().audio_cache_max_bytes)
+        key = cache_key(
+            "audio", media_fingerprint(media_path, media.checksum), ANALYSIS_SAMPLE_RATE
+        )
+        cached = cache.lookup(key, ".wav")
+        if cached is not None:
+            return cached
+
+        partial = cache.root / f"{key}.{uuid.uuid4().hex}.partial.wav"
+        try:
+            await extract_audio_pcm(media_path, partial, ANALYSIS_SAMPLE_RATE)
+            path = cache.store(key, partial)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        return path
+
+    async def evict(self, in_use: Iterable[Path]) -> None:
+        """Trim the audio cache to its cap once a run has every file it needs.
+
+        Evicting per extraction could drop a sibling's WAV that is extracted
+        but not yet transcribed, so callers evict once, protecting all of them.
+        """
+
+        cache = FileCache("audio", get_settings().audio_cache_max_bytes)
+        await asyncio.to_thread(cache.evict, list(in_use))
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from genesis.config import get_settings
+from genesis.ml.captioner import caption_images, perceptual_hash
+from genesis.models import CaptionCache
+from genesis.services.base import ServiceBase
+
+
+class CaptionService(ServiceBase):
+    """Caption preview images, reusing cached captions for perceptually identical frames."""
+
+    async def caption_previews(self, image_paths: list[Path]) -> list[str]:
+        if not image_paths:
+            return []
+
+        model_name = get_settings().caption_model_name
+        hashes = await asyncio.to_thread(lambda: [perceptual_hash(path) for path in image_paths])
+
+        captions_by_hash = await self._lookup(model_name, set(hashes))
+
+        # Caption one representative image per unseen hash.
+        pending: dict[str, Path] = {}
+        for image_hash, path in zip(hashes, image_paths):
+            if image_hash not in captions_by_hash:
+                pending.setdefault(image_hash, path)
+
+        if pending:
+            new_captions = await asyncio.to_thread(caption_images, list(pending.values()))
+            await self._insert(model_name, dict(zip(pending.keys(), new_captions)))
+            captions_by_hash.update(await self._lookup(model_name, set(pending)))
+
+        return [captions_by_hash[image_hash] for image_hash in hashes]
+
+    async def _lookup(self, model_name: str, hashes: set[str]) -> dict[str, str]:
+        result = await self.session.execute(
+            select(CaptionCache.image_hash, CaptionCache.caption).where(
+                CaptionCache.model_name == model_name,
+                CaptionCache.image_hash.in_(hashes),
+            )
+        )
+        return dict(result.tuples().all())
+
+    async def _insert(self, model_name: str, captions: dict[str, str]) -> None:
+        dialect = postgresql if self.session.bind.dialect.name == "postgresql" else sqlite
+        statement = dialect.insert(CaptionCache).values(
+            [
+                {"image_hash": image_hash, "model_name": model_name, "caption": caption}
+                for image_hash, caption in captions.items()
+            ]
+        )
+        # Concurrent writers may caption the same frame; the first row wins.
+        await self.session.execute(
+            statement.on_conflict_do_nothing(index_elements=["image_hash", "model_name"])
+        )
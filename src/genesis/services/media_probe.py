@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from dataclasses import asdict
+from pathlib import Path
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from genesis.models import MediaFile, MediaProbe
+from genesis.services.base import ServiceBase
+from genesis.utils.cache import media_fingerprint
+from genesis.utils.ffmpeg import MediaInfo, probe_keyframes, probe_media
+
+
+class MediaProbeService(ServiceBase):
+    """Run ffprobe once per checksum and serve container facts from ``mediaprobe``."""
+
+    async def probe_project(self, project_id: uuid.UUID) -> dict[uuid.UUID, MediaProbe]:
+        result = await self.session.execute(
+            select(MediaFile).where(MediaFile.project_id == project_id)
+        )
+        return await self.probe_many(result.scalars().unique())
+
+    async def probe_many(self, media_files: Iterable[MediaFile]) -> dict[uuid.UUID, MediaProbe]:
+        """Probe rows keyed by media id, probing only media not seen before.
+
+        Also fills in ``MediaFile.duration_ms`` where the upload left it unset.
+        """
+
+        media_files = list(media_files)
+        keys = {media.id: self._probe_key(media) for media in media_files}
+        probes = await self._lookup(set(keys.values()))
+
+        missing = {
+            keys[media.id]: media for media in media_files if keys[media.id] not in probes
+        }
+        if missing:
+            infos = await asyncio.gather(
+                *(asyncio.to_thread(probe_media, Path(media.s3_key)) for media in missing.values())
+            )
+            for key, info in zip(missing, infos):
+                await self._insert(key, info)
+            probes.update(await self._lookup(set(missing)))
+
+        for media in media_files:
+            probe = probes[keys[media.id]]
+            if media.duration_ms is None and probe.duration_ms is not None:
+                media.duration_ms = probe.duration_ms
+        await self.session.flush()
+        return {media.id: probes[keys[media.id]] for media in media_files}
+
+    async def keyframes_many(
+        self, media_files: Iterable[MediaFile]
+    ) -> dict[uuid.UUID, list[float]]:
+        """Keyframe index per media id, scanning packets only for media not indexed yet.
+
+        The scan demuxes the whole file, so ``probe_many`` leaves it out and it
+        only runs here, for smart trims.
+        """
+
+        media_files = list(media_files)
+        probes = await self.probe_many(media_files)
+        missing: dict[str, MediaFile] = {}
+        for media in media_files:
+            probe = probes[media.id]
+            if probe.keyframes is None:
+                missing.setdefault(probe.source_checksum, media)
+        if missing:
+            indexes = await asyncio.gather(
+                *(
+                    asyncio.to_thread(probe_keyframes, Path(media.s3_key))
+                    for media in missing.values()
+                )
+            )
+            for media, keyframes in zip(missing.values(), indexes):
+                probes[media.id].keyframes = keyframes
+            # Callers go on to long encodes; don't keep a write transaction open.
+            await self.session.commit()
+        return {media.id: probes[media.id].keyframes for media in media_files}
+
+    @staticmethod
+    def _probe_key(media: MediaFile) -> str:
+        media_path = Path(media.s3_key)
+        if not media.checksum and not media_path.exists():
+            raise FileNotFoundError(f"Media path not found for probing: {media_path}")
+        return media_fingerprint(media_path, media.checksum)
+
+    async def _lookup(self, keys: set[str]) -> dict[str, MediaProbe]:
+        if not keys:
+            return {}
+        result = await self.session.execute(
+            select(MediaProbe).where(MediaProbe.source_checksum.in_(keys))
+        )
+        return {probe.source_checksum: probe for probe in result.scalars()}
+
+    async def _insert(self, key: str, info: MediaInfo) -> None:
+        values = asdict(info)
+        format_name = values.pop("format_name")
+        dialect = postgresql if self.session.bind.dialect.name == "postgresql" else sqlite
+        statement = dialect.insert(MediaProbe).values(
+            source_checksum=key,
+            metadata_json={"format_name": format_name},
+            **values,
+        )
+        # Concurrent runs may probe the same media; the first row wins.
+        await self.session.execute(
+            statement.on_conflict_do_nothing(index_elements=["source_checksum"])
+        )
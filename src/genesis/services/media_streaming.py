@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from genesis.config import get_settings
+from genesis.models import MediaFile, Scene
+from genesis.services.assembly import AssemblyService
+from genesis.services.base import ServiceBase
+from genesis.services.scene_detection import SceneDetectionService, scene_label
+
+ProgressCallback = Callable[[dict[str, Any]], Awaitable[None]]
+
+# Marks the end of a lane's input queue.
+_DONE = None
+
+
+class MediaStreamingService(ServiceBase):
+    """Move each media file through detection, previews and trims as soon as it's ready.
+
+    Detection workers (which also extract and caption previews) hand finished
+    files to the trim lane over a bounded queue, so on large projects one file
+    is trimmed into the segment cache while the next is still being detected.
+    Each lane writes through its own session. Transcription is left to its own
+    pipeline stage so it runs under the model slot.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> None:
+        super().__init__(session)
+        self.session_factory = session_factory
+
+    async def process_project(
+        self,
+        project_id: uuid.UUID,
+        *,
+        progress: ProgressCallback | None = None,
+        render_profile: str | None = None,
+    ) -> dict[str, Any]:
+        result = await self.session.execute(
+            select(MediaFile).where(MediaFile.project_id == project_id)
+        )
+        media_files = list(result.scalars().unique())
+        await self.session.execute(delete(Scene).where(Scene.project_id == project_id))
+        await self.session.commit()
+
+        settings = get_settings()
+        workers = min(settings.scene_detect_workers or os.cpu_count() or 1, len(media_files)) or 1
+        pending: asyncio.Queue[MediaFile] = asyncio.Queue()
+        for media in media_files:
+            pending.put_nowait(media)
+        detected: asyncio.Queue[MediaFile | None] = asyncio.Queue(settings.pipeline_queue_size)
+
+        state: dict[str, Any] = {
+            str(media.id): {"scenes": None, "segments_cached": None} for media in media_files
+        }
+
+        async def _update(media_id: uuid.UUID, **fields: Any) -> None:
+            state[str(media_id)].update(fields)
+            if progress is not None:
+                await progress(state)
+
+        async def _detect_worker() -> None:
+            while not pending.empty():
+                media = pending.get_nowait()
+                async with self.session_factory() as session:
+                    scenes = await SceneDetectionService(session).detect_media(
+                        project_id, media
+                    )
+                    await session.commit()
+                await _update(media.id, scenes=len(scenes))
+                await detected.put(media)
+
+        async def _detect_lane() -> None:
+            await asyncio.gather(*(_detect_worker() for _ in range(workers)))
+            await detected.put(_DONE)
+
+        async def _trim_lane() -> int:
+            cached = 0
+            while (media := await detected.get()) is not _DONE:
+                async with self.session_factory() as session:
+                    count = await AssemblyService(session).prewarm_segments(
+                        project_id, media.id, render_profile=render_profile
+                    )
+                cached += count
+                await _update(media.id, segments_cached=count)
+            return cached
+
+        tasks = [asyncio.ensure_future(lane) for lane in (_detect_lane(), _trim_lane())]
+        try:
+            _, segments_cached = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        scene_count = await self._renumber_scenes(project_id, media_files)
+        return {
+            "scenes_created": scene_count,
+            "segments_cached": segments_cached,
+            "media_files": state,
+        }
+
+    async def _renumber_scenes(self, project_id: uuid.UUID, media_files: list[MediaFile]) -> int:
+        """Give scenes project-wide indexes and labels in media order, as batch detection does.
+
+        Labels a detector supplied (kept in ``metadata_json``) are left alone.
+        """
+
+        media_order = {media.id: position for position, media in enumerate(media_files)}
+        media_by_id = {media.id: media for media in media_files}
+        result = await self.session.execute(select(Scene).where(Scene.project_id == project_id))
+        scenes = sorted(
+            result.scalars(),
+            key=lambda scene: (
+                media_order.get(scene.media_file_id, len(media_order)),
+                scene.start_ms,
+            ),
+        )
+        for index, scene in enumerate(scenes):
+            scene.index = index
+            media = media_by_id.get(scene.media_file_id)
+            if media is not None and not (scene.metadata_json or {}).get("label"):
+                scene.label = scene_label(index, media)
+        await self.session.commit()
+        return len(scenes)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import math
 import uuid
 from pathlib import Path
 from typing import Any
@@ -10,6 +11,15 @@ from sqlalchemy import delete
 from genesis.config import get_settings
 from genesis.models import Artifact, ArtifactType, Run
 from genesis.services.base import ServiceBase
+from genesis.utils.audio import (
+    ducking_curve,
+    integrated_loudness,
+    load_pcm_wav,
+    peak_level,
+    rms_envelope,
+    voice_activity,
+    write_gain_commands,
+)
 from genesis.utils.ffmpeg import convert_audio_to_wav
 
 
@@ -39,7 +49,14 @@ class NarrationService(ServiceBase):
         wav_output = voiceover_dir / f"project_{project_id}_run_{run_id}.wav"
 
         # Convert to managed WAV asset
-        await asyncio.to_thread(convert_audio_to_wav, source_audio, wav_output)
+        await convert_audio_to_wav(source_audio, wav_output)
+        analysis = await asyncio.to_thread(
+            _analyze_voiceover,
+            wav_output,
+            wav_output.with_suffix(".duck.txt"),
+            offset_seconds=offset_seconds,
+            bed_gain=bed_gain,
+        )
 
         metadata: dict[str, Any] = {
             "kind": "voiceover_audio",
@@ -48,6 +65,12 @@ class NarrationService(ServiceBase):
             "offset_seconds": offset_seconds,
             "voiceover_gain": voiceover_gain,
             "bed_gain": bed_gain,
+            "analysis": analysis,
+            # What assembly should mix with: the requested gain plus loudness normalization.
+            "mix": {
+                "voiceover_gain": voiceover_gain * 10 ** (analysis["loudness_gain_db"] / 20),
+                "ducking_script": analysis.get("ducking_script"),
+            },
         }
 
         # Remove prior voiceover artifacts for this run
@@ -67,3 +90,57 @@ class NarrationService(ServiceBase):
         self.session.add(artifact)
         await self.session.flush()
         return artifact, wav_output
+
+
+def _analyze_voiceover(
+    wav_path: Path,
+    ducking_script: Path,
+    *,
+    offset_seconds: float,
+    bed_gain: float,
+) -> dict[str, Any]:
+    """Measure narration loudness and, with ducking on, write the bed's gain script.
+
+    The WAV is memory-mapped, so hour-long narration is analyzed in bounded chunks.
+    """
+
+    settings = get_settings()
+    audio = load_pcm_wav(wav_path)
+    loudness = integrated_loudness(audio)
+    peak = peak_level(audio)
+
+    gain_db = 0.0
+    if settings.voiceover_loudness_target is not None and math.isfinite(loudness):
+        # Reach the target without pushing sample peaks over the ceiling.
+        gain_db = min(
+            settings.voiceover_loudness_target - loudness,
+            settings.voiceover_peak_ceiling_db - peak,
+        )
+    analysis: dict[str, Any] = {
+        "integrated_loudness_lufs": round(loudness, 2) if math.isfinite(loudness) else None,
+        "peak_dbfs": round(peak, 2),
+        "loudness_gain_db": round(gain_db, 2),
+    }
+    if not settings.voiceover_ducking:
+        return analysis
+
+    frame_seconds = settings.voiceover_analysis_frame_seconds
+    # Detect speech at the level it will be mixed at.
+    envelope = rms_envelope(audio, frame_seconds) * 10 ** (gain_db / 20)
+    activity = voice_activity(envelope, settings.voiceover_vad_threshold_db)
+    gains = ducking_curve(
+        activity,
+        frame_seconds=frame_seconds,
+        duck_gain=bed_gain,
+        attack_seconds=settings.voiceover_duck_attack_seconds,
+        release_seconds=settings.voiceover_duck_release_seconds,
+    )
+    write_gain_commands(
+        ducking_script,
+        gains,
+        frame_seconds=frame_seconds,
+        offset_seconds=max(offset_seconds, 0.0),
+    )
+    analysis["speech_seconds"] = round(float(activity.sum()) * frame_seconds, 2)
+    analysis["ducking_script"] = str(ducking_script)
+    return analysis
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import uuid
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import flag_modified
 
+from genesis.config import get_settings
 from genesis.models import (
     Chapter,
     MediaFile,
@@ -14,14 +18,29 @@ from genesis.models import (
     ProjectStatus,
     Run,
     RunState,
-    Scene,
 )
+from genesis.orchestration.stage_graph import Stage, StageGraphExecutor
 from genesis.services.assembly import AssemblyService
+from genesis.services.audio import AudioExtractionService
 from genesis.services.base import ServiceBase
 from genesis.services.chapters import ChapterService
+from genesis.services.media_probe import MediaProbeService
+from genesis.services.media_streaming import MediaStreamingService
 from genesis.services.narration import NarrationService
+from genesis.services.proxies import ProxyService
 from genesis.services.scene_detection import SceneDetectionService
-from genesis.services.transcription import TranscriptionService
+from genesis.services.transcription import TRANSCRIPT_COMPLETE, TranscriptionService
+from genesis.utils.cache import cache_key, media_fingerprint
+from genesis.utils.scene_detect import DetectionOptions
+
+
+# Stages whose rows later runs may reuse, keyed by the graph stage that writes them.
+STAGE_OUTPUTS = {
+    "transcription": ("transcription",),
+    "scene_detection": ("scene_detection",),
+    "media_streaming": ("scene_detection",),
+    "chapters": ("chapters",),
+}
 
 
 class ProjectPipelineService(ServiceBase):
@@ -36,6 +55,7 @@ class ProjectPipelineService(ServiceBase):
         voiceover_offset: float = 0.0,
         voiceover_gain: float = 1.0,
         bed_gain: float = 0.3,
+        render_profile: str | None = None,
     ) -> Run:
         project = await self._load_project(project_id)
         if project is None:
@@ -49,36 +69,174 @@ class ProjectPipelineService(ServiceBase):
 
         try:
             self._validate_project_inputs(project)
+            settings = get_settings()
+            render_profile = render_profile or settings.render_profile
+            profile = settings.get_render_profile(render_profile)  # fail fast on unknown names
 
-            await self._transition_run(run, RunState.TRANSCRIBING)
-            transcripts = await TranscriptionService(self.session).transcribe_project(project_id)
-            await self.session.commit()
-            step_details["transcription"] = {
-                "transcripts_created": len(transcripts),
-                "media_files": [str(t.media_file_id) for t in transcripts],
-            }
-            await self._save_step_details(run, step_details)
+            fingerprints = self._stage_fingerprints(project)
+            session_factory = async_sessionmaker(
+                self.session.bind, class_=AsyncSession, expire_on_commit=False
+            )
+            executor = StageGraphExecutor(
+                session_factory,
+                limits={
+                    "cpu": settings.pipeline_cpu_slots,
+                    "model": settings.pipeline_model_slots,
+                },
+            )
 
-            await self._transition_run(run, RunState.SCENE_DETECTING)
-            scenes = await SceneDetectionService(self.session).detect_scenes(project_id)
-            await self.session.commit()
-            step_details["scene_detection"] = {
-                "scenes_created": len(scenes),
-                "captions_created": len(
-                    [s for s in scenes if s.metadata_json and s.metadata_json.get("caption")]
-                ),
-            }
-            await self._save_step_details(run, step_details)
+            def _stored(stage: str) -> dict[str, Any]:
+                return (project.stage_outputs or {}).get(stage) or {}
 
-            await self._transition_run(run, RunState.CHAPTERIZING)
-            chapters = await ChapterService(self.session).build_chapters(project_id)
-            await self.session.commit()
-            step_details["chapters"] = {"chapters_created": len(chapters)}
-            await self._save_step_details(run, step_details)
+            def _reusable(stage: str) -> bool:
+                return _stored(stage).get("fingerprint") == fingerprints[stage]
+
+            transcription_reusable = _reusable("transcription") and all(
+                media.transcript is not None
+                and (media.transcript.metadata_json or {}).get("status") == TRANSCRIPT_COMPLETE
+                for media in project.media_files
+            )
+
+            def _reused(stage: str) -> dict[str, Any]:
+                return {
+                    "fingerprint": fingerprints[stage],
+                    "skipped": True,
+                    "reused_from_run": _stored(stage).get("run_id"),
+                }
+
+            async def _invalidate(*stage_names: str) -> None:
+                """Forget stored outputs before a stage starts rewriting them."""
+
+                async def _save() -> None:
+                    await self._set_stage_outputs(project, dict.fromkeys(stage_names))
+
+                await executor.report(_save)
 
             voiceover_wav: Path | None = None
-            if voiceover_path is not None:
-                voiceover_artifact, voiceover_wav = await NarrationService(self.session).register_voiceover(
+            # Loudness-normalized gain and ducking script from the narration analysis.
+            voiceover_mix: dict[str, Any] = {}
+
+            async def _probe(session: AsyncSession) -> dict[str, Any]:
+                probes = await MediaProbeService(session).probe_project(project_id)
+                return {
+                    "media_files": {
+                        str(media_id): {
+                            "duration_ms": probe.duration_ms,
+                            "width": probe.width,
+                            "height": probe.height,
+                            "video_codec": probe.video_codec,
+                            "audio_codec": probe.audio_codec,
+                        }
+                        for media_id, probe in probes.items()
+                    },
+                }
+
+            async def _proxies(session: AsyncSession) -> dict[str, Any]:
+                if not settings.proxy_enabled:
+                    return {"skipped": True}
+                detection_reusable = _reusable("scene_detection") and project.scenes
+                if detection_reusable and not profile.use_proxy:
+                    return {
+                        "skipped": True,
+                        "reused_from_run": _stored("scene_detection").get("run_id"),
+                    }
+                proxies = await ProxyService(session).proxy_project(project_id)
+                return {
+                    "media_files": {str(media_id): str(path) for media_id, path in proxies.items()},
+                }
+
+            async def _audio_extraction(session: AsyncSession) -> dict[str, Any]:
+                if transcription_reusable:
+                    return {
+                        "skipped": True,
+                        "reused_from_run": _stored("transcription").get("run_id"),
+                    }
+                audio_paths = await AudioExtractionService(session).extract_project(project_id)
+                return {
+                    "media_files": {
+                        str(media_id): str(path) for media_id, path in audio_paths.items()
+                    },
+                }
+
+            async def _report_transcription(progress: dict[str, Any]) -> None:
+                async def _save() -> None:
+                    step_details["transcription"] = {"progress": progress}
+                    await self._save_step_details(run, step_details)
+
+                await executor.report(_save)
+
+            async def _transcription(session: AsyncSession) -> dict[str, Any]:
+                if transcription_reusable:
+                    return _reused("transcription")
+                await _invalidate("transcription", "chapters")
+                transcripts = await TranscriptionService(session).transcribe_project(
+                    project_id, progress=_report_transcription
+                )
+                return {
+                    "fingerprint": fingerprints["transcription"],
+                    "transcripts_created": len(transcripts),
+                    "media_files": [str(t.media_file_id) for t in transcripts],
+                }
+
+            async def _scene_detection(session: AsyncSession) -> dict[str, Any]:
+                if _reusable("scene_detection") and project.scenes:
+                    return _reused("scene_detection")
+                await _invalidate("scene_detection", "chapters")
+                scenes = await SceneDetectionService(session).detect_scenes(project_id)
+                return {
+                    "fingerprint": fingerprints["scene_detection"],
+                    "scenes_created": len(scenes),
+                    "captions_created": len(
+                        [s for s in scenes if s.metadata_json and s.metadata_json.get("caption")]
+                    ),
+                }
+
+            async def _report_streaming(progress: dict[str, Any]) -> None:
+                async def _save() -> None:
+                    step_details["media_streaming"] = {"progress": progress}
+                    await self._save_step_details(run, step_details)
+
+                await executor.report(_save)
+
+            async def _media_streaming(session: AsyncSession) -> dict[str, Any]:
+                if _reusable("scene_detection") and project.scenes:
+                    details = {
+                        "skipped": True,
+                        "reused_from_run": _stored("scene_detection").get("run_id"),
+                    }
+                    scene_details = _reused("scene_detection")
+                else:
+                    await _invalidate("scene_detection", "chapters")
+                    streaming = MediaStreamingService(session, session_factory)
+                    details = await streaming.process_project(
+                        project_id, progress=_report_streaming, render_profile=render_profile
+                    )
+                    scene_details = {
+                        "fingerprint": fingerprints["scene_detection"],
+                        "scenes_created": details["scenes_created"],
+                    }
+
+                # Record the scene_detection fingerprint so later runs in either mode can reuse it.
+                async def _save() -> None:
+                    step_details["scene_detection"] = scene_details
+
+                await executor.report(_save)
+                return details
+
+            async def _chapters(session: AsyncSession) -> dict[str, Any]:
+                if _reusable("chapters") and project.chapters:
+                    return _reused("chapters")
+                await _invalidate("chapters")
+                chapters = await ChapterService(session).build_chapters(project_id)
+                return {
+                    "fingerprint": fingerprints["chapters"],
+                    "chapters_created": len(chapters),
+                }
+
+            async def _voiceover(session: AsyncSession) -> dict[str, Any]:
+                nonlocal voiceover_wav, voiceover_mix
+                narration = NarrationService(session)
+                voiceover_artifact, voiceover_wav = await narration.register_voiceover(
                     project_id,
                     run.id,
                     voiceover_path,
@@ -86,33 +244,131 @@ class ProjectPipelineService(ServiceBase):
                     voiceover_gain=voiceover_gain,
                     bed_gain=bed_gain,
                 )
-                await self.session.commit()
-                step_details["voiceover"] = {
+                voiceover_mix = voiceover_artifact.metadata_json["mix"]
+                return {
                     "artifact_id": str(voiceover_artifact.id),
-                    "wav_path": voiceover_artifact.metadata_json.get("wav_path") if voiceover_artifact.metadata_json else voiceover_artifact.s3_key,
+                    "wav_path": (
+                        voiceover_artifact.metadata_json.get("wav_path")
+                        if voiceover_artifact.metadata_json
+                        else voiceover_artifact.s3_key
+                    ),
                     "offset_seconds": voiceover_offset,
                     "voiceover_gain": voiceover_gain,
                     "bed_gain": bed_gain,
+                    "analysis": voiceover_artifact.metadata_json["analysis"],
+                }
+
+            async def _report_assembly(progress: dict[str, Any]) -> None:
+                async def _save() -> None:
+                    step_details["assembly"] = {"progress": progress}
+                    await self._save_step_details(run, step_details)
+
+                await executor.report(_save)
+
+            async def _assembly(session: AsyncSession) -> dict[str, Any]:
+                artifact = await AssemblyService(session).assemble(
+                    project_id,
+                    run.id,
+                    voiceover_wav=voiceover_wav,
+                    voiceover_offset=voiceover_offset,
+                    voiceover_gain=voiceover_mix.get("voiceover_gain", voiceover_gain),
+                    bed_gain=bed_gain,
+                    ducking_script=(
+                        Path(voiceover_mix["ducking_script"])
+                        if voiceover_mix.get("ducking_script")
+                        else None
+                    ),
+                    render_profile=render_profile,
+                    progress=_report_assembly,
+                )
+                return {
+                    "artifact_id": str(artifact.id),
+                    "artifact_path": artifact.s3_key,
+                    "render_profile": render_profile,
                 }
-                await self._save_step_details(run, step_details)
-
-            await self._transition_run(run, RunState.ASSEMBLING)
-            artifact = await AssemblyService(self.session).assemble(
-                project_id,
-                run.id,
-                voiceover_wav=voiceover_wav,
-                voiceover_offset=voiceover_offset,
-                voiceover_gain=voiceover_gain,
-                bed_gain=bed_gain,
+
+            if settings.pipeline_mode == "streaming":
+                chapter_inputs: tuple[str, ...] = ("transcription", "media_streaming")
+                assembly_inputs: tuple[str, ...] = ("media_streaming",)
+                stages = [
+                    Stage("probe", _probe, state=RunState.VALIDATING),
+                    Stage(
+                        "transcription",
+                        _transcription,
+                        resource="model",
+                        state=RunState.TRANSCRIBING,
+                    ),
+                    Stage(
+                        "media_streaming",
+                        _media_streaming,
+                        depends_on=("probe",),
+                        state=RunState.SCENE_DETECTING,
+                    ),
+                ]
+            else:
+                chapter_inputs = ("transcription", "scene_detection")
+                assembly_inputs = ("scene_detection",)
+                stages = [
+                    Stage("probe", _probe, state=RunState.VALIDATING),
+                    Stage("proxies", _proxies, state=RunState.VALIDATING),
+                    Stage("audio_extraction", _audio_extraction, state=RunState.TRANSCRIBING),
+                    Stage(
+                        "transcription",
+                        _transcription,
+                        depends_on=("audio_extraction",),
+                        resource="model",
+                        state=RunState.TRANSCRIBING,
+                    ),
+                    Stage(
+                        "scene_detection",
+                        _scene_detection,
+                        depends_on=("probe", "proxies"),
+                        state=RunState.SCENE_DETECTING,
+                    ),
+                ]
+            stages.append(
+                Stage(
+                    "chapters",
+                    _chapters,
+                    depends_on=chapter_inputs,
+                    state=RunState.CHAPTERIZING,
+                )
             )
-            await self.session.commit()
-            step_details["assembly"] = {
-                "artifact_id": str(artifact.id),
-                "artifact_path": artifact.s3_key,
-            }
+            if voiceover_path is not None:
+                stages.append(Stage("voiceover", _voiceover))
+                assembly_inputs += ("voiceover",)
+            stages.append(
+                Stage("assembly", _assembly, depends_on=assembly_inputs, state=RunState.ASSEMBLING)
+            )
+
+            running: list[Stage] = []
+
+            async def _on_start(stage: Stage) -> None:
+                running.append(stage)
+                await self._sync_stage_progress(run, step_details, stages, running)
+
+            async def _on_finish(stage: Stage, details: dict[str, Any]) -> None:
+                running.remove(stage)
+                step_details[stage.name] = details
+                # The stage's session has committed, so its rows now match the fingerprint.
+                if stage.name in STAGE_OUTPUTS and not details.get("skipped"):
+                    await self._set_stage_outputs(
+                        project,
+                        {
+                            name: {"fingerprint": fingerprints[name], "run_id": str(run.id)}
+                            for name in STAGE_OUTPUTS[stage.name]
+                        },
+                    )
+                await self._sync_stage_progress(run, step_details, stages, running)
+
+            await executor.execute(stages, on_start=_on_start, on_finish=_on_finish)
+            step_details.pop("active_stages", None)
             await self._save_step_details(run, step_details)
 
         except Exception as exc:  # pragma: no cover - defensive path
+            # Stages still starting or reporting are cancelled when one fails,
+            # possibly mid-commit, which leaves this session needing a rollback.
+            await self.session.rollback()
             run.error_message = str(exc)
             await self._transition_run(run, RunState.FAILED, ended=True)
             await self._update_project_status(project, ProjectStatus.FAILED)
@@ -136,6 +392,68 @@ class ProjectPipelineService(ServiceBase):
             ),
         )
 
+    def _stage_fingerprints(self, project: Project) -> dict[str, str]:
+        """Hash each stage's inputs so a later run can tell whether its outputs still hold."""
+
+        settings = get_settings()
+        media = sorted(
+            (str(media.id), media_fingerprint(Path(media.s3_key), media.checksum))
+            for media in project.media_files
+        )
+        transcription = cache_key(
+            "transcription",
+            media,
+            settings.whisper_model_size,
+            settings.whisper_compute_type,
+            settings.whisper_beam_size,
+            settings.whisper_batch_size,
+            settings.whisper_word_timestamps,
+        )
+        scene_detection = cache_key(
+            "scene_detection",
+            media,
+            asdict(DetectionOptions.from_settings(settings)),
+            settings.scene_preview_mode,
+            settings.proxy_enabled and (settings.proxy_max_height, settings.proxy_crf),
+            settings.caption_model_name,
+        )
+        return {
+            "transcription": transcription,
+            "scene_detection": scene_detection,
+            "chapters": cache_key("chapters", transcription, scene_detection),
+        }
+
+    async def _set_stage_outputs(
+        self, project: Project, outputs: dict[str, dict[str, Any] | None]
+    ) -> None:
+        """Update ``Project.stage_outputs``; ``None`` forgets a stage's outputs."""
+
+        stored = dict(project.stage_outputs or {})
+        for stage, output in outputs.items():
+            if output is None:
+                stored.pop(stage, None)
+            else:
+                stored[stage] = output
+        project.stage_outputs = stored
+        await self.session.commit()
+
+    async def _sync_stage_progress(
+        self,
+        run: Run,
+        step_details: dict[str, Any],
+        stages: list[Stage],
+        running: list[Stage],
+    ) -> None:
+        """Show the earliest running stage's state and the set of active stages."""
+
+        active = [stage for stage in stages if stage in running]
+        for stage in active:
+            if stage.state is not None:
+                run.state = stage.state
+                break
+        step_details["active_stages"] = [stage.name for stage in active]
+        await self._save_step_details(run, step_details)
+
     async def _get_or_create_run(self, project_id: uuid.UUID, run_id: uuid.UUID | None) -> Run:
         if run_id:
             run = await self.session.get(Run, run_id)
@@ -169,6 +487,8 @@ class ProjectPipelineService(ServiceBase):
 
     async def _save_step_details(self, run: Run, details: dict[str, Any]) -> None:
         run.step_details = details
+        # ``details`` is usually mutated in place, which JSON columns don't detect.
+        flag_modified(run, "step_details")
         await self.session.commit()
 
     async def _update_project_status(self, project: Project, status: ProjectStatus) -> None:
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+from pathlib import Path
+from typing import Iterable
+
+from sqlalchemy import select
+
+from genesis.config import get_settings
+from genesis.models import MediaFile
+from genesis.services.base import ServiceBase
+from genesis.utils.cache import FileCache, cache_key, media_fingerprint
+from genesis.utils.ffmpeg import create_proxy
+
+
+class ProxyService(ServiceBase):
+    """Create each media file's low-resolution, all-intra proxy once, cached by checksum.
+
+    Detection, preview extraction and proxy-backed render profiles read the
+    proxy; everything else keeps using the original. With proxies disabled the
+    original path is returned in its place.
+    """
+
+    async def proxy_project(self, project_id: uuid.UUID) -> dict[uuid.UUID, Path]:
+        result = await self.session.execute(
+            select(MediaFile).where(MediaFile.project_id == project_id)
+        )
+        return await self.proxy_many(result.scalars().unique())
+
+    async def proxy_many(self, media_files: Iterable[MediaFile]) -> dict[uuid.UUID, Path]:
+        """Proxy path per media id, encoding missing proxies ``render_concurrency`` at a time."""
+
+        media_files = list(media_files)
+        settings = get_settings()
+        semaphore = asyncio.Semaphore(settings.render_concurrency or os.cpu_count() or 1)
+
+        async def _proxy(media: MediaFile) -> Path:
+            async with semaphore:
+                return await self.proxy_for(media)
+
+        paths = await asyncio.gather(*(_proxy(media) for media in media_files))
+        if settings.proxy_enabled:
+            cache = FileCache("proxies", settings.proxy_cache_max_bytes)
+            await asyncio.to_thread(cache.evict, paths)
+        return {media.id: path for media, path in zip(media_files, paths)}
+
+    async def proxy_for(self, media: MediaFile) -> Path:
+        """Path to the cached proxy for ``media``, encoding it on first use."""
+
+        media_path = self._media_path(media)
+        settings = get_settings()
+        if not settings.proxy_enabled:
+            return media_path
+
+        cache = FileCache("proxies", settings.proxy_cache_max_bytes)
+        key = self.proxy_key(media)
+        cached = cache.lookup(key, ".mp4")
+        if cached is not None:
+            return cached
+
+        partial = cache.root / f"{key}.{uuid.uuid4().hex}.partial.mp4"
+        try:
+            await create_proxy(
+                media_path,
+                partial,
+                max_height=settings.proxy_max_height,
+                crf=settings.proxy_crf,
+            )
+            return cache.store(key, partial)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def proxy_key(cls, media: MediaFile) -> str:
+        """Identity of ``media``'s proxy: the source plus the proxy encode settings."""
+
+        settings = get_settings()
+        return cache_key(
+            "proxy",
+            media_fingerprint(cls._media_path(media), media.checksum),
+            settings.proxy_max_height,
+            settings.proxy_crf,
+        )
+
+    @staticmethod
+    def proxy_frame_size(width: int, height: int) -> tuple[int, int]:
+        """Frame size a ``width`` x ``height`` source has once proxied."""
+
+        max_height = get_settings().proxy_max_height
+        if height <= max_height:
+            return width, height
+        return 2 * round(width * max_height / height / 2), max_height
+
+    @staticmethod
+    def _media_path(media: MediaFile) -> Path:
+        media_path = Path(media.s3_key)
+        if not media_path.exists():
+            raise FileNotFoundError(f"Media path not found for proxy: {media_path}")
+        return media_path
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import select, update
+
+from genesis.config import get_settings
+from genesis.models import Run, RunJob, RunJobStatus, RunState
+from genesis.models.mixins import utcnow
+from genesis.services.base import ServiceBase
+
+
+class RunQueueService(ServiceBase):
+    """Database-backed queue of pipeline runs shared by the API and workers.
+
+    A worker leases a job for ``job_lease_seconds`` and keeps extending the lease
+    with heartbeats. When a lease runs out (the worker died), the job goes back
+    to the queue, or fails once it has used up ``job_max_attempts``. Every call
+    commits, so locks are never held while a run is processing.
+    """
+
+    async def enqueue(self, run: Run, options: dict[str, Any] | None = None) -> RunJob:
+        job = RunJob(run_id=run.id, options_json=options or None)
+        self.session.add(job)
+        await self.session.flush()
+        return job
+
+    async def claim(self, worker_id: str) -> RunJob | None:
+        await self.recover_abandoned()
+
+        lease = timedelta(seconds=get_settings().job_lease_seconds)
+        while True:
+            result = await self.session.execute(
+                select(RunJob.id)
+                .where(RunJob.status == RunJobStatus.QUEUED)
+                .order_by(RunJob.enqueued_at, RunJob.id)
+                .limit(1)
+            )
+            job_id = result.scalar_one_or_none()
+            if job_id is None:
+                await self.session.commit()
+                return None
+
+            # Conditional update so concurrent workers can't both take the job.
+            claimed = await self.session.execute(
+                update(RunJob)
+                .where(RunJob.id == job_id, RunJob.status == RunJobStatus.QUEUED)
+                .values(
+                    status=RunJobStatus.RUNNING,
+                    lease_owner=worker_id,
+                    lease_expires_at=utcnow() + lease,
+                    attempts=RunJob.attempts + 1,
+                )
+            )
+            await self.session.commit()
+            if claimed.rowcount == 1:
+                return await self.session.get(RunJob, job_id, populate_existing=True)
+
+    async def heartbeat(self, job_id: uuid.UUID, worker_id: str) -> bool:
+        """Extend the lease; ``False`` means the job is no longer ours."""
+
+        lease = timedelta(seconds=get_settings().job_lease_seconds)
+        result = await self.session.execute(
+            update(RunJob)
+            .where(
+                RunJob.id == job_id,
+                RunJob.lease_owner == worker_id,
+                RunJob.status == RunJobStatus.RUNNING,
+            )
+            .values(lease_expires_at=utcnow() + lease)
+        )
+        await self.session.commit()
+        return result.rowcount == 1
+
+    async def complete(self, job_id: uuid.UUID, worker_id: str) -> None:
+        await self._finish(job_id, worker_id, RunJobStatus.COMPLETED)
+
+    async def fail(self, job_id: uuid.UUID, worker_id: str, error: str) -> None:
+        await self._finish(job_id, worker_id, RunJobStatus.FAILED, error)
+
+    async def recover_abandoned(self) -> int:
+        """Requeue jobs whose lease expired; fail those out of attempts. Returns requeued count."""
+
+        settings = get_settings()
+        expired = (RunJob.status == RunJobStatus.RUNNING) & (
+            RunJob.lease_expires_at < utcnow()
+        )
+
+        result = await self.session.execute(
+            select(RunJob).where(expired, RunJob.attempts >= settings.job_max_attempts)
+        )
+        for job in result.scalars():
+            message = f"Worker lease expired after {job.attempts} attempts"
+            job.status = RunJobStatus.FAILED
+            job.lease_owner = None
+            job.error_message = message
+            run = await self.session.get(Run, job.run_id)
+            if run is not None:
+                run.state = RunState.FAILED
+                run.error_message = message
+                run.ended_at = utcnow()
+
+        requeued = await self.session.execute(
+            update(RunJob)
+            .where(expired, RunJob.attempts < settings.job_max_attempts)
+            .values(status=RunJobStatus.QUEUED, lease_owner=None, lease_expires_at=None)
+        )
+        await self.session.commit()
+        return requeued.rowcount
+
+    async def _finish(
+        self,
+        job_id: uuid.UUID,
+        worker_id: str,
+        status: RunJobStatus,
+        error: str | None = None,
+    ) -> None:
+        await self.session.execute(
+            update(RunJob)
+            .where(RunJob.id == job_id, RunJob.lease_owner == worker_id)
+            .values(status=status, lease_expires_at=None, error_message=error)
+        )
+        await self.session.commit()
@@ -5,6 +5,7 @@ from datetime import datetime
 
 from sqlalchemy import select
 
+from genesis.config import get_settings
 from genesis.models.project import Project, ProjectStatus
 from genesis.models.run import Run, RunState
 from genesis.orchestration.workflow import WorkflowOrchestrator
@@ -18,7 +19,13 @@ class RunService(ServiceBase):
         )
         return result.scalar_one_or_none()
 
-    async def start_run(self, project_id: uuid.UUID) -> Run | None:
+    async def start_run(
+        self, project_id: uuid.UUID, *, render_profile: str | None = None
+    ) -> Run | None:
+        if render_profile is not None:
+            # Reject unknown profiles up front rather than failing in the worker.
+            get_settings().get_render_profile(render_profile)
+
         project = await self._get_project(project_id)
         if project is None:
             return None
@@ -30,11 +37,15 @@ class RunService(ServiceBase):
         )
         project.status = ProjectStatus.PROCESSING
         self.session.add(run)
-        await self.session.commit()
-        await self.session.refresh(run)
+        await self.session.flush()
 
+        # The run and its queue entry are committed together so no run is orphaned.
         orchestrator = WorkflowOrchestrator(self.session)
-        await orchestrator.enqueue(run)
+        await orchestrator.enqueue(
+            run, {"render_profile": render_profile} if render_profile else None
+        )
+        await self.session.commit()
+        await self.session.refresh(run)
 
         return run
 
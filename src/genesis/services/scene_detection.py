@@ -1,129 +1,241 @@
 from __future__ import annotations
 
 import asyncio
+import os
 import uuid
 from pathlib import Path
 from typing import Any
 
-from scenedetect import ContentDetector, SceneManager, VideoManager
 from sqlalchemy import delete, select
 
 from genesis.config import get_settings
-from genesis.ml.captioner import caption_image
 from genesis.models import MediaFile, Scene as SceneModel
 from genesis.services.base import ServiceBase
-from genesis.utils.ffmpeg import extract_scene_frame
+from genesis.services.captions import CaptionService
+from genesis.services.media_probe import MediaProbeService
+from genesis.services.proxies import ProxyService
+from genesis.utils.ffmpeg import extract_scene_frames
+from genesis.utils.scene_detect import (
+    DetectedScene,
+    DetectionOptions,
+    detect_media_scenes,
+    detection_pool,
+)
+
+
+def scene_label(scene_index: int, media: MediaFile) -> str:
+    """Default label for a scene without a detector-provided one."""
+
+    return f"Scene {scene_index + 1}: {media.original_filename}"
 
 
 class SceneDetectionService(ServiceBase):
     """Detect scenes, extract representative frames, and caption them."""
 
-    def __init__(self, session, detector: Any | None = None) -> None:  # type: ignore[no-untyped-def]
+    def __init__(  # type: ignore[no-untyped-def]
+        self,
+        session,
+        detector: Any | None = None,
+    ) -> None:
         super().__init__(session)
-        self.detector = detector or ContentDetector(threshold=27.0, min_scene_len=15)
+        # When unset, each media file gets a fresh ContentDetector built from Settings.
+        self.detector = detector
 
     async def detect_scenes(self, project_id: uuid.UUID) -> list[SceneModel]:
-        await self.session.execute(
-            delete(SceneModel).where(SceneModel.project_id == project_id)
-        )
-
         result = await self.session.execute(
             select(MediaFile).where(MediaFile.project_id == project_id)
         )
         media_files = list(result.scalars().unique())
+        for media in media_files:
+            self._check_media(media)
+        probes = await MediaProbeService(self.session).probe_many(media_files)
+        # Detection and previews decode the proxies; scene times carry over unchanged.
+        proxies = await ProxyService(self.session).proxy_many(media_files)
+        media_paths = [proxies[media.id] for media in media_files]
+
+        preview_dir, capture_dir = self._preview_dirs()
+        all_detections = await self._run_detections(media_paths, capture_dir)
 
         scenes: list[SceneModel] = []
-        scene_index = 0
-        for media in media_files:
-            media_path = Path(media.s3_key)
-            if not media_path.exists():
-                raise FileNotFoundError(f"Media path not found for scene detection: {media_path}")
+        preview_paths: list[Path] = []
+        for media, media_path, detections in zip(media_files, media_paths, all_detections):
+            media_scenes, media_previews = await self._build_media_scenes(
+                project_id,
+                media,
+                media_path,
+                detections,
+                len(scenes),
+                preview_dir,
+                probes[media.id].duration_ms,
+            )
+            scenes.extend(media_scenes)
+            preview_paths.extend(media_previews)
+
+        # Caption all previews in bulk so BLIP runs batched instead of once per scene.
+        await self._caption_scenes(scenes, preview_paths)
+
+        # Replace the old scenes only now, keeping the write transaction short
+        # while detection runs alongside other stages.
+        await self.session.execute(
+            delete(SceneModel).where(SceneModel.project_id == project_id)
+        )
+        self.session.add_all(scenes)
+        await self.session.flush()
+        return scenes
+
+    async def detect_media(
+        self, project_id: uuid.UUID, media: MediaFile, *, first_index: int = 0
+    ) -> list[SceneModel]:
+        """Detect, preview and caption one media file's scenes and add them to the session.
+
+        Existing scenes are left alone; callers streaming several files own
+        clearing them and the final ``Scene.index`` numbering.
+        """
+
+        self._check_media(media)
+        probes = await MediaProbeService(self.session).probe_many([media])
+        media_path = await ProxyService(self.session).proxy_for(media)
+        preview_dir, capture_dir = self._preview_dirs()
+        (detections,) = await self._run_detections([media_path], capture_dir)
+        scenes, preview_paths = await self._build_media_scenes(
+            project_id,
+            media,
+            media_path,
+            detections,
+            first_index,
+            preview_dir,
+            probes[media.id].duration_ms,
+        )
+        await self._caption_scenes(scenes, preview_paths)
+        self.session.add_all(scenes)
+        await self.session.flush()
+        return scenes
 
-            detections = await self._run_detection(media_path)
-            if not detections:
-                fallback_duration = (media.duration_ms or 5000) / 1000
-                detections = [(0.0, fallback_duration, {})]
+    @staticmethod
+    def _check_media(media: MediaFile) -> None:
+        media_path = Path(media.s3_key)
+        if not media_path.exists():
+            raise FileNotFoundError(f"Media path not found for scene detection: {media_path}")
 
-            for start_s, end_s, metadata in detections:
-                start_ms = int(start_s * 1000)
-                end_ms = int(end_s * 1000)
-                label = metadata.get("label") or f"Scene {scene_index + 1}: {media.original_filename}"
+    @staticmethod
+    def _preview_dirs() -> tuple[Path, Path | None]:
+        settings = get_settings()
+        preview_dir = Path(settings.artifact_root) / "scene_previews"
+        preview_dir.mkdir(parents=True, exist_ok=True)
+        capture_dir = preview_dir if settings.scene_preview_mode == "fused" else None
+        return preview_dir, capture_dir
 
-                scene_model = SceneModel(
+    async def _build_media_scenes(
+        self,
+        project_id: uuid.UUID,
+        media: MediaFile,
+        media_path: Path,
+        detections: list[DetectedScene],
+        first_index: int,
+        preview_dir: Path,
+        duration_ms: int | None = None,
+    ) -> tuple[list[SceneModel], list[Path]]:
+        if not detections:
+            # No cuts found: the whole file is one scene, as long as the probe says it is.
+            fallback_duration = (duration_ms or media.duration_ms or 5000) / 1000
+            detections = [DetectedScene(0.0, fallback_duration)]
+
+        media_scenes: list[SceneModel] = []
+        for scene_index, detection in enumerate(detections, start=first_index):
+            label = detection.metadata.get("label") or scene_label(scene_index, media)
+            media_scenes.append(
+                SceneModel(
+                    id=uuid.uuid4(),
                     project_id=project_id,
                     media_file_id=media.id,
                     index=scene_index,
-                    start_ms=start_ms,
-                    end_ms=end_ms,
+                    start_ms=int(detection.start_seconds * 1000),
+                    end_ms=int(detection.end_seconds * 1000),
                     label=label,
+                    metadata_json=dict(detection.metadata),
                 )
-                self.session.add(scene_model)
-                await self.session.flush()
-
-                preview_path = await self._generate_preview(scene_model, media_path, start_s, end_s)
-                caption = await asyncio.to_thread(caption_image, preview_path)
-
-                metadata_payload: dict[str, Any] = {
-                    **metadata,
-                    "caption": caption,
-                    "preview_uri": str(preview_path),
-                }
-                scene_model.preview_uri = str(preview_path)
-                scene_model.metadata_json = metadata_payload
-                scenes.append(scene_model)
-                scene_index += 1
+            )
 
-        await self.session.flush()
-        return scenes
+        media_previews = await self._generate_previews(
+            media_scenes, media_path, detections, preview_dir
+        )
+        for scene_model, preview_path in zip(media_scenes, media_previews):
+            scene_model.preview_uri = str(preview_path)
+            scene_model.metadata_json = {
+                **(scene_model.metadata_json or {}),
+                "preview_uri": str(preview_path),
+            }
+        return media_scenes, media_previews
+
+    async def _caption_scenes(self, scenes: list[SceneModel], preview_paths: list[Path]) -> None:
+        captions = await CaptionService(self.session).caption_previews(preview_paths)
+        for scene, caption in zip(scenes, captions):
+            scene.metadata_json = {**(scene.metadata_json or {}), "caption": caption}
+
+    async def _run_detections(
+        self,
+        media_paths: list[Path],
+        capture_dir: Path | None = None,
+    ) -> list[list[DetectedScene]]:
+        """Detect scenes for every media file, returning results in input order.
 
-    async def _run_detection(self, media_path: Path) -> list[tuple[float, float, dict[str, Any]]]:
-        def _detect() -> list[tuple[float, float, dict[str, Any]]]:
-            video_manager = VideoManager([str(media_path)])
-            scene_manager = SceneManager()
-            scene_manager.add_detector(self.detector)
-
-            try:
-                video_manager.start()
-                scene_manager.detect_scenes(frame_source=video_manager)
-                scene_list = scene_manager.get_scene_list()
-            finally:
-                video_manager.release()
-
-            detections: list[tuple[float, float, dict[str, Any]]] = []
-            for scene in scene_list:
-                start_time = scene[0]
-                end_time = scene[1]
-                detections.append(
-                    (
-                        start_time.get_seconds(),
-                        end_time.get_seconds(),
-                        {
-                            "start_timecode": str(start_time),
-                            "end_timecode": str(end_time),
-                        },
+        Files are fanned out to the shared detection pool so OpenCV/scenedetect's
+        Python loops don't contend for one GIL. A caller-supplied detector is
+        stateful and may not pickle, so it runs in-process, one file at a time,
+        as does everything when ``scene_detect_workers`` is 1.
+        """
+
+        settings = get_settings()
+        options = DetectionOptions.from_settings(settings)
+
+        if self.detector is not None or settings.scene_detect_workers == 1:
+            results: list[list[DetectedScene]] = []
+            for media_path in media_paths:
+                results.append(
+                    await asyncio.to_thread(
+                        detect_media_scenes, media_path, options, capture_dir, self.detector
                     )
                 )
-            return detections
-
-        return await asyncio.to_thread(_detect)
+            return results
+
+        loop = asyncio.get_running_loop()
+        pool = detection_pool()
+        return list(
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        pool, detect_media_scenes, media_path, options, capture_dir
+                    )
+                    for media_path in media_paths
+                )
+            )
+        )
 
-    async def _generate_preview(
+    async def _generate_previews(
         self,
-        scene: SceneModel,
+        scenes: list[SceneModel],
         media_path: Path,
-        start_seconds: float,
-        end_seconds: float,
-    ) -> Path:
-        midpoint = (start_seconds + end_seconds) / 2 if end_seconds > start_seconds else start_seconds
-        settings = get_settings()
-        preview_dir = Path(settings.artifact_root) / "scene_previews"
-        preview_dir.mkdir(parents=True, exist_ok=True)
-        output_path = preview_dir / f"{scene.id}.jpg"
-
-        await asyncio.to_thread(
-            extract_scene_frame,
-            media_path,
-            midpoint,
-            output_path,
-        )
-        return output_path
+        detections: list[DetectedScene],
+        preview_dir: Path,
+    ) -> list[Path]:
+        """Place each scene's preview, extracting any not captured during detection.
+
+        Missing previews are pulled from the media file in a single decode.
+        """
+
+        output_paths = [preview_dir / f"{scene.id}.jpg" for scene in scenes]
+        missing: list[tuple[float, Path]] = []
+        for detection, output_path in zip(detections, output_paths):
+            if detection.preview_path is not None:
+                os.replace(detection.preview_path, output_path)
+                continue
+            start, end = detection.start_seconds, detection.end_seconds
+            missing.append(((start + end) / 2 if end > start else start, output_path))
+
+        if missing:
+            await extract_scene_frames(
+                media_path,
+                [timestamp for timestamp, _ in missing],
+                [path for _, path in missing],
+            )
+        return output_paths
@@ -1,89 +1,546 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import threading
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable
 
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
 
-from genesis.ml.whisper import get_whisper_model
-from genesis.models import MediaFile, MediaFileStatus, Transcript
+from genesis.config import get_settings
+from genesis.ml.whisper import get_batched_pipeline, get_whisper_model
+from genesis.models import MediaFile, MediaFileStatus, Transcript, TranscriptSegment
+from genesis.services.audio import AudioExtractionService
 from genesis.services.base import ServiceBase
+from genesis.services.media_probe import MediaProbeService
+from genesis.utils.audio import load_pcm_wav
+
+ProgressCallback = Callable[[dict[str, Any]], Awaitable[None]]
+
+TRANSCRIPT_IN_PROGRESS = "in_progress"
+TRANSCRIPT_COMPLETE = "complete"
+
+# Per-segment fields kept in ``TranscriptSegment.metadata_json``.
+_SEGMENT_METADATA_KEYS = ("avg_logprob", "temperature", "compression_ratio", "words")
+
+
+class _StreamAborted(Exception):
+    """Raised inside a whisper thread once the writer has given up on the run."""
 
 
 class TranscriptionService(ServiceBase):
     """Run Whisper transcription for each media file in a project."""
 
-    async def transcribe_project(self, project_id: uuid.UUID) -> list[Transcript]:
+    async def transcribe_project(
+        self,
+        project_id: uuid.UUID,
+        *,
+        progress: ProgressCallback | None = None,
+    ) -> list[Transcript]:
         result = await self.session.execute(
-            select(MediaFile).where(MediaFile.project_id == project_id)
+            select(MediaFile)
+            .options(selectinload(MediaFile.transcript))
+            .where(MediaFile.project_id == project_id)
         )
         media_files = list(result.scalars().unique())
 
-        transcripts: list[Transcript] = []
+        pending: list[MediaFile] = []
         for media in media_files:
-            if media.transcript:
+            if media.transcript is not None and not _matches_settings(media.transcript, media):
+                # Made with other whisper settings: redo it rather than keep or resume it.
+                media.transcript = None
+            elif media.transcript and _transcript_status(media.transcript) == TRANSCRIPT_COMPLETE:
                 continue
-
             media_path = Path(media.s3_key)
             if not media_path.exists():
                 raise FileNotFoundError(f"Media path not found for transcription: {media_path}")
+            pending.append(media)
+        await self.session.commit()
 
-            segments, info = await self._run_whisper(media_path)
-            text = " ".join(segment["text"] for segment in segments).strip()
+        silent, pending = await self._store_silent_transcripts(pending)
+        reused, pending = await self._reuse_cached_transcripts(pending)
+        progress_state: dict[str, Any] = {
+            str(transcript.media_file_id): {"status": "no_audio"} for transcript in silent
+        }
+        progress_state.update(
+            {str(transcript.media_file_id): {"status": "cached"} for transcript in reused}
+        )
+        reused = silent + reused
+        if progress_state and progress is not None:
+            await progress(progress_state)
 
-            transcript = Transcript(
-                media_file_id=media.id,
-                language=info.get("language"),
-                text=text,
-                json_uri=None,
-                metadata_json={
-                    "segments": segments,
-                    "generated_at": datetime.utcnow().isoformat(),
-                    "whisper_info": info,
-                },
-            )
-            self.session.add(transcript)
-            transcripts.append(transcript)
+        if get_settings().transcript_streaming:
+            return reused + await self._transcribe_streaming(pending, progress, progress_state)
+
+        # A partial streamed transcript is redone from scratch in whole-file mode.
+        for media in pending:
+            if media.transcript is not None:
+                await self.session.delete(media.transcript)
+        await self.session.commit()
 
-            duration = info.get("duration")
-            if duration and media.duration_ms is None:
-                media.duration_ms = int(duration * 1000)
-            media.status = MediaFileStatus.READY
+        # One slot per CTranslate2 worker; results are written back as each file finishes.
+        semaphore = asyncio.Semaphore(get_settings().whisper_num_workers)
+        audio_paths: list[Path] = []
 
-        await self.session.flush()
+        async def _transcribe(
+            media: MediaFile,
+        ) -> tuple[MediaFile, list[dict[str, Any]], dict[str, Any]]:
+            audio_path = await AudioExtractionService(self.session).audio_for(media)
+            audio_paths.append(audio_path)
+            async with semaphore:
+                segments, info = await self._run_whisper(audio_path)
+            return media, segments, info
+
+        tasks = [asyncio.ensure_future(_transcribe(media)) for media in pending]
+        transcripts: list[Transcript] = reused
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                media, segments, info = await next_done
+                transcripts.append(self._store_transcript(media, segments, info))
+                # Commit per file: keeps finished work and never holds a write lock
+                # across the next inference.
+                await self.session.commit()
+                progress_state[str(media.id)] = {
+                    "status": TRANSCRIPT_COMPLETE,
+                    "segments": len(segments),
+                    "duration_seconds": info.get("duration"),
+                }
+                if progress is not None:
+                    await progress(progress_state)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        await AudioExtractionService(self.session).evict(audio_paths)
         return transcripts
 
-    async def _run_whisper(self, media_path: Path) -> tuple[list[dict[str, Any]], dict[str, Any]]:
-        model = get_whisper_model()
+    def _store_transcript(
+        self, media: MediaFile, segments: list[dict[str, Any]], info: dict[str, Any]
+    ) -> Transcript:
+        text = " ".join(segment["text"] for segment in segments).strip()
+        transcript = Transcript(
+            id=uuid.uuid4(),
+            media_file_id=media.id,
+            language=info.get("language"),
+            text=text,
+            json_uri=None,
+            metadata_json={
+                "status": TRANSCRIPT_COMPLETE,
+                # Kept for readers of the JSON blob until every transcript has
+                # TranscriptSegment rows; new code reads the segment table.
+                "segments": segments,
+                "segment_count": len(segments),
+                "generated_at": datetime.utcnow().isoformat(),
+                "whisper_info": info,
+            },
+            **_cache_key_fields(media),
+        )
+        self.session.add(transcript)
+        self.session.add_all(_segment_row(transcript, media, segment) for segment in segments)
+        self._mark_media_ready(media, info)
+        return transcript
 
-        def _transcribe() -> tuple[list[dict[str, Any]], dict[str, Any]]:
-            segments_iter, info = model.transcribe(
-                str(media_path),
-                beam_size=5,
-                vad_filter=True,
+    async def _store_silent_transcripts(
+        self, pending: list[MediaFile]
+    ) -> tuple[list[Transcript], list[MediaFile]]:
+        """Give media the probe found no audio stream in an empty transcript.
+
+        Returns ``(empty_transcripts, still_pending)``.
+        """
+
+        probes = await MediaProbeService(self.session).probe_many(pending)
+        silent = [media for media in pending if not probes[media.id].audio_codec]
+        if not silent:
+            return [], pending
+
+        transcripts: list[Transcript] = []
+        for media in silent:
+            if media.transcript is not None:
+                await self.session.delete(media.transcript)
+            duration_ms = probes[media.id].duration_ms
+            info = {"duration": duration_ms / 1000 if duration_ms else None, "no_audio": True}
+            transcripts.append(self._store_transcript(media, [], info))
+        await self.session.commit()
+        return transcripts, [media for media in pending if media not in silent]
+
+    async def _reuse_cached_transcripts(
+        self, pending: list[MediaFile]
+    ) -> tuple[list[Transcript], list[MediaFile]]:
+        """Clone finished transcripts of identical media; returns ``(clones, still_pending)``."""
+
+        reused: list[Transcript] = []
+        remaining: list[MediaFile] = []
+        for media in pending:
+            source = await self._find_cached_transcript(media) if media.checksum else None
+            if source is None:
+                remaining.append(media)
+                continue
+            if media.transcript is not None:
+                await self.session.delete(media.transcript)
+            reused.append(await self._clone_transcript(source, media))
+        await self.session.commit()
+        return reused, remaining
+
+    async def _find_cached_transcript(self, media: MediaFile) -> Transcript | None:
+        key = _cache_key_fields(media)
+        result = await self.session.execute(
+            select(Transcript)
+            .where(
+                Transcript.source_checksum == key["source_checksum"],
+                Transcript.model_name == key["model_name"],
+                Transcript.compute_type == key["compute_type"],
+                Transcript.decode_options == key["decode_options"],
+                Transcript.media_file_id != media.id,
+            )
+            .order_by(Transcript.created_at.desc())
+        )
+        for transcript in result.scalars():
+            if _transcript_status(transcript) == TRANSCRIPT_COMPLETE:
+                return transcript
+        return None
+
+    async def _clone_transcript(self, source: Transcript, media: MediaFile) -> Transcript:
+        metadata = dict(source.metadata_json or {})
+        metadata["generated_at"] = datetime.utcnow().isoformat()
+        metadata["cloned_from"] = str(source.id)
+        transcript = Transcript(
+            id=uuid.uuid4(),
+            media_file_id=media.id,
+            language=source.language,
+            text=source.text,
+            json_uri=source.json_uri,
+            metadata_json=metadata,
+            **_cache_key_fields(media),
+        )
+        self.session.add(transcript)
+
+        result = await self.session.execute(
+            select(TranscriptSegment)
+            .where(TranscriptSegment.transcript_id == source.id)
+            .order_by(TranscriptSegment.segment_index)
+        )
+        self.session.add_all(
+            TranscriptSegment(
+                transcript_id=transcript.id,
+                media_file_id=media.id,
+                segment_index=segment.segment_index,
+                start_ms=segment.start_ms,
+                end_ms=segment.end_ms,
+                text=segment.text,
+                metadata_json=segment.metadata_json,
             )
-            segments: list[dict[str, Any]] = []
-            for seg in segments_iter:
-                segments.append(
+            for segment in result.scalars()
+        )
+        self._mark_media_ready(media, metadata.get("whisper_info") or {})
+        return transcript
+
+    async def _transcribe_streaming(
+        self,
+        pending: list[MediaFile],
+        progress: ProgressCallback | None,
+        progress_state: dict[str, Any],
+    ) -> list[Transcript]:
+        """Persist segments in committed batches as whisper yields them.
+
+        Partially transcribed files resume after their last stored segment. All
+        database writes happen in this coroutine; whisper threads only hand
+        events over a bounded queue, which also caps buffered segments.
+        """
+
+        settings = get_settings()
+        transcripts: dict[uuid.UUID, Transcript] = {}
+        for media in pending:
+            transcript = media.transcript
+            if transcript is None:
+                transcript = Transcript(
+                    media_file_id=media.id,
+                    text="",
+                    json_uri=None,
+                    metadata_json={"status": TRANSCRIPT_IN_PROGRESS},
+                    **_cache_key_fields(media),
+                )
+                self.session.add(transcript)
+            transcripts[media.id] = transcript
+        await self.session.commit()
+
+        resume_points = await self._resume_points([t.id for t in transcripts.values()])
+
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue[tuple[str, MediaFile, Any]] = asyncio.Queue(
+            maxsize=settings.whisper_num_workers * 2
+        )
+        stop = threading.Event()
+        semaphore = asyncio.Semaphore(settings.whisper_num_workers)
+        audio_paths: list[Path] = []
+
+        def _emit(event: tuple[str, MediaFile, Any]) -> None:
+            future = asyncio.run_coroutine_threadsafe(events.put(event), loop)
+            while True:
+                try:
+                    future.result(timeout=0.5)
+                    return
+                except concurrent.futures.TimeoutError:
+                    if stop.is_set():
+                        future.cancel()
+                        raise _StreamAborted()
+
+        async def _worker(media: MediaFile) -> None:
+            last_index, last_end_ms = resume_points.get(transcripts[media.id].id, (0, 0))
+            try:
+                audio_path = await AudioExtractionService(self.session).audio_for(media)
+                audio_paths.append(audio_path)
+                async with semaphore:
+                    await asyncio.to_thread(
+                        self._stream_whisper,
+                        audio_path,
+                        last_end_ms / 1000,
+                        last_index,
+                        lambda kind, payload: _emit((kind, media, payload)),
+                    )
+            except _StreamAborted:
+                return
+            except Exception as exc:
+                await events.put(("error", media, exc))
+                return
+            await events.put(("done", media, None))
+
+        tasks = [asyncio.ensure_future(_worker(media)) for media in pending]
+        completed: list[Transcript] = []
+        remaining = len(tasks)
+        try:
+            while remaining:
+                kind, media, payload = await events.get()
+                transcript = transcripts[media.id]
+                state = progress_state.setdefault(
+                    str(media.id),
                     {
-                        "id": seg.id,
-                        "start": seg.start,
-                        "end": seg.end,
-                        "text": seg.text.strip(),
-                        "avg_logprob": seg.avg_logprob,
-                        "temperature": seg.temperature,
-                        "compression_ratio": seg.compression_ratio,
-                    }
+                        "status": TRANSCRIPT_IN_PROGRESS,
+                        "segments": resume_points.get(transcript.id, (0, 0))[0],
+                        "transcribed_seconds": resume_points.get(transcript.id, (0, 0))[1] / 1000,
+                        "duration_seconds": None,
+                    },
                 )
-            info_dict = {
-                "duration": info.duration,
-                "language": info.language,
-                "language_probability": info.language_probability,
-                "vad_probability": getattr(info, "vad_probability", None),
-            }
-            return segments, info_dict
+
+                if kind == "error":
+                    raise payload
+                if kind == "start":
+                    state["duration_seconds"] = payload.get("duration")
+                    transcript.language = payload.get("language")
+                    transcript.metadata_json = {
+                        **(transcript.metadata_json or {}),
+                        "whisper_info": payload,
+                    }
+                elif kind == "segments":
+                    self.session.add_all(
+                        _segment_row(transcript, media, segment) for segment in payload
+                    )
+                    state["segments"] += len(payload)
+                    state["transcribed_seconds"] = payload[-1]["end"]
+                else:
+                    remaining -= 1
+                    await self._finish_streamed_transcript(transcript, media)
+                    state["status"] = TRANSCRIPT_COMPLETE
+                    completed.append(transcript)
+
+                # Commit per event so a crashed run resumes from the last stored batch.
+                await self.session.commit()
+                if progress is not None and kind != "start":
+                    await progress(progress_state)
+        except BaseException:
+            stop.set()
+            for task in tasks:
+                task.cancel()
+            raise
+
+        await AudioExtractionService(self.session).evict(audio_paths)
+        return completed
+
+    async def _resume_points(
+        self, transcript_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, tuple[int, int]]:
+        """Last stored ``(segment_index, end_ms)`` for each partially written transcript."""
+
+        if not transcript_ids:
+            return {}
+        result = await self.session.execute(
+            select(
+                TranscriptSegment.transcript_id,
+                func.max(TranscriptSegment.segment_index),
+                func.max(TranscriptSegment.end_ms),
+            )
+            .where(TranscriptSegment.transcript_id.in_(transcript_ids))
+            .group_by(TranscriptSegment.transcript_id)
+        )
+        return {row[0]: (row[1], row[2]) for row in result.all()}
+
+    async def _finish_streamed_transcript(self, transcript: Transcript, media: MediaFile) -> None:
+        result = await self.session.execute(
+            select(TranscriptSegment)
+            .where(TranscriptSegment.transcript_id == transcript.id)
+            .order_by(TranscriptSegment.segment_index)
+        )
+        segments = [_segment_from_row(row) for row in result.scalars()]
+        transcript.text = " ".join(segment["text"] for segment in segments).strip()
+
+        metadata = dict(transcript.metadata_json or {})
+        metadata["status"] = TRANSCRIPT_COMPLETE
+        # Same blob whole-file mode writes, for readers that have not moved to the table.
+        metadata["segments"] = segments
+        metadata["segment_count"] = len(segments)
+        metadata["generated_at"] = datetime.utcnow().isoformat()
+        transcript.metadata_json = metadata
+        self._mark_media_ready(media, metadata.get("whisper_info") or {})
+
+    @staticmethod
+    def _mark_media_ready(media: MediaFile, info: dict[str, Any]) -> None:
+        duration = info.get("duration")
+        if duration and media.duration_ms is None:
+            media.duration_ms = int(duration * 1000)
+        media.status = MediaFileStatus.READY
+
+    def _stream_whisper(
+        self,
+        audio_path: Path,
+        offset_seconds: float,
+        last_index: int,
+        emit: Callable[[str, Any], None],
+    ) -> None:
+        """Blocking: transcribe from ``offset_seconds`` and ``emit`` start/segment-batch events."""
+
+        settings = get_settings()
+        model, options = _whisper_call()
+
+        # Resuming only reads the PCM after the last stored segment.
+        audio = load_pcm_wav(audio_path).mono_float32(offset_seconds)
+        segments_iter, info = model.transcribe(audio, **options)
+        info_dict = _info_dict(info)
+        info_dict["duration"] = (info.duration or 0.0) + offset_seconds
+        emit("start", info_dict)
+
+        batch: list[dict[str, Any]] = []
+        for segment_id, seg in enumerate(segments_iter, start=last_index + 1):
+            batch.append(_segment_dict(segment_id, seg, offset_seconds))
+            if len(batch) >= settings.transcript_segment_batch_size:
+                emit("segments", batch)
+                batch = []
+        if batch:
+            emit("segments", batch)
+
+    async def _run_whisper(self, audio_path: Path) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        model, options = _whisper_call()
+
+        def _transcribe() -> tuple[list[dict[str, Any]], dict[str, Any]]:
+            audio = load_pcm_wav(audio_path).mono_float32()
+            segments_iter, info = model.transcribe(audio, **options)
+            segments = [
+                _segment_dict(segment_id, seg)
+                for segment_id, seg in enumerate(segments_iter, start=1)
+            ]
+            return segments, _info_dict(info)
 
         return await asyncio.to_thread(_transcribe)
+
+
+def _whisper_call() -> tuple[Any, dict[str, Any]]:
+    settings = get_settings()
+    options: dict[str, Any] = {
+        "beam_size": settings.whisper_beam_size,
+        "word_timestamps": settings.whisper_word_timestamps,
+        "vad_filter": True,
+    }
+    if settings.whisper_batch_size:
+        # VAD-derived chunks decoded in batches instead of one long sequential pass.
+        options["batch_size"] = settings.whisper_batch_size
+        return get_batched_pipeline(), options
+    return get_whisper_model(), options
+
+
+def _info_dict(info: Any) -> dict[str, Any]:
+    return {
+        "duration": info.duration,
+        "language": info.language,
+        "language_probability": info.language_probability,
+        "vad_probability": getattr(info, "vad_probability", None),
+        "batch_size": get_settings().whisper_batch_size or None,
+    }
+
+
+def _cache_key_fields(media: MediaFile) -> dict[str, str | None]:
+    settings = get_settings()
+    return {
+        "source_checksum": media.checksum,
+        "model_name": settings.whisper_model_size,
+        "compute_type": settings.whisper_compute_type,
+        # Everything else that changes the segments whisper returns.
+        "decode_options": (
+            f"beam={settings.whisper_beam_size};"
+            f"words={int(settings.whisper_word_timestamps)};"
+            f"batch={settings.whisper_batch_size}"
+        ),
+    }
+
+
+def _matches_settings(transcript: Transcript, media: MediaFile) -> bool:
+    key = _cache_key_fields(media)
+    return (
+        transcript.model_name == key["model_name"]
+        and transcript.compute_type == key["compute_type"]
+        and transcript.decode_options == key["decode_options"]
+    )
+
+
+def _transcript_status(transcript: Transcript) -> str:
+    # Transcripts written before streaming existed carry no status and are complete.
+    return (transcript.metadata_json or {}).get("status", TRANSCRIPT_COMPLETE)
+
+
+def _segment_dict(segment_id: int, seg: Any, offset_seconds: float = 0.0) -> dict[str, Any]:
+    segment: dict[str, Any] = {
+        "id": segment_id,
+        "start": seg.start + offset_seconds,
+        "end": seg.end + offset_seconds,
+        "text": seg.text.strip(),
+        "avg_logprob": seg.avg_logprob,
+        "temperature": seg.temperature,
+        "compression_ratio": seg.compression_ratio,
+    }
+    if seg.words:
+        segment["words"] = [
+            {
+                "start": word.start + offset_seconds,
+                "end": word.end + offset_seconds,
+                "word": word.word,
+                "probability": word.probability,
+            }
+            for word in seg.words
+        ]
+    return segment
+
+
+def _segment_row(
+    transcript: Transcript, media: MediaFile, segment: dict[str, Any]
+) -> TranscriptSegment:
+    return TranscriptSegment(
+        transcript_id=transcript.id,
+        media_file_id=media.id,
+        segment_index=segment["id"],
+        start_ms=int(segment["start"] * 1000),
+        end_ms=int(segment["end"] * 1000),
+        text=segment["text"],
+        metadata_json={key: segment[key] for key in _SEGMENT_METADATA_KEYS if key in segment},
+    )
+
+
+def _segment_from_row(row: TranscriptSegment) -> dict[str, Any]:
+    return {
+        "id": row.segment_index,
+        "start": row.start_ms / 1000,
+        "end": row.end_ms / 1000,
+        "text": row.text,
+        **(row.metadata_json or {}),
+    }
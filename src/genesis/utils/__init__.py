@@ -1,15 +1,27 @@
 from genesis.utils.ffmpeg import (
+    MediaInfo,
+    VideoStreamFormat,
     convert_audio_to_wav,
-    extract_scene_frame,
-    mix_voiceover,
+    extract_audio_pcm,
+    extract_scene_frames,
+    probe_keyframes,
+    probe_media,
     render_concatenation,
+    render_filtergraph,
+    run_ffmpeg_async,
     trim_segment,
 )
 
 __all__ = [
+    "MediaInfo",
+    "VideoStreamFormat",
     "convert_audio_to_wav",
-    "extract_scene_frame",
-    "mix_voiceover",
+    "extract_audio_pcm",
+    "extract_scene_frames",
+    "probe_keyframes",
+    "probe_media",
     "render_concatenation",
+    "render_filtergraph",
+    "run_ffmpeg_async",
     "trim_segment",
 ]
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+# 16-bit PCM full scale, for converting samples to [-1.0, 1.0) floats.
+PCM16_SCALE = 32768.0
+
+
+@dataclass(frozen=True)
+class PcmAudio:
+    """Memory-mapped 16-bit PCM samples, shaped ``(frames, channels)``."""
+
+    samples: np.ndarray
+    sample_rate: int
+
+    @property
+    def channels(self) -> int:
+        return self.samples.shape[1]
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.samples.shape[0] / self.sample_rate
+
+    def mono_float32(self, start_seconds: float = 0.0) -> np.ndarray:
+        """Downmix from ``start_seconds`` to float32 in [-1, 1); only that span is read."""
+
+        window = self.samples[int(start_seconds * self.sample_rate) :]
+        if self.channels == 1:
+            return window[:, 0].astype(np.float32) / PCM16_SCALE
+        return window.mean(axis=1, dtype=np.float32) / PCM16_SCALE
+
+
+def load_pcm_wav(path: Path) -> PcmAudio:
+    """Memory-map a 16-bit PCM WAV without reading its samples into memory."""
+
+    with path.open("rb") as handle:
+        riff, _, wave = struct.unpack("<4sI4s", handle.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError(f"Not a WAV file: {path}")
+
+        channels = sample_rate = bits = None
+        while True:
+            header = handle.read(8)
+            if len(header) < 8:
+                raise ValueError(f"WAV file has no data chunk: {path}")
+            chunk_id, chunk_size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                fmt = handle.read(chunk_size)
+                audio_format, channels, sample_rate = struct.unpack("<HHI", fmt[:8])
+                bits = struct.unpack("<H", fmt[14:16])[0]
+                # WAVE_FORMAT_EXTENSIBLE carries the real format in its sub-format GUID.
+                if audio_format == 0xFFFE:
+                    audio_format = struct.unpack("<H", fmt[24:26])[0]
+                if audio_format != 1 or bits != 16:
+                    raise ValueError(
+                        f"Expected 16-bit PCM WAV, got format {audio_format}/{bits}-bit: {path}"
+                    )
+                handle.seek(chunk_size % 2, 1)
+            elif chunk_id == b"data":
+                if channels is None or sample_rate is None:
+                    raise ValueError(f"WAV data chunk precedes fmt chunk: {path}")
+                data_offset = handle.tell()
+                # ffmpeg writes a 0/0xFFFFFFFF size when streaming; fall back to the file size.
+                file_size = path.stat().st_size
+                data_size = min(chunk_size, file_size - data_offset)
+                break
+            else:
+                handle.seek(chunk_size + chunk_size % 2, 1)
+
+    frames = data_size // (2 * channels)
+    if frames == 0:
+        samples = np.zeros((0, channels), dtype="<i2")
+    else:
+        samples = np.memmap(
+            path, dtype="<i2", mode="r", offset=data_offset, shape=(frames, channels)
+        )
+    return PcmAudio(samples=samples, sample_rate=sample_rate)
+
+
+# Frames read from the memory map per analysis step; bounds working memory on long files.
+ANALYSIS_CHUNK_FRAMES = 1 << 20
+# Floor for dB conversions so digital silence maps to a finite level.
+SILENCE_FLOOR = 1e-10
+
+
+def _float_chunks(audio: PcmAudio, chunk_frames: int) -> Iterator[np.ndarray]:
+    """Yield ``(frames, channels)`` float32 chunks in [-1, 1) from the memory map."""
+
+    for start in range(0, audio.samples.shape[0], chunk_frames):
+        yield audio.samples[start : start + chunk_frames].astype(np.float32) / PCM16_SCALE
+
+
+def to_db(values: np.ndarray | float) -> np.ndarray:
+    return 20 * np.log10(np.maximum(values, SILENCE_FLOOR))
+
+
+def peak_level(audio: PcmAudio) -> float:
+    """Sample peak across all channels, in dBFS."""
+
+    peak = 0.0
+    for chunk in _float_chunks(audio, ANALYSIS_CHUNK_FRAMES):
+        if chunk.size:
+            peak = max(peak, float(np.abs(chunk).max()))
+    return float(to_db(peak))
+
+
+def rms_envelope(audio: PcmAudio, frame_seconds: float) -> np.ndarray:
+    """RMS level per ``frame_seconds`` frame (all channels, full scale 1.0)."""
+
+    hop = max(round(frame_seconds * audio.sample_rate), 1)
+    envelope = np.zeros(-(-audio.samples.shape[0] // hop), dtype=np.float32)
+    # Chunks hold whole frames so no frame straddles two reads.
+    chunk_frames = hop * max(ANALYSIS_CHUNK_FRAMES // hop, 1)
+    for index, chunk in enumerate(_float_chunks(audio, chunk_frames)):
+        first = index * chunk_frames // hop
+        whole = len(chunk) // hop
+        # Samples are interleaved, so each frame is one contiguous row.
+        rows = chunk[: whole * hop].reshape(whole, -1)
+        envelope[first : first + whole] = np.sqrt(
+            np.einsum("ij,ij->i", rows, rows) / rows.shape[1]
+        )
+        if len(chunk) > whole * hop:
+            envelope[first + whole] = np.sqrt(np.square(chunk[whole * hop :]).mean())
+    return envelope
+
+
+def voice_activity(envelope: np.ndarray, threshold_db: float) -> np.ndarray:
+    """Frames whose RMS level is above ``threshold_db`` dBFS."""
+
+    return to_db(envelope) > threshold_db
+
+
+def ducking_curve(
+    activity: np.ndarray,
+    *,
+    frame_seconds: float,
+    duck_gain: float,
+    attack_seconds: float,
+    release_seconds: float,
+) -> np.ndarray:
+    """Bed gain per frame: ``duck_gain`` under voice, 1.0 elsewhere, with linear ramps.
+
+    The ramp down starts ``attack_seconds`` before voice begins and the ramp up
+    takes ``release_seconds`` after it ends, computed from each frame's distance
+    to the nearest active frame on either side.
+    """
+
+    index = np.arange(len(activity), dtype=np.float64)
+    if not activity.any():
+        return np.ones(len(activity), dtype=np.float32)
+
+    previous_active = np.maximum.accumulate(np.where(activity, index, -np.inf))
+    next_active = np.minimum.accumulate(np.where(activity, index, np.inf)[::-1])[::-1]
+    attack_frames = max(attack_seconds / frame_seconds, SILENCE_FLOOR)
+    release_frames = max(release_seconds / frame_seconds, SILENCE_FLOOR)
+    ramp = np.minimum(
+        (next_active - index) / attack_frames,
+        (index - previous_active) / release_frames,
+    )
+    return (duck_gain + (1.0 - duck_gain) * np.clip(ramp, 0.0, 1.0)).astype(np.float32)
+
+
+def write_gain_commands(
+    path: Path,
+    gains: np.ndarray,
+    *,
+    frame_seconds: float,
+    offset_seconds: float = 0.0,
+    target: str = "volume@duck",
+) -> int:
+    """Write an ``asendcmd`` script setting ``target``'s volume per gain frame.
+
+    Gains are rounded to 0.001 and only changes are written, so steady spans
+    cost one command. Returns the number of commands written.
+    """
+
+    rounded = np.round(np.asarray(gains, dtype=np.float64), 3)
+    if not rounded.size:
+        path.write_text("")
+        return 0
+    changes = np.flatnonzero(np.diff(rounded)) + 1
+    indexes = np.concatenate(([0], changes))
+    times = offset_seconds + indexes * frame_seconds
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        "".join(
+            f"{time:.3f} {target} volume {gain:.3f};\n"
+            for time, gain in zip(times, rounded[indexes])
+        )
+    )
+    return len(indexes)
+
+
+def _biquad_power(
+    b: tuple[float, float, float], a: tuple[float, float, float], z_inv: np.ndarray
+) -> np.ndarray:
+    numerator = b[0] + b[1] * z_inv + b[2] * z_inv**2
+    denominator = a[0] + a[1] * z_inv + a[2] * z_inv**2
+    return np.abs(numerator / denominator) ** 2
+
+
+def _k_weighting_power(block_frames: int, sample_rate: int) -> np.ndarray:
+    """BS.1770 K-weighting power response (shelf + high-pass) at each rFFT bin."""
+
+    z_inv = np.exp(-2j * np.pi * np.fft.rfftfreq(block_frames))
+
+    # High shelf: +4 dB above ~1.5 kHz, modelling the head's acoustic effect.
+    amplitude = 10 ** (4.0 / 40)
+    w0 = 2 * np.pi * 1500.0 / sample_rate
+    alpha = np.sin(w0) / (2 * (1 / np.sqrt(2)))
+    cos_w0 = np.cos(w0)
+    root = 2 * np.sqrt(amplitude) * alpha
+    shelf = _biquad_power(
+        (
+            amplitude * ((amplitude + 1) + (amplitude - 1) * cos_w0 + root),
+            -2 * amplitude * ((amplitude - 1) + (amplitude + 1) * cos_w0),
+            amplitude * ((amplitude + 1) + (amplitude - 1) * cos_w0 - root),
+        ),
+        (
+            (amplitude + 1) - (amplitude - 1) * cos_w0 + root,
+            2 * ((amplitude - 1) - (amplitude + 1) * cos_w0),
+            (amplitude + 1) - (amplitude - 1) * cos_w0 - root,
+        ),
+        z_inv,
+    )
+
+    # High-pass at 38 Hz (the RLB weighting).
+    w0 = 2 * np.pi * 38.0 / sample_rate
+    alpha = np.sin(w0) / (2 * 0.5)
+    cos_w0 = np.cos(w0)
+    high_pass = _biquad_power(
+        ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2),
+        (1 + alpha, -2 * cos_w0, 1 - alpha),
+        z_inv,
+    )
+    return shelf * high_pass
+
+
+def integrated_loudness(audio: PcmAudio) -> float:
+    """EBU R128 / BS.1770 integrated loudness in LUFS; ``-inf`` when fully gated.
+
+    K-weighting is applied in the frequency domain per 100 ms step; each
+    400 ms gating block (75% overlap) is the mean of four consecutive steps.
+    Channels are summed with unit weights.
+    """
+
+    step = round(0.1 * audio.sample_rate)
+    steps = audio.samples.shape[0] // step
+    if steps < 4:
+        return float("-inf")
+
+    weights = _k_weighting_power(step, audio.sample_rate)
+    # One-sided spectrum: every bin but DC (and Nyquist, for even steps) counts twice.
+    weights[1 : (step + 1) // 2] *= 2
+    step_power = np.empty(steps, dtype=np.float64)
+    chunk_steps = max(ANALYSIS_CHUNK_FRAMES // step, 1)
+    audio_steps = PcmAudio(audio.samples[: steps * step], audio.sample_rate)
+    for index, chunk in enumerate(_float_chunks(audio_steps, chunk_steps * step)):
+        # (steps, channels, samples), so each FFT runs over contiguous memory.
+        blocks = np.ascontiguousarray(chunk.reshape(-1, step, audio.channels).transpose(0, 2, 1))
+        spectrum = np.fft.rfft(blocks, axis=-1)
+        # Parseval: mean square of the filtered step from its spectrum, summed over channels.
+        power = spectrum.real**2 + spectrum.imag**2
+        energy = (power @ weights).sum(axis=1)
+        first = index * chunk_steps
+        step_power[first : first + len(blocks)] = energy / step**2
+
+    block_power = np.lib.stride_tricks.sliding_window_view(step_power, 4).mean(axis=1)
+    block_loudness = -0.691 + 10 * np.log10(np.maximum(block_power, SILENCE_FLOOR))
+    gated = block_power[block_loudness > -70.0]
+    if not gated.size:
+        return float("-inf")
+    relative_gate = -0.691 + 10 * np.log10(gated.mean()) - 10.0
+    gated = gated[-0.691 + 10 * np.log10(gated) > relative_gate]
+    return float(-0.691 + 10 * np.log10(gated.mean()))
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+from genesis.config import get_settings
+
+
+def media_fingerprint(media_path: Path, checksum: str | None = None) -> str:
+    """Stable identity for a media file: its upload checksum, else path/size/mtime."""
+
+    if checksum:
+        return checksum
+    stat = media_path.stat()
+    identity = f"{media_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def cache_key(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class FileCache:
+    """Content-addressed file store under ``<artifact_root>/cache/<namespace>``.
+
+    Entries are plain files named by key. Hits refresh the file's mtime, so
+    eviction removes the least recently used entries until the store fits in
+    ``max_bytes``.
+    """
+
+    def __init__(self, namespace: str, max_bytes: int | None = None) -> None:
+        settings = get_settings()
+        self.root = Path(settings.artifact_root) / "cache" / namespace
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def path_for(self, key: str, suffix: str) -> Path:
+        return self.root / f"{key}{suffix}"
+
+    def lookup(self, key: str, suffix: str) -> Path | None:
+        path = self.path_for(key, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def store(self, key: str, source: Path) -> Path:
+        """Move ``source`` into the cache, replacing any concurrent writer's copy."""
+
+        path = self.path_for(key, source.suffix)
+        os.replace(source, path)
+        return path
+
+    def evict(self, protect: Iterable[Path] = ()) -> int:
+        """Drop least recently used entries until under ``max_bytes``; returns bytes freed."""
+
+        if self.max_bytes is None:
+            return 0
+
+        protected = {path.resolve() for path in protect}
+        entries: list[tuple[float, int, Path]] = []
+        total = 0
+        for path in self.root.iterdir():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= self.max_bytes:
+                break
+            if path.resolve() in protected:
+                continue
+            path.unlink(missing_ok=True)
+            freed += size
+        return freed
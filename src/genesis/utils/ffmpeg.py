@@ -1,74 +1,519 @@
 from __future__ import annotations
 
+import asyncio
+import bisect
+import json
+import os
+import shutil
 import subprocess
 import tempfile
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Awaitable, Callable, Collection, Iterable, Iterator, Sequence
 
-from genesis.config import get_settings
+from genesis.config import RenderProfile, get_settings
 
+ProgressCallback = Callable[[dict[str, Any]], Awaitable[None]]
 
-def _run_ffmpeg(args: list[str]) -> None:
+# Minimum seconds between progress callbacks from one ffmpeg process.
+PROGRESS_INTERVAL_SECONDS = 1.0
+# Only the end of stderr is kept (for error messages) so chatty encodes stay small.
+STDERR_TAIL_BYTES = 64 * 1024
+
+_process_slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def run_ffmpeg_async(
+    args: list[str],
+    *,
+    progress: ProgressCallback | None = None,
+    timeout: float | None = None,
+) -> str:
+    """Run ffmpeg as an asyncio subprocess and return the tail of its stderr.
+
+    ``-progress`` output is parsed and handed to ``progress`` (at most once per
+    ``PROGRESS_INTERVAL_SECONDS``, plus a final ``status == "end"`` update). At
+    most ``ffmpeg_max_processes`` of these run at once per event loop, and the
+    child is killed on timeout (``ffmpeg_timeout_seconds`` by default) or
+    cancellation.
+    """
+
+    settings = get_settings()
+    if timeout is None:
+        timeout = settings.ffmpeg_timeout_seconds
+    cmd = [settings.ffmpeg_binary, "-nostats", "-progress", "pipe:1", *args]
+    stderr_tail = bytearray()
+
+    async with _process_slot():
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        try:
+            async with asyncio.timeout(timeout):
+                await asyncio.gather(
+                    _read_progress(process.stdout, progress),
+                    _read_tail(process.stderr, stderr_tail),
+                )
+                returncode = await process.wait()
+        except TimeoutError:
+            raise TimeoutError(f"ffmpeg timed out after {timeout}s: {' '.join(cmd)}") from None
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+    stderr = stderr_tail.decode(errors="replace")
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg command failed: {' '.join(cmd)}\nstderr:\n{stderr}")
+    return stderr
+
+
+def _process_slot() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slot = _process_slots.get(loop)
+    if slot is None:
+        limit = get_settings().ffmpeg_max_processes or os.cpu_count() or 1
+        slot = _process_slots[loop] = asyncio.Semaphore(limit)
+    return slot
+
+
+async def _read_progress(stream: asyncio.StreamReader, progress: ProgressCallback | None) -> None:
+    loop = asyncio.get_running_loop()
+    block: dict[str, str] = {}
+    last_report = float("-inf")
+    async for raw_line in stream:
+        key, _, value = raw_line.decode(errors="replace").strip().partition("=")
+        if key != "progress":
+            block[key] = value
+            continue
+        now = loop.time()
+        if progress is not None and (
+            value == "end" or now - last_report >= PROGRESS_INTERVAL_SECONDS
+        ):
+            last_report = now
+            await progress(_progress_fields(block, value))
+        block = {}
+
+
+def _progress_fields(block: dict[str, str], status: str) -> dict[str, Any]:
+    fields: dict[str, Any] = {"status": status}
+    # ``out_time_ms`` is also in microseconds; older builds only emit that key.
+    out_time = block.get("out_time_us") or block.get("out_time_ms")
+    try:
+        fields["out_time_seconds"] = round(int(out_time) / 1_000_000, 3)
+    except (TypeError, ValueError):
+        pass
+    try:
+        fields["frame"] = int(block["frame"])
+    except (KeyError, ValueError):
+        pass
+    try:
+        fields["speed"] = float(block.get("speed", "").rstrip("x"))
+    except ValueError:
+        pass
+    return fields
+
+
+async def _read_tail(stream: asyncio.StreamReader, tail: bytearray) -> None:
+    while chunk := await stream.read(65536):
+        tail.extend(chunk)
+        if len(tail) > STDERR_TAIL_BYTES:
+            del tail[: len(tail) - STDERR_TAIL_BYTES]
+
+
+def _run_ffprobe(args: list[str]) -> str:
     settings = get_settings()
-    cmd = [settings.ffmpeg_binary, *args]
+    cmd = [settings.ffprobe_binary, "-v", "error", *args]
     completed = subprocess.run(cmd, capture_output=True, text=True)
     if completed.returncode != 0:
         raise RuntimeError(
-            f"ffmpeg command failed: {' '.join(cmd)}\nstdout:\n{completed.stdout}\nstderr:\n{completed.stderr}"
+            f"ffprobe command failed: {' '.join(cmd)}\nstderr:\n{completed.stderr}"
         )
+    return completed.stdout
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    duration_ms: int | None
+    fps: float | None
+    width: int | None
+    height: int | None
+    video_codec: str | None
+    video_profile: str | None
+    video_level: int | None
+    pix_fmt: str | None
+    video_time_base: str | None
+    audio_codec: str | None
+    audio_channels: int | None
+    audio_channel_layout: str | None
+    audio_sample_rate: int | None
+    format_name: str | None
+
+
+def probe_media(media_path: Path) -> MediaInfo:
+    """Probe container, first video and first audio stream.
+
+    The keyframe index needs a scan of every packet, so it is left to
+    ``probe_keyframes`` for callers that trim on keyframes.
+    """
+
+    output = _run_ffprobe(
+        [
+            "-show_entries",
+            (
+                "format=duration,format_name:stream=codec_type,codec_name,width,height,"
+                "avg_frame_rate,r_frame_rate,profile,level,pix_fmt,time_base,channels,"
+                "channel_layout,sample_rate"
+            ),
+            "-of",
+            "json",
+            str(media_path),
+        ]
+    )
+    data = json.loads(output or "{}")
+    streams = data.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), {})
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), {})
+    duration = _as_float(data.get("format", {}).get("duration"))
+
+    return MediaInfo(
+        duration_ms=int(duration * 1000) if duration is not None else None,
+        fps=_frame_rate(video.get("avg_frame_rate")) or _frame_rate(video.get("r_frame_rate")),
+        width=video.get("width"),
+        height=video.get("height"),
+        video_codec=video.get("codec_name"),
+        video_profile=video.get("profile"),
+        video_level=video.get("level"),
+        pix_fmt=video.get("pix_fmt"),
+        video_time_base=video.get("time_base"),
+        audio_codec=audio.get("codec_name"),
+        audio_channels=audio.get("channels"),
+        audio_channel_layout=audio.get("channel_layout"),
+        audio_sample_rate=int(audio["sample_rate"]) if audio.get("sample_rate") else None,
+        format_name=data.get("format", {}).get("format_name"),
+    )
+
+
+def _as_float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _frame_rate(value: str | None) -> float | None:
+    numerator, _, denominator = (value or "").partition("/")
+    try:
+        rate = float(numerator) / float(denominator or 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return round(rate, 3) or None
+
+
+def probe_keyframes(video_path: Path) -> list[float]:
+    """Return sorted keyframe timestamps (seconds) of the first video stream.
+
+    Reads packet flags only, so the stream is demuxed but never decoded.
+    """
+
+    output = _run_ffprobe(
+        [
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "packet=pts_time,flags",
+            "-of",
+            "csv=print_section=0",
+            str(video_path),
+        ]
+    )
+    keyframes: list[float] = []
+    for line in output.splitlines():
+        pts_time, _, flags = line.partition(",")
+        if "K" not in flags:
+            continue
+        try:
+            keyframes.append(float(pts_time))
+        except ValueError:
+            continue
+    return sorted(keyframes)
+
+
+KEYFRAME_TOLERANCE_SECONDS = 0.02
+
+# ffprobe H.264 profile names libx264 can encode to, mapped to its ``-profile:v`` names.
+H264_PROFILES = {
+    "Constrained Baseline": "baseline",
+    "Baseline": "baseline",
+    "Main": "main",
+    "High": "high",
+}
+
 
+# Encoded and copied spans keep their own SPS/PPS (x264's options never match
+# the source's exactly), so every keyframe carries its parameter sets in-band
+# and the ``avc3`` sample entry tells decoders to use those over the ``avcC``.
+IN_BAND_PARAMETER_SET_ARGS = ["-tag:v", "avc3"]
+
+
+@dataclass(frozen=True)
+class VideoStreamFormat:
+    """Bitstream parameters a re-encoded span must share with copied source packets."""
+
+    codec: str
+    profile: str
+    level: int
+    pix_fmt: str
+    width: int
+    height: int
+    time_base: str
+
+
+def _format_encode_args(stream_format: VideoStreamFormat) -> list[str]:
+    """Pin an H.264 encode to the source's profile, level, pixel format and timescale."""
+
+    _, _, timescale = stream_format.time_base.partition("/")
+    return [
+        "-pix_fmt",
+        stream_format.pix_fmt,
+        "-profile:v",
+        H264_PROFILES[stream_format.profile],
+        "-level:v",
+        f"{stream_format.level // 10}.{stream_format.level % 10}",
+        "-x264-params",
+        "repeat-headers=1",
+        *IN_BAND_PARAMETER_SET_ARGS,
+        "-video_track_timescale",
+        timescale,
+    ]
+
+
+def _video_encode_args(profile: RenderProfile) -> list[str]:
+    return ["-c:v", profile.video_codec, "-preset", profile.preset, "-crf", str(profile.crf)]
+
+
+def _audio_encode_args(profile: RenderProfile) -> list[str]:
+    return ["-c:a", profile.audio_codec, "-b:a", profile.audio_bitrate]
+
+
+def _scale_filter(profile: RenderProfile) -> str | None:
+    """Downscale to the profile's max height (never upscale), keeping an even width."""
+
+    if profile.max_height is None:
+        return None
+    return _height_cap_filter(profile.max_height)
+
+
+def _height_cap_filter(max_height: int) -> str:
+    return f"scale=-2:'min(ih,{max_height})'"
+
+
+async def extract_scene_frames(
+    video_path: Path,
+    timestamps: Sequence[float],
+    output_paths: Sequence[Path],
+) -> None:
+    """Extract one frame per timestamp with a single ffmpeg process and decode pass.
+
+    Each output receives the first decoded frame at or after its timestamp.
+    """
+
+    if len(timestamps) != len(output_paths):
+        raise ValueError("timestamps and output_paths must have the same length")
+    if not timestamps:
+        return
+
+    requests = sorted(zip(timestamps, output_paths), key=lambda item: item[0])
+    wanted = sorted({round(timestamp, 3) for timestamp, _ in requests})
+    select_expr = "+".join(
+        f"gte(t,{value:.3f})*(isnan(prev_pts)+lt(prev_pts*TB,{value:.3f}))" for value in wanted
+    )
+
+    with tempfile.TemporaryDirectory(prefix="frames_") as frame_dir:
+        # ``-frame_pts`` with a millisecond time base names each file after its timestamp.
+        await run_ffmpeg_async(
+            [
+                "-y",
+                "-i",
+                str(video_path),
+                "-an",
+                "-vf",
+                f"select='{select_expr}'",
+                "-fps_mode",
+                "passthrough",
+                "-enc_time_base",
+                "1:1000",
+                "-frame_pts",
+                "1",
+                "-q:v",
+                "2",
+                str(Path(frame_dir) / "%d.jpg"),
+            ]
+        )
+        frames = sorted(Path(frame_dir).glob("*.jpg"), key=lambda path: int(path.stem))
+        if not frames:
+            raise RuntimeError(f"ffmpeg extracted no frames from {video_path}")
+        frame_times = [int(path.stem) / 1000 for path in frames]
+
+        # Timestamps that fall within one frame interval share that frame.
+        position = 0
+        for timestamp, output_path in requests:
+            while position < len(frames) - 1 and frame_times[position] < round(timestamp, 3) - 1e-3:
+                position += 1
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(frames[position], output_path)
+
+
+async def trim_segment(
+    video_path: Path,
+    start_seconds: float,
+    end_seconds: float,
+    output_path: Path,
+    *,
+    keyframes: Sequence[float] | None = None,
+    stream_format: VideoStreamFormat | None = None,
+    profile: RenderProfile | None = None,
+) -> None:
+    """Cut ``[start_seconds, end_seconds)`` out of ``video_path``.
+
+    Without ``keyframes`` the span is fully re-encoded with ``profile`` (the
+    default render profile if unset). With the source's keyframe index and its
+    ``stream_format`` (only passed when the source stream already matches the
+    profile's codec and size) the whole GOPs between the first and last
+    keyframe inside the span are stream-copied, and only the partial GOPs at
+    either end are re-encoded. Re-encoded spans use the source's profile,
+    level, pixel format and timescale, and both kinds of span repeat their
+    SPS/PPS in-band at every keyframe (tagged ``avc3``), so the joined stream
+    decodes with the right parameter sets.
+    """
 
-def extract_scene_frame(video_path: Path, timestamp_seconds: float, output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    profile = profile or get_settings().get_render_profile()
+    if keyframes and stream_format is None:
+        raise ValueError("Smart trimming needs the source's stream format")
+
+    first = bisect.bisect_left(keyframes or (), start_seconds - KEYFRAME_TOLERANCE_SECONDS)
+    last = bisect.bisect_right(keyframes or (), end_seconds + KEYFRAME_TOLERANCE_SECONDS) - 1
+    # Copying needs at least one whole GOP inside the span.
+    if not keyframes or last <= first:
+        await _encode_span(
+            video_path, start_seconds, end_seconds, output_path, profile, stream_format
+        )
+        return
+
+    copy_start, copy_end = keyframes[first], keyframes[last]
+    spans = [(copy_start, copy_end, True)]
+    if copy_start - start_seconds > KEYFRAME_TOLERANCE_SECONDS:
+        spans.insert(0, (start_seconds, copy_start, False))
+    if end_seconds - copy_end > KEYFRAME_TOLERANCE_SECONDS:
+        spans.append((copy_end, end_seconds, False))
+
+    if len(spans) == 1:
+        await _copy_span(video_path, copy_start, copy_end, output_path, profile, stream_format)
+        return
+
+    parts = [
+        output_path.with_name(f"{output_path.stem}.part{index}{output_path.suffix}")
+        for index in range(len(spans))
+    ]
+    try:
+        for (span_start, span_end, copy), part in zip(spans, parts):
+            if copy:
+                await _copy_span(video_path, span_start, span_end, part, profile, stream_format)
+            else:
+                await _encode_span(video_path, span_start, span_end, part, profile, stream_format)
+        await render_concatenation(parts, output_path)
+    finally:
+        for part in parts:
+            part.unlink(missing_ok=True)
+
+
+async def _encode_span(
+    video_path: Path,
+    start_seconds: float,
+    end_seconds: float,
+    output_path: Path,
+    profile: RenderProfile,
+    stream_format: VideoStreamFormat | None = None,
+) -> None:
+    duration = max(end_seconds - start_seconds, 0.1)
     args = [
         "-y",
         "-ss",
-        f"{timestamp_seconds:.3f}",
+        f"{start_seconds:.3f}",
         "-i",
         str(video_path),
-        "-frames:v",
-        "1",
-        "-q:v",
-        "2",
-        str(output_path),
+        "-t",
+        f"{duration:.3f}",
     ]
-    _run_ffmpeg(args)
+    if stream_format is not None:
+        # Matching the copied packets already keeps the source size.
+        args.extend(_format_encode_args(stream_format))
+    else:
+        scale = _scale_filter(profile)
+        if scale is not None:
+            args.extend(["-vf", scale])
+    args.extend([*_video_encode_args(profile), *_audio_encode_args(profile), str(output_path)])
+    await run_ffmpeg_async(args)
 
 
-def trim_segment(video_path: Path, start_seconds: float, end_seconds: float, output_path: Path) -> None:
+async def _copy_span(
+    video_path: Path,
+    start_seconds: float,
+    end_seconds: float,
+    output_path: Path,
+    profile: RenderProfile,
+    stream_format: VideoStreamFormat,
+) -> None:
+    # Spans run keyframe to keyframe. Stream copy stops on dts, so it would also
+    # take the closing keyframe (and frames reordered around it); drop every
+    # packet from there on. Audio is still re-encoded (cheap) so copied and
+    # encoded spans concat cleanly.
     duration = max(end_seconds - start_seconds, 0.1)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    drop_from = duration - KEYFRAME_TOLERANCE_SECONDS
+    _, _, timescale = stream_format.time_base.partition("/")
     args = [
         "-y",
         "-ss",
-        f"{start_seconds:.3f}",
+        f"{start_seconds:.6f}",
         "-i",
         str(video_path),
         "-t",
         f"{duration:.3f}",
         "-c:v",
-        "libx264",
-        "-preset",
-        "medium",
-        "-crf",
-        "20",
-        "-c:a",
-        "aac",
-        "-b:a",
-        "192k",
+        "copy",
+        "-bsf:v",
+        f"h264_mp4toannexb,noise=drop=gte(pts*tb\\,{drop_from:.6f})",
+        *IN_BAND_PARAMETER_SET_ARGS,
+        "-video_track_timescale",
+        timescale,
+        *_audio_encode_args(profile),
         str(output_path),
     ]
-    _run_ffmpeg(args)
+    await run_ffmpeg_async(args)
 
 
-def render_concatenation(segments: Iterable[Path], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+@contextmanager
+def _concat_list(segments: Iterable[Path]) -> Iterator[Path]:
     with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as concat_file:
         for segment in segments:
             concat_file.write(f"file '{segment.resolve().as_posix()}'\n")
         concat_file_path = Path(concat_file.name)
+    try:
+        yield concat_file_path
+    finally:
+        concat_file_path.unlink(missing_ok=True)
 
-    args = [
+
+def _concat_args(concat_file_path: Path, output_path: Path) -> list[str]:
+    return [
         "-y",
         "-f",
         "concat",
@@ -80,13 +525,189 @@ def render_concatenation(segments: Iterable[Path], output_path: Path) -> None:
         "copy",
         str(output_path),
     ]
+
+
+async def render_concatenation(
+    segments: Iterable[Path],
+    output_path: Path,
+    *,
+    voiceover_wav: Path | None = None,
+    offset_seconds: float = 0.0,
+    voiceover_gain: float = 1.0,
+    bed_gain: float = 0.3,
+    ducking_script: Path | None = None,
+    profile: RenderProfile | None = None,
+    progress: ProgressCallback | None = None,
+) -> None:
+    """Join segments with stream copy, mixing in narration during the same pass.
+
+    With ``voiceover_wav`` only the audio is filtered and encoded (with
+    ``profile``'s audio settings); video packets are still copied, so the mix
+    never costs a second read and write of the full render.
+    """
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with _concat_list(segments) as concat_file_path:
+        if not voiceover_wav:
+            await run_ffmpeg_async(_concat_args(concat_file_path, output_path), progress=progress)
+            return
+
+        profile = profile or get_settings().get_render_profile()
+        filter_complex = ";".join(
+            _voiceover_mix_filters(
+                "0:a", 1, offset_seconds, voiceover_gain, bed_gain, ducking_script
+            )
+        )
+        args = [
+            "-y",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-i",
+            str(concat_file_path),
+            "-i",
+            str(voiceover_wav),
+            "-filter_complex",
+            filter_complex,
+            "-map",
+            "0:v",
+            "-map",
+            "[aout]",
+            "-c:v",
+            "copy",
+            *_audio_encode_args(profile),
+            str(output_path),
+        ]
+        await run_ffmpeg_async(args, progress=progress)
+
+
+def _voiceover_mix_filters(
+    bed_label: str,
+    voiceover_input: int,
+    offset_seconds: float,
+    voiceover_gain: float,
+    bed_gain: float,
+    ducking_script: Path | None = None,
+) -> list[str]:
+    """Filters ducking ``bed_label`` under the delayed voiceover input, ending in ``[aout]``.
+
+    With a ``ducking_script`` (see ``genesis.utils.audio.write_gain_commands``)
+    the bed follows that gain curve instead of the static ``bed_gain``.
+    """
+
+    offset_ms = max(int(offset_seconds * 1000), 0)
+    bed_volume = f"volume={bed_gain}"
+    if ducking_script is not None:
+        bed_volume = f"asendcmd=f='{ducking_script.as_posix()}',volume@duck=volume=1.0"
+    return [
+        f"[{bed_label}]{bed_volume}[bg]",
+        f"[{voiceover_input}:a]adelay={offset_ms}|{offset_ms},volume={voiceover_gain}[vo]",
+        "[bg][vo]amix=inputs=2:duration=first:dropout_transition=2[aout]",
+    ]
+
+
+async def render_filtergraph(
+    sources: Sequence[Path],
+    spans: Sequence[tuple[int, float, float]],
+    output_path: Path,
+    *,
+    voiceover_wav: Path | None = None,
+    offset_seconds: float = 0.0,
+    voiceover_gain: float = 1.0,
+    bed_gain: float = 0.3,
+    ducking_script: Path | None = None,
+    frame_size: tuple[int, int] | None = None,
+    silent_sources: Collection[int] = (),
+    profile: RenderProfile | None = None,
+    progress: ProgressCallback | None = None,
+) -> None:
+    """Trim, concatenate and (optionally) mix narration in one encode.
+
+    ``spans`` are ``(source_index, start_seconds, end_seconds)`` tuples in output
+    order. Sources must share a resolution unless ``frame_size`` is given, in
+    which case every span is scaled and padded to it. Spans from
+    ``silent_sources`` (no audio stream) get generated silence.
+    """
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    profile = profile or get_settings().get_render_profile()
+
+    fit = ""
+    if frame_size is not None:
+        width, height = frame_size
+        fit = (
+            f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,"
+        )
+
+    filters: list[str] = []
+    concat_pads: list[str] = []
+    for index, (source, start_seconds, end_seconds) in enumerate(spans):
+        end_seconds = max(end_seconds, start_seconds + 0.1)
+        filters.append(
+            f"[{source}:v]trim=start={start_seconds:.3f}:end={end_seconds:.3f},"
+            f"setpts=PTS-STARTPTS,{fit}setsar=1[v{index}]"
+        )
+        if source in silent_sources:
+            filters.append(
+                f"anullsrc=r=48000:cl=stereo,atrim=duration={end_seconds - start_seconds:.3f}"
+                f"[a{index}]"
+            )
+        else:
+            filters.append(
+                f"[{source}:a]atrim=start={start_seconds:.3f}:end={end_seconds:.3f},"
+                f"asetpts=PTS-STARTPTS[a{index}]"
+            )
+        concat_pads.append(f"[v{index}][a{index}]")
+
+    video_label = "vcat"
+    audio_label = "acat"
+    filters.append(f"{''.join(concat_pads)}concat=n={len(spans)}:v=1:a=1[vcat][acat]")
+    scale = _scale_filter(profile)
+    if scale is not None:
+        filters.append(f"[vcat]{scale}[vout]")
+        video_label = "vout"
+    if voiceover_wav:
+        filters.extend(
+            _voiceover_mix_filters(
+                "acat", len(sources), offset_seconds, voiceover_gain, bed_gain, ducking_script
+            )
+        )
+        audio_label = "aout"
+
+    # The graph grows with scene count, so pass it as a script rather than argv.
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as script_file:
+        script_file.write(";\n".join(filters))
+        script_path = Path(script_file.name)
+
+    args = ["-y"]
+    for source in sources:
+        args.extend(["-i", str(source)])
+    if voiceover_wav:
+        args.extend(["-i", str(voiceover_wav)])
+    args.extend(
+        [
+            "-filter_complex_script",
+            str(script_path),
+            "-map",
+            f"[{video_label}]",
+            "-map",
+            f"[{audio_label}]",
+            *_video_encode_args(profile),
+            *_audio_encode_args(profile),
+            str(output_path),
+        ]
+    )
     try:
-        _run_ffmpeg(args)
+        await run_ffmpeg_async(args, progress=progress)
     finally:
-        concat_file_path.unlink(missing_ok=True)
+        script_path.unlink(missing_ok=True)
 
 
-def convert_audio_to_wav(input_path: Path, output_path: Path, sample_rate: int = 48000) -> None:
+async def convert_audio_to_wav(
+    input_path: Path, output_path: Path, sample_rate: int = 48000
+) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
     args = [
         "-y",
@@ -98,45 +719,75 @@ def convert_audio_to_wav(input_path: Path, output_path: Path, sample_rate: int =
         "2",
         str(output_path),
     ]
-    _run_ffmpeg(args)
+    await run_ffmpeg_async(args)
+
+
+async def extract_audio_pcm(input_path: Path, output_path: Path, sample_rate: int = 16000) -> None:
+    """Decode the first audio stream to mono 16-bit PCM WAV (Whisper's input format)."""
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    args = [
+        "-y",
+        "-i",
+        str(input_path),
+        "-map",
+        "0:a:0",
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-c:a",
+        "pcm_s16le",
+        str(output_path),
+    ]
+    await run_ffmpeg_async(args)
 
 
-def mix_voiceover(
-    base_video: Path,
-    voiceover_wav: Path,
+async def create_proxy(
+    input_path: Path,
     output_path: Path,
     *,
-    offset_seconds: float = 0.0,
-    voiceover_gain: float = 1.0,
-    bed_gain: float = 0.3,
+    max_height: int,
+    crf: int,
+    progress: ProgressCallback | None = None,
 ) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    offset_ms = max(int(offset_seconds * 1000), 0)
+    """Encode a low-resolution, all-intra H.264 copy of ``input_path``.
 
-    filter_complex = (
-        f"[0:a]volume={bed_gain}[bg];"
-        f"[1:a]adelay={offset_ms}|{offset_ms},volume={voiceover_gain}[vo];"
-        "[bg][vo]amix=inputs=2:duration=first:dropout_transition=2[aout]"
-    )
+    Every frame is a keyframe, so seeking to any timestamp decodes exactly one
+    frame; frame rate and timestamps are kept so scene times carry over to the
+    original.
+    """
 
+    output_path.parent.mkdir(parents=True, exist_ok=True)
     args = [
         "-y",
         "-i",
-        str(base_video),
-        "-i",
-        str(voiceover_wav),
-        "-filter_complex",
-        filter_complex,
+        str(input_path),
         "-map",
-        "0:v",
+        "0:v:0",
         "-map",
-        "[aout]",
+        "0:a:0?",
+        "-vf",
+        _height_cap_filter(max_height),
         "-c:v",
-        "copy",
+        "libx264",
+        "-preset",
+        "ultrafast",
+        "-tune",
+        "fastdecode",
+        "-g",
+        "1",
+        "-crf",
+        str(crf),
+        "-pix_fmt",
+        "yuv420p",
         "-c:a",
         "aac",
         "-b:a",
-        "192k",
+        "96k",
+        "-movflags",
+        "+faststart",
         str(output_path),
     ]
-    _run_ffmpeg(args)
+    await run_ffmpeg_async(args, progress=progress)
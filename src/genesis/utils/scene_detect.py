@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import cv2
+import numpy
+from scenedetect import ContentDetector, FrameTimecode, SceneManager, VideoManager
+from scenedetect.scene_detector import SceneDetector
+from scenedetect.scene_manager import compute_downscale_factor
+
+from genesis.config import Settings, get_settings
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+@dataclass
+class DetectedScene:
+    start_seconds: float
+    end_seconds: float
+    metadata: dict[str, Any] = field(default_factory=dict)
+    preview_path: Path | None = None
+
+
+class _PreviewCaptureDetector(SceneDetector):
+    """Wrap a detector and keep a bounded frame sample per scene while it runs.
+
+    Frames arrive at full resolution; the wrapped detector sees them downscaled
+    the same way ``SceneManager`` would. Each scene keeps at most ``max_frames``
+    frames, halving the sample (and doubling the stride) when full, so the frame
+    nearest any scene's midpoint is available without a second decode.
+    """
+
+    def __init__(
+        self,
+        inner: SceneDetector,
+        *,
+        max_frames: int,
+        preview_width: int,
+        downscale: int | None = None,
+    ) -> None:
+        self.inner = inner
+        self.max_frames = max_frames
+        self.preview_width = preview_width
+        self.previews: dict[int, numpy.ndarray] = {}
+        self._downscale = downscale
+        self._scene_start: int | None = None
+        self._stride = 1
+        self._buffer: list[tuple[int, numpy.ndarray]] = []
+
+    def get_metrics(self) -> list[str]:
+        return self.inner.get_metrics()
+
+    @property
+    def event_buffer_length(self) -> int:
+        return self.inner.event_buffer_length
+
+    def process_frame(self, frame_num: int, frame_img: numpy.ndarray | None) -> list[int]:
+        if frame_img is None:
+            return []
+        if self._downscale is None:
+            self._downscale = compute_downscale_factor(frame_width=frame_img.shape[1])
+
+        detect_img = frame_img
+        if self._downscale > 1:
+            detect_img = cv2.resize(
+                frame_img,
+                (
+                    round(frame_img.shape[1] / self._downscale),
+                    round(frame_img.shape[0] / self._downscale),
+                ),
+            )
+        cuts = self.inner.process_frame(frame_num, detect_img)
+
+        if self._scene_start is None:
+            self._scene_start = frame_num
+        for cut in cuts:
+            self._finish_scene(cut)
+            self._scene_start = cut
+        self._sample(frame_num, frame_img)
+        return cuts
+
+    def post_process(self, frame_num: int) -> list[int]:
+        cuts = self.inner.post_process(frame_num)
+        for cut in cuts:
+            self._finish_scene(cut)
+            self._scene_start = cut
+        self._finish_scene(frame_num)
+        return cuts
+
+    def _sample(self, frame_num: int, frame_img: numpy.ndarray) -> None:
+        if self._scene_start is None or (frame_num - self._scene_start) % self._stride:
+            return
+        height, width = frame_img.shape[:2]
+        if width > self.preview_width:
+            frame_img = cv2.resize(
+                frame_img,
+                (self.preview_width, round(height * self.preview_width / width)),
+                interpolation=cv2.INTER_AREA,
+            )
+        self._buffer.append((frame_num, frame_img))
+        if len(self._buffer) > self.max_frames:
+            self._buffer = self._buffer[::2]
+            self._stride *= 2
+
+    def _finish_scene(self, end_frame: int) -> None:
+        if self._scene_start is None:
+            return
+        # Frames at or past the cut belong to the next scene.
+        in_scene = [(num, img) for num, img in self._buffer if num < end_frame]
+        if in_scene:
+            midpoint = (self._scene_start + end_frame) / 2
+            _, image = min(in_scene, key=lambda item: abs(item[0] - midpoint))
+            self.previews[self._scene_start] = image
+        self._buffer = [(num, img) for num, img in self._buffer if num >= end_frame]
+        self._stride = 1
+
+
+def _configure_downscale(scene_manager: SceneManager, downscale: int | None) -> None:
+    """Use a fixed downscale factor, or scenedetect's width-based default when ``None``."""
+
+    if downscale:
+        scene_manager.auto_downscale = False
+        scene_manager.downscale = downscale
+
+
+def _refine_cut(
+    video_manager: VideoManager,
+    cut: FrameTimecode,
+    *,
+    lower: FrameTimecode,
+    upper: FrameTimecode,
+    window_seconds: float,
+    threshold: float,
+    downscale: int | None,
+) -> FrameTimecode:
+    """Re-detect at full frame rate around a coarse cut, returning the closest exact cut.
+
+    Only cuts strictly inside ``(lower, upper)`` count. ``video_manager`` only
+    seeks forwards, so cuts must be refined in order.
+    """
+
+    fps = cut.get_framerate()
+    window_start = FrameTimecode(max(cut.get_seconds() - window_seconds, lower.get_seconds()), fps)
+    window_end = FrameTimecode(min(cut.get_seconds() + window_seconds, upper.get_seconds()), fps)
+    if window_start > video_manager.get_current_timecode():
+        video_manager.seek(window_start)
+    if video_manager.get_current_timecode() >= window_end:
+        return cut
+
+    scene_manager = SceneManager()
+    _configure_downscale(scene_manager, downscale)
+    # Any cut inside the window counts, so don't enforce a minimum scene length here.
+    scene_manager.add_detector(ContentDetector(threshold=threshold, min_scene_len=1))
+    scene_manager.detect_scenes(frame_source=video_manager, end_time=window_end)
+
+    candidates = [
+        start for start, _ in scene_manager.get_scene_list()[1:] if lower < start < upper
+    ]
+    if not candidates:
+        return cut
+    return min(candidates, key=lambda candidate: abs(candidate.get_frames() - cut.get_frames()))
+
+
+def _refine_scene_list(
+    media_path: Path,
+    scene_list: list[tuple[FrameTimecode, FrameTimecode]],
+    *,
+    window_seconds: float,
+    threshold: float,
+    downscale: int | None,
+) -> list[tuple[FrameTimecode, FrameTimecode]]:
+    """Snap frame-skipped cuts to exact frames, keeping the coarse cut if none is found.
+
+    One forward pass over the media: each cut stays after the previous refined
+    cut and before the next coarse one, so scenes never overlap or reorder.
+    """
+
+    coarse_cuts = [start for start, _ in scene_list[1:]]
+    end = scene_list[-1][1]
+    bounds = [scene_list[0][0]]
+    video_manager = VideoManager([str(media_path)])
+    try:
+        video_manager.start()
+        for position, coarse_cut in enumerate(coarse_cuts):
+            next_coarse = coarse_cuts[position + 1] if position + 1 < len(coarse_cuts) else end
+            bounds.append(
+                _refine_cut(
+                    video_manager,
+                    coarse_cut,
+                    lower=bounds[-1],
+                    upper=next_coarse,
+                    window_seconds=window_seconds,
+                    threshold=threshold,
+                    downscale=downscale,
+                )
+            )
+    finally:
+        video_manager.release()
+    bounds.append(end)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+@dataclass(frozen=True)
+class DetectionOptions:
+    threshold: float
+    min_scene_len: int
+    downscale: int | None
+    frame_skip: int
+    refine_window_seconds: float
+    preview_buffer_frames: int
+    preview_max_width: int
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "DetectionOptions":
+        return cls(
+            threshold=settings.scene_detect_threshold,
+            min_scene_len=settings.scene_detect_min_scene_len,
+            downscale=settings.scene_detect_downscale or None,
+            frame_skip=settings.scene_detect_frame_skip,
+            refine_window_seconds=settings.scene_detect_refine_window_seconds,
+            preview_buffer_frames=settings.scene_preview_buffer_frames,
+            preview_max_width=settings.scene_preview_max_width,
+        )
+
+
+def detect_media_scenes(
+    media_path: Path,
+    options: DetectionOptions,
+    capture_dir: Path | None = None,
+    detector: SceneDetector | None = None,
+) -> list[DetectedScene]:
+    """Detect scenes in one media file; with ``capture_dir``, also write previews.
+
+    Runs in ``detection_pool`` workers, which is why this module must not
+    import services or the ML stack.
+    """
+
+    detector = detector or ContentDetector(
+        threshold=options.threshold,
+        min_scene_len=options.min_scene_len,
+    )
+    video_manager = VideoManager([str(media_path)])
+    scene_manager = SceneManager()
+
+    capture: _PreviewCaptureDetector | None = None
+    if capture_dir is not None:
+        capture = _PreviewCaptureDetector(
+            detector,
+            max_frames=options.preview_buffer_frames,
+            preview_width=options.preview_max_width,
+            downscale=options.downscale,
+        )
+        # The capture detector downscales for the inner detector itself.
+        scene_manager.auto_downscale = False
+        scene_manager.add_detector(capture)
+    else:
+        _configure_downscale(scene_manager, options.downscale)
+        scene_manager.add_detector(detector)
+
+    try:
+        video_manager.start()
+        scene_manager.detect_scenes(frame_source=video_manager, frame_skip=options.frame_skip)
+        scene_list = scene_manager.get_scene_list()
+    finally:
+        video_manager.release()
+
+    refined_list = scene_list
+    if options.frame_skip and options.refine_window_seconds > 0 and len(scene_list) > 1:
+        refined_list = _refine_scene_list(
+            media_path,
+            scene_list,
+            window_seconds=options.refine_window_seconds,
+            threshold=options.threshold,
+            downscale=options.downscale,
+        )
+
+    detections: list[DetectedScene] = []
+    for coarse, (start_time, end_time) in zip(scene_list, refined_list):
+        preview_path: Path | None = None
+        image = capture.previews.get(coarse[0].get_frames()) if capture else None
+        if image is not None and capture_dir is not None:
+            preview_path = capture_dir / f"capture_{uuid.uuid4().hex}.jpg"
+            cv2.imwrite(str(preview_path), image, [cv2.IMWRITE_JPEG_QUALITY, 95])
+        detections.append(
+            DetectedScene(
+                start_time.get_seconds(),
+                end_time.get_seconds(),
+                {
+                    "start_timecode": str(start_time),
+                    "end_timecode": str(end_time),
+                },
+                preview_path,
+            )
+        )
+    return detections
+
+
+def detection_pool() -> ProcessPoolExecutor:
+    """Process-wide pool for ``detect_media_scenes``, created on first use.
+
+    Spawned so workers don't inherit model state; they only import this module.
+    """
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=get_settings().scene_detect_workers or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            atexit.register(shutdown_detection_pool)
+        return _pool
+
+
+def shutdown_detection_pool() -> None:
+    """Stop the shared pool; the next ``detection_pool`` call starts a new one."""
+
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
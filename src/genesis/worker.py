@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+from pathlib import Path
+from typing import Any
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from genesis.config import get_settings
+from genesis.models import Run, RunJob
+from genesis.services.pipeline import ProjectPipelineService
+from genesis.services.run_queue import RunQueueService
+
+logger = structlog.get_logger(__name__)
+
+
+class RunWorker:
+    """Claim queued runs and execute them with ``ProjectPipelineService``.
+
+    Each of ``concurrency`` slots processes one run at a time while a heartbeat
+    keeps its lease alive. If the lease is lost (e.g. the worker stalled past
+    ``job_lease_seconds`` and another worker took over) the run is cancelled here.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        worker_id: str | None = None,
+        concurrency: int | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency = concurrency or get_settings().worker_concurrency
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop claiming new runs; runs in progress are finished first."""
+
+        self._stopping.set()
+
+    async def run(self, *, drain: bool = False) -> None:
+        """Process runs until stopped, or until the queue is empty with ``drain``."""
+
+        logger.info("worker.start", worker_id=self.worker_id, concurrency=self.concurrency)
+        await asyncio.gather(*(self._slot(drain) for _ in range(self.concurrency)))
+        logger.info("worker.stop", worker_id=self.worker_id)
+
+    async def _slot(self, drain: bool) -> None:
+        poll_seconds = get_settings().job_poll_seconds
+        while not self._stopping.is_set():
+            async with self.session_factory() as session:
+                job = await RunQueueService(session).claim(self.worker_id)
+            if job is None:
+                if drain:
+                    return
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), poll_seconds)
+                except TimeoutError:
+                    pass
+                continue
+            await self._execute(job)
+
+    async def _execute(self, job: RunJob) -> None:
+        log = logger.bind(worker_id=self.worker_id, job_id=str(job.id), run_id=str(job.run_id))
+        log.info("worker.job_claimed", attempt=job.attempts)
+
+        processing = asyncio.ensure_future(self._process(job))
+        heartbeat = asyncio.ensure_future(self._heartbeat(job, processing))
+        try:
+            await processing
+        except asyncio.CancelledError:
+            if heartbeat.done() and not heartbeat.cancelled() and heartbeat.result():
+                log.warning("worker.lease_lost")
+                return
+            raise
+        except Exception as exc:
+            log.exception("worker.job_failed")
+            async with self.session_factory() as session:
+                await RunQueueService(session).fail(job.id, self.worker_id, str(exc))
+            return
+        finally:
+            if not heartbeat.done():
+                heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+        async with self.session_factory() as session:
+            await RunQueueService(session).complete(job.id, self.worker_id)
+        log.info("worker.job_completed")
+
+    async def _process(self, job: RunJob) -> None:
+        async with self.session_factory() as session:
+            run = await session.get(Run, job.run_id)
+            if run is None:
+                raise ValueError(f"Run {job.run_id} not found")
+            await ProjectPipelineService(session).process_project(
+                run.project_id, run.id, **_pipeline_options(job.options_json or {})
+            )
+
+    async def _heartbeat(self, job: RunJob, processing: asyncio.Future[None]) -> bool:
+        """Extend the lease until cancelled; returns ``True`` if the lease was lost."""
+
+        interval = get_settings().job_heartbeat_seconds
+        while True:
+            await asyncio.sleep(interval)
+            async with self.session_factory() as session:
+                held = await RunQueueService(session).heartbeat(job.id, self.worker_id)
+            if not held:
+                processing.cancel()
+                return True
+
+
+def _pipeline_options(options: dict[str, Any]) -> dict[str, Any]:
+    kwargs = {
+        key: options[key]
+        for key in ("voiceover_offset", "voiceover_gain", "bed_gain", "render_profile")
+        if key in options
+    }
+    if options.get("voiceover_path"):
+        kwargs["voiceover_path"] = Path(options["voiceover_path"])
+    return kwargs
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from pathlib import Path
+
+import pytest
+
+from genesis.config import RenderProfile, get_settings
+from genesis.models import MediaFile, Scene
+from genesis.services import assembly
+from genesis.services.assembly import AssemblyService
+from genesis.utils.cache import FileCache
+
+MEDIA = MediaFile(id=uuid.uuid4(), original_filename="clip.mp4", s3_key="/media/clip.mp4")
+SCENES = [
+    Scene(index=index, start_ms=index * 1000, end_ms=(index + 1) * 1000, media_file=MEDIA)
+    for index in range(4)
+]
+
+
+@pytest.fixture(autouse=True)
+def render_concurrency(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GENESIS_RENDER_CONCURRENCY", "2")
+    get_settings.cache_clear()
+
+
+def _fake_trims(monkeypatch: pytest.MonkeyPatch, fail_at: float | None = None) -> list[float]:
+    """Record trim starts; later scenes finish first and ``fail_at`` raises mid-write."""
+
+    started: list[float] = []
+
+    async def _trim_segment(video_path, start, end, output_path, **kwargs) -> None:
+        started.append(start)
+        output_path.write_bytes(b"partial")
+        if start == fail_at:
+            raise RuntimeError("ffmpeg command failed")
+        await asyncio.sleep(0.01 * (len(SCENES) - start))
+        output_path.write_bytes(f"{start}-{end}".encode())
+
+    monkeypatch.setattr(assembly, "trim_segment", _trim_segment)
+    return started
+
+
+async def _trim(temp_dir: Path, cache: FileCache | None = None) -> list[Path]:
+    temp_dir.mkdir(exist_ok=True)
+    return await AssemblyService(None)._trim_scenes(
+        SCENES,
+        temp_dir,
+        {MEDIA.id: Path(MEDIA.s3_key)},
+        {MEDIA.id: "abc"},
+        RenderProfile(),
+        cache,
+    )
+
+
+async def test_segments_come_back_in_scene_order(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    _fake_trims(monkeypatch)
+
+    segments = await _trim(tmp_path / "segments")
+
+    assert [segment.read_text() for segment in segments] == [
+        "0.0-1.0",
+        "1.0-2.0",
+        "2.0-3.0",
+        "3.0-4.0",
+    ]
+
+
+async def test_failed_trim_removes_every_partial_segment(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    started = _fake_trims(monkeypatch, fail_at=1.0)
+    temp_dir = tmp_path / "segments"
+
+    with pytest.raises(RuntimeError, match="ffmpeg command failed"):
+        await _trim(temp_dir)
+
+    # Two slots: scenes still waiting for one never start once a sibling fails.
+    assert started == [0.0, 1.0]
+    assert not temp_dir.exists()
+
+
+async def test_cached_segments_are_not_trimmed_again(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    started = _fake_trims(monkeypatch)
+    cache = FileCache("segments")
+
+    first = await _trim(tmp_path / "first", cache)
+    second = await _trim(tmp_path / "second", cache)
+
+    assert second == first
+    assert len(started) == len(SCENES)
+    assert list((tmp_path / "second").iterdir()) == []
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import math
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from genesis.utils.audio import (
+    ducking_curve,
+    integrated_loudness,
+    load_pcm_wav,
+    rms_envelope,
+    write_gain_commands,
+)
+
+
+def _write_wav(path: Path, samples: np.ndarray, sample_rate: int) -> Path:
+    """Write float samples in [-1, 1), shaped ``(frames, channels)``, as 16-bit PCM."""
+
+    pcm = np.round(samples * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(pcm.shape[1])
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+    return path
+
+
+def _sine(frequency: float, amplitude_db: float, seconds: float, sample_rate: int) -> np.ndarray:
+    time = np.arange(round(seconds * sample_rate)) / sample_rate
+    return 10 ** (amplitude_db / 20) * np.sin(2 * math.pi * frequency * time)
+
+
+def test_rms_envelope_of_constant_level(tmp_path: Path) -> None:
+    # 0.25 s at 8 kHz in 0.1 s frames: two whole frames plus a half frame.
+    samples = np.full((2000, 2), 0.5)
+    audio = load_pcm_wav(_write_wav(tmp_path / "dc.wav", samples, 8000))
+
+    envelope = rms_envelope(audio, 0.1)
+
+    assert envelope == pytest.approx([0.5, 0.5, 0.5], abs=1e-4)
+
+
+def test_integrated_loudness_of_reference_sine(tmp_path: Path) -> None:
+    # EBU Tech 3341: a 1 kHz stereo sine at -23 dBFS per channel reads -23 LUFS.
+    tone = _sine(1000.0, -23.0, 10.0, 48000)
+    audio = load_pcm_wav(_write_wav(tmp_path / "tone.wav", np.stack([tone, tone], axis=1), 48000))
+
+    assert integrated_loudness(audio) == pytest.approx(-23.0, abs=0.1)
+
+
+def test_integrated_loudness_gates_silence(tmp_path: Path) -> None:
+    tone = _sine(1000.0, -23.0, 5.0, 48000)
+    padded = np.concatenate([tone, np.zeros(5 * 48000)])[:, None]
+    silence = np.zeros((10 * 48000, 1))
+
+    tone_only = load_pcm_wav(_write_wav(tmp_path / "tone.wav", tone[:, None], 48000))
+    with_gap = load_pcm_wav(_write_wav(tmp_path / "padded.wav", padded, 48000))
+    silent = load_pcm_wav(_write_wav(tmp_path / "silent.wav", silence, 48000))
+
+    # Without gating the silent half would pull the reading down by 3 dB; only the
+    # blocks straddling the tone's end still count.
+    assert integrated_loudness(with_gap) == pytest.approx(integrated_loudness(tone_only), abs=0.3)
+    assert integrated_loudness(silent) == float("-inf")
+
+
+def test_ducking_curve_ramps_around_voice() -> None:
+    activity = np.array([False] * 10 + [True] * 5 + [False] * 10)
+
+    gains = ducking_curve(
+        activity, frame_seconds=0.1, duck_gain=0.25, attack_seconds=0.2, release_seconds=0.4
+    )
+
+    assert gains[:9] == pytest.approx([1.0] * 9)
+    # Attack ramps down over the two frames before voice starts.
+    assert gains[9] == pytest.approx(0.625)
+    assert gains[10:15] == pytest.approx([0.25] * 5)
+    # Release ramps back up over four frames after voice ends.
+    assert gains[15:19] == pytest.approx([0.4375, 0.625, 0.8125, 1.0])
+    assert gains[19:] == pytest.approx([1.0] * 6)
+
+
+def test_ducking_curve_without_voice_is_unity() -> None:
+    gains = ducking_curve(
+        np.zeros(8, dtype=bool),
+        frame_seconds=0.1,
+        duck_gain=0.25,
+        attack_seconds=0.2,
+        release_seconds=0.4,
+    )
+
+    assert gains == pytest.approx([1.0] * 8)
+
+
+def test_write_gain_commands_writes_only_changes(tmp_path: Path) -> None:
+    script = tmp_path / "duck.cmd"
+    gains = np.array([1.0, 1.0, 0.5, 0.5, 0.5, 1.0])
+
+    count = write_gain_commands(script, gains, frame_seconds=0.1, offset_seconds=2.0)
+
+    assert count == 3
+    assert script.read_text().splitlines() == [
+        "2.000 volume@duck volume 1.000;",
+        "2.200 volume@duck volume 0.500;",
+        "2.500 volume@duck volume 1.000;",
+    ]
+
+
+def test_write_gain_commands_with_no_frames(tmp_path: Path) -> None:
+    script = tmp_path / "duck.cmd"
+
+    assert write_gain_commands(script, np.array([]), frame_seconds=0.1) == 0
+    assert script.read_text() == ""
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from genesis.utils.cache import FileCache, cache_key, media_fingerprint
+
+
+def _write(path: Path, size: int, mtime: float | None = None) -> Path:
+    path.write_bytes(b"x" * size)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_cache_key_ignores_dict_order_but_not_part_order() -> None:
+    assert cache_key("segment", {"crf": 20, "preset": "fast"}) == cache_key(
+        "segment", {"preset": "fast", "crf": 20}
+    )
+    assert cache_key("a", "b") != cache_key("b", "a")
+    assert cache_key("segment", 0, 1000) != cache_key("segment", 0, 1001)
+
+
+def test_media_fingerprint_prefers_checksum(tmp_path: Path) -> None:
+    media = _write(tmp_path / "clip.mp4", 10)
+
+    assert media_fingerprint(media, "abc123") == "abc123"
+
+    before = media_fingerprint(media)
+    assert media_fingerprint(media) == before
+    _write(media, 20)
+    assert media_fingerprint(media) != before
+
+
+def test_store_then_lookup(tmp_path: Path) -> None:
+    cache = FileCache("segments")
+    assert cache.lookup("key", ".mp4") is None
+
+    source = _write(tmp_path / "render.mp4", 10)
+    stored = cache.store("key", source)
+
+    assert not source.exists()
+    assert stored == cache.path_for("key", ".mp4")
+    assert cache.lookup("key", ".mp4") == stored
+
+
+def test_lookup_marks_entry_recently_used() -> None:
+    cache = FileCache("segments")
+    entry = _write(cache.path_for("key", ".mp4"), 10, mtime=1_000)
+
+    cache.lookup("key", ".mp4")
+
+    assert entry.stat().st_mtime > 1_000
+
+
+def test_evict_drops_least_recently_used_first() -> None:
+    cache = FileCache("segments", max_bytes=20)
+    oldest = _write(cache.path_for("a", ".mp4"), 10, mtime=1_000)
+    middle = _write(cache.path_for("b", ".mp4"), 10, mtime=2_000)
+    newest = _write(cache.path_for("c", ".mp4"), 10, mtime=3_000)
+
+    assert cache.evict() == 10
+    assert not oldest.exists()
+    assert middle.exists() and newest.exists()
+
+
+def test_evict_skips_protected_entries() -> None:
+    cache = FileCache("segments", max_bytes=20)
+    oldest = _write(cache.path_for("a", ".mp4"), 10, mtime=1_000)
+    middle = _write(cache.path_for("b", ".mp4"), 10, mtime=2_000)
+    _write(cache.path_for("c", ".mp4"), 10, mtime=3_000)
+
+    assert cache.evict(protect=[oldest]) == 10
+    assert oldest.exists()
+    assert not middle.exists()
+
+
+def test_evict_without_cap_keeps_everything() -> None:
+    cache = FileCache("segments")
+    entry = _write(cache.path_for("a", ".mp4"), 10)
+
+    assert cache.evict() == 0
+    assert entry.exists()
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from genesis.config import Settings
+from genesis.utils import ffmpeg
+from genesis.utils.ffmpeg import VideoStreamFormat, probe_keyframes, probe_media, trim_segment
+
+STREAM_FORMAT = VideoStreamFormat(
+    codec="h264",
+    profile="Main",
+    level=30,
+    pix_fmt="yuv420p",
+    width=320,
+    height=240,
+    time_base="1/12800",
+)
+
+
+@pytest.fixture
+def spans(monkeypatch: pytest.MonkeyPatch) -> list[tuple]:
+    """Record span encodes/copies/concats instead of running ffmpeg."""
+
+    calls: list[tuple] = []
+
+    async def _encode_span(video_path, start, end, output_path, profile, stream_format=None):
+        calls.append(("encode", start, end))
+        output_path.write_bytes(b"encoded")
+
+    async def _copy_span(video_path, start, end, output_path, profile, stream_format):
+        calls.append(("copy", start, end))
+        output_path.write_bytes(b"copied")
+
+    async def _concat(segments, output_path, **kwargs):
+        segments = list(segments)
+        assert all(segment.exists() for segment in segments)
+        calls.append(("concat", len(segments)))
+        output_path.write_bytes(b"joined")
+
+    monkeypatch.setattr(ffmpeg, "_encode_span", _encode_span)
+    monkeypatch.setattr(ffmpeg, "_copy_span", _copy_span)
+    monkeypatch.setattr(ffmpeg, "render_concatenation", _concat)
+    return calls
+
+
+async def test_trim_without_keyframes_reencodes(spans: list[tuple], tmp_path: Path) -> None:
+    await trim_segment(Path("in.mp4"), 0.5, 3.7, tmp_path / "out.mp4")
+
+    assert spans == [("encode", 0.5, 3.7)]
+
+
+async def test_smart_trim_needs_stream_format(spans: list[tuple], tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        await trim_segment(Path("in.mp4"), 0.5, 3.7, tmp_path / "out.mp4", keyframes=[0.0, 1.0])
+
+
+async def test_smart_trim_without_whole_gop_reencodes(spans: list[tuple], tmp_path: Path) -> None:
+    await trim_segment(
+        Path("in.mp4"),
+        0.5,
+        1.9,
+        tmp_path / "out.mp4",
+        keyframes=[0.0, 1.0, 2.0],
+        stream_format=STREAM_FORMAT,
+    )
+
+    assert spans == [("encode", 0.5, 1.9)]
+
+
+async def test_keyframe_aligned_trim_is_a_single_copy(spans: list[tuple], tmp_path: Path) -> None:
+    output = tmp_path / "out.mp4"
+
+    await trim_segment(
+        Path("in.mp4"),
+        1.01,
+        3.0,
+        output,
+        keyframes=[0.0, 1.0, 2.0, 3.0, 4.0],
+        stream_format=STREAM_FORMAT,
+    )
+
+    assert spans == [("copy", 1.0, 3.0)]
+    assert output.read_bytes() == b"copied"
+
+
+async def test_smart_trim_encodes_partial_gops_and_copies_the_rest(
+    spans: list[tuple], tmp_path: Path
+) -> None:
+    output = tmp_path / "out.mp4"
+
+    await trim_segment(
+        Path("in.mp4"),
+        0.5,
+        3.7,
+        output,
+        keyframes=[0.0, 1.0, 2.0, 3.0, 4.0],
+        stream_format=STREAM_FORMAT,
+    )
+
+    assert spans == [
+        ("encode", 0.5, 1.0),
+        ("copy", 1.0, 3.0),
+        ("encode", 3.0, 3.7),
+        ("concat", 3),
+    ]
+    assert output.read_bytes() == b"joined"
+    assert [path.name for path in tmp_path.iterdir()] == ["out.mp4"]
+
+
+async def test_smart_trim_removes_parts_on_failure(
+    spans: list[tuple], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def _fail(*args, **kwargs):
+        raise RuntimeError("ffmpeg command failed")
+
+    monkeypatch.setattr(ffmpeg, "render_concatenation", _fail)
+
+    with pytest.raises(RuntimeError):
+        await trim_segment(
+            Path("in.mp4"),
+            0.5,
+            3.7,
+            tmp_path / "out.mp4",
+            keyframes=[0.0, 1.0, 2.0, 3.0, 4.0],
+            stream_format=STREAM_FORMAT,
+        )
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.fixture
+def ffmpeg_binaries(settings: Settings) -> Settings:
+    for binary in (settings.ffmpeg_binary, settings.ffprobe_binary):
+        if shutil.which(binary) is None:
+            pytest.skip(f"{binary} is not available")
+    return settings
+
+
+def _frame_psnr(settings: Settings, first: Path, second: Path, stats: Path) -> list[float]:
+    subprocess.run(
+        [
+            settings.ffmpeg_binary,
+            "-v",
+            "error",
+            "-i",
+            str(first),
+            "-i",
+            str(second),
+            "-lavfi",
+            f"[0:v][1:v]psnr=stats_file={stats.as_posix()}:shortest=1",
+            "-f",
+            "null",
+            "-",
+        ],
+        check=True,
+    )
+    values = []
+    for line in stats.read_text().splitlines():
+        fields = dict(field.split(":", 1) for field in line.split())
+        values.append(float(fields["psnr_avg"]))
+    return values
+
+
+async def test_smart_trim_decodes_like_a_full_reencode(
+    ffmpeg_binaries: Settings, tmp_path: Path
+) -> None:
+    # CAVLC with one reference frame: parameter sets libx264's defaults never
+    # produce, with B-frames so copied packets are reordered.
+    source = tmp_path / "source.mp4"
+    subprocess.run(
+        [
+            ffmpeg_binaries.ffmpeg_binary,
+            "-v",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            "testsrc2=size=320x240:rate=25:duration=5",
+            "-f",
+            "lavfi",
+            "-i",
+            "sine=duration=5",
+            "-c:v",
+            "libx264",
+            "-profile:v",
+            "main",
+            "-pix_fmt",
+            "yuv420p",
+            "-x264-params",
+            "cabac=0:ref=1:keyint=25:min-keyint=25:scenecut=0",
+            "-c:a",
+            "aac",
+            "-shortest",
+            str(source),
+        ],
+        check=True,
+    )
+    info = probe_media(source)
+    stream_format = VideoStreamFormat(
+        codec=info.video_codec,
+        profile=info.video_profile,
+        level=info.video_level,
+        pix_fmt=info.pix_fmt,
+        width=info.width,
+        height=info.height,
+        time_base=info.video_time_base,
+    )
+
+    smart = tmp_path / "smart.mp4"
+    reference = tmp_path / "reference.mp4"
+    await trim_segment(
+        source,
+        0.5,
+        3.7,
+        smart,
+        keyframes=probe_keyframes(source),
+        stream_format=stream_format,
+    )
+    await trim_segment(source, 0.5, 3.7, reference)
+
+    decode = subprocess.run(
+        [
+            ffmpeg_binaries.ffmpeg_binary,
+            "-v",
+            "error",
+            "-xerror",
+            "-i",
+            str(smart),
+            "-f",
+            "null",
+            "-",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert decode.returncode == 0 and decode.stderr == ""
+    # Each extra cut can round up to the frame covering it.
+    assert probe_media(smart).duration_ms == pytest.approx(
+        probe_media(reference).duration_ms, abs=2 * 40
+    )
+    # Frames decoded with the wrong SPS/PPS come out as garbage (well under 20 dB).
+    assert min(_frame_psnr(ffmpeg_binaries, smart, reference, tmp_path / "psnr.log")) > 30
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from genesis.models import MediaFile, Project
+from genesis.services import media_probe
+from genesis.services.media_probe import MediaProbeService
+from genesis.utils.ffmpeg import MediaInfo
+
+
+@pytest.fixture
+def ffprobe_calls(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, Path]]:
+    calls: list[tuple[str, Path]] = []
+
+    def _probe_media(media_path: Path) -> MediaInfo:
+        calls.append(("probe", media_path))
+        return MediaInfo(
+            duration_ms=4000,
+            fps=25.0,
+            width=320,
+            height=240,
+            video_codec="h264",
+            video_profile="Main",
+            video_level=30,
+            pix_fmt="yuv420p",
+            video_time_base="1/12800",
+            audio_codec="aac",
+            audio_channels=2,
+            audio_channel_layout="stereo",
+            audio_sample_rate=48000,
+            format_name="mov,mp4,m4a,3gp,3g2,mj2",
+        )
+
+    def _probe_keyframes(media_path: Path) -> list[float]:
+        calls.append(("keyframes", media_path))
+        return [0.0, 2.0]
+
+    monkeypatch.setattr(media_probe, "probe_media", _probe_media)
+    monkeypatch.setattr(media_probe, "probe_keyframes", _probe_keyframes)
+    return calls
+
+
+async def _media(session_factory, checksums: list[str]) -> list[MediaFile]:
+    async with session_factory() as session:
+        project = Project(title="Bakery crawl")
+        session.add(project)
+        await session.flush()
+        media_files = [
+            MediaFile(
+                project_id=project.id,
+                original_filename=f"clip{index}.mp4",
+                s3_key=f"/media/clip{index}.mp4",
+                checksum=checksum,
+            )
+            for index, checksum in enumerate(checksums)
+        ]
+        session.add_all(media_files)
+        await session.commit()
+        return media_files
+
+
+async def test_probe_many_skips_the_keyframe_scan(session_factory, ffprobe_calls) -> None:
+    media_files = await _media(session_factory, ["abc", "def"])
+
+    async with session_factory() as session:
+        probes = await MediaProbeService(session).probe_many(media_files)
+
+    assert [kind for kind, _ in ffprobe_calls] == ["probe", "probe"]
+    assert all(probe.keyframes is None for probe in probes.values())
+
+
+async def test_keyframes_are_scanned_once_per_checksum(session_factory, ffprobe_calls) -> None:
+    media_files = await _media(session_factory, ["abc", "abc", "def"])
+
+    async with session_factory() as session:
+        keyframes = await MediaProbeService(session).keyframes_many(media_files)
+        await session.commit()
+    async with session_factory() as session:
+        again = await MediaProbeService(session).keyframes_many(media_files)
+
+    assert keyframes == again == {media.id: [0.0, 2.0] for media in media_files}
+    scans = [path for kind, path in ffprobe_calls if kind == "keyframes"]
+    assert scans == [Path("/media/clip0.mp4"), Path("/media/clip2.mp4")]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from genesis.config import get_settings
+from genesis.models import MediaFile, Project
+from genesis.services.pipeline import ProjectPipelineService
+
+
+@pytest.fixture
+async def project_id(session_factory) -> uuid.UUID:
+    async with session_factory() as session:
+        project = Project(title="Bakery crawl")
+        session.add(project)
+        await session.flush()
+        session.add(
+            MediaFile(
+                project_id=project.id,
+                original_filename="clip.mp4",
+                s3_key="/media/clip.mp4",
+                checksum="abc",
+            )
+        )
+        await session.commit()
+        return project.id
+
+
+async def _fingerprints(session_factory, project_id: uuid.UUID) -> dict[str, str]:
+    async with session_factory() as session:
+        pipeline = ProjectPipelineService(session)
+        return pipeline._stage_fingerprints(await pipeline._load_project(project_id))
+
+
+async def test_unchanged_inputs_keep_every_fingerprint(session_factory, project_id) -> None:
+    assert await _fingerprints(session_factory, project_id) == await _fingerprints(
+        session_factory, project_id
+    )
+
+
+@pytest.mark.parametrize(
+    ("name", "value", "changed"),
+    [
+        ("GENESIS_WHISPER_BEAM_SIZE", "1", {"transcription", "chapters"}),
+        ("GENESIS_WHISPER_BATCH_SIZE", "8", {"transcription", "chapters"}),
+        ("GENESIS_SCENE_PREVIEW_MODE", "fused", {"scene_detection", "chapters"}),
+        ("GENESIS_CAPTION_MODEL_NAME", "other/blip", {"scene_detection", "chapters"}),
+    ],
+)
+async def test_settings_invalidate_only_the_stages_they_feed(
+    session_factory,
+    project_id,
+    monkeypatch: pytest.MonkeyPatch,
+    name: str,
+    value: str,
+    changed: set[str],
+) -> None:
+    before = await _fingerprints(session_factory, project_id)
+    monkeypatch.setenv(name, value)
+    get_settings.cache_clear()
+    after = await _fingerprints(session_factory, project_id)
+
+    assert {stage for stage in before if before[stage] != after[stage]} == changed
+
+
+async def test_replaced_media_invalidates_every_stage(session_factory, project_id) -> None:
+    before = await _fingerprints(session_factory, project_id)
+    async with session_factory() as session:
+        project = await ProjectPipelineService(session)._load_project(project_id)
+        project.media_files[0].checksum = "def"
+        await session.commit()
+    after = await _fingerprints(session_factory, project_id)
+
+    assert all(before[stage] != after[stage] for stage in before)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from genesis.models import Project, Run, RunJob, RunJobStatus, RunState
+from genesis.models.mixins import utcnow
+from genesis.services.run_queue import RunQueueService
+
+
+async def _enqueue(
+    session_factory: async_sessionmaker[AsyncSession], count: int = 1
+) -> list[RunJob]:
+    async with session_factory() as session:
+        project = Project(title="Bakery crawl")
+        session.add(project)
+        await session.flush()
+        jobs = []
+        for _ in range(count):
+            run = Run(project_id=project.id, state=RunState.PENDING)
+            session.add(run)
+            await session.flush()
+            jobs.append(await RunQueueService(session).enqueue(run))
+        await session.commit()
+        return jobs
+
+
+async def _expire_lease(session_factory: async_sessionmaker[AsyncSession], job: RunJob) -> None:
+    async with session_factory() as session:
+        await session.execute(
+            update(RunJob)
+            .where(RunJob.id == job.id)
+            .values(lease_expires_at=utcnow() - timedelta(seconds=1))
+        )
+        await session.commit()
+
+
+async def test_claim_leases_the_oldest_queued_job(session_factory, settings) -> None:
+    jobs = await _enqueue(session_factory, count=3)
+    # Enqueue order is deliberately the reverse of id order, so a claim that
+    # fell back to the random ids would pick the wrong job.
+    jobs.sort(key=lambda job: job.id, reverse=True)
+    enqueued_at = utcnow()
+    async with session_factory() as session:
+        for position, queued in enumerate(jobs):
+            await session.execute(
+                update(RunJob)
+                .where(RunJob.id == queued.id)
+                .values(enqueued_at=enqueued_at + timedelta(microseconds=position))
+            )
+        await session.commit()
+
+    async with session_factory() as session:
+        queue = RunQueueService(session)
+        claimed = [await queue.claim(f"worker-{index}") for index in range(3)]
+
+    assert [job.id for job in claimed] == [queued.id for queued in jobs]
+    job = claimed[0]
+    assert job.status == RunJobStatus.RUNNING
+    assert job.lease_owner == "worker-0"
+    assert job.attempts == 1
+    assert job.lease_expires_at > utcnow() + timedelta(
+        seconds=settings.job_lease_seconds - 5
+    )
+
+
+async def test_claim_returns_none_when_queue_is_empty(session_factory) -> None:
+    async with session_factory() as session:
+        assert await RunQueueService(session).claim("worker-a") is None
+
+
+async def test_concurrent_workers_never_share_a_job(session_factory) -> None:
+    await _enqueue(session_factory)
+
+    async def _claim(worker_id: str) -> RunJob | None:
+        async with session_factory() as session:
+            return await RunQueueService(session).claim(worker_id)
+
+    claimed = await asyncio.gather(*(_claim(f"worker-{index}") for index in range(4)))
+
+    assert len([job for job in claimed if job is not None]) == 1
+
+
+async def test_heartbeat_only_extends_the_owners_lease(session_factory) -> None:
+    await _enqueue(session_factory)
+    async with session_factory() as session:
+        queue = RunQueueService(session)
+        job = await queue.claim("worker-a")
+        assert job is not None
+
+        assert await queue.heartbeat(job.id, "worker-a")
+        assert not await queue.heartbeat(job.id, "worker-b")
+
+        await queue.complete(job.id, "worker-a")
+        assert not await queue.heartbeat(job.id, "worker-a")
+
+
+async def test_expired_lease_is_requeued(session_factory) -> None:
+    await _enqueue(session_factory)
+    async with session_factory() as session:
+        job = await RunQueueService(session).claim("worker-a")
+    assert job is not None
+    await _expire_lease(session_factory, job)
+
+    async with session_factory() as session:
+        reclaimed = await RunQueueService(session).claim("worker-b")
+
+    assert reclaimed is not None and reclaimed.id == job.id
+    assert reclaimed.lease_owner == "worker-b"
+    assert reclaimed.attempts == 2
+
+
+async def test_expired_lease_out_of_attempts_fails_the_run(
+    session_factory, settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "job_max_attempts", 1)
+    (queued,) = await _enqueue(session_factory)
+    async with session_factory() as session:
+        job = await RunQueueService(session).claim("worker-a")
+    assert job is not None
+    await _expire_lease(session_factory, job)
+
+    async with session_factory() as session:
+        assert await RunQueueService(session).claim("worker-b") is None
+        failed = await session.get(RunJob, job.id)
+        run = await session.get(Run, queued.run_id)
+
+    assert failed.status == RunJobStatus.FAILED
+    assert run.state == RunState.FAILED
+    assert "lease expired" in run.error_message
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from genesis.orchestration.stage_graph import Stage, StageGraphExecutor
+
+
+async def _execute(
+    stages: list[Stage],
+    session_factory: async_sessionmaker[AsyncSession],
+    events: list[tuple[str, str]],
+    limits: dict[str, int] | None = None,
+) -> dict[str, dict[str, Any]]:
+    async def _on_start(stage: Stage) -> None:
+        events.append(("start", stage.name))
+
+    async def _on_finish(stage: Stage, details: dict[str, Any]) -> None:
+        events.append(("finish", stage.name))
+
+    executor = StageGraphExecutor(session_factory, limits=limits or {"cpu": 4, "model": 1})
+    return await executor.execute(stages, on_start=_on_start, on_finish=_on_finish)
+
+
+def _stage(name: str, *, delay: float = 0.0, **kwargs: Any) -> Stage:
+    async def _run(session: AsyncSession) -> dict[str, Any]:
+        await asyncio.sleep(delay)
+        return {"stage": name}
+
+    return Stage(name, _run, **kwargs)
+
+
+async def test_stages_start_after_their_dependencies(session_factory) -> None:
+    events: list[tuple[str, str]] = []
+    stages = [
+        _stage("assembly", depends_on=("chapters", "scenes")),
+        _stage("probe", delay=0.01),
+        _stage("scenes", depends_on=("probe",), delay=0.02),
+        _stage("chapters", depends_on=("probe",)),
+    ]
+
+    results = await _execute(stages, session_factory, events)
+
+    assert results == {
+        name: {"stage": name} for name in ("probe", "scenes", "chapters", "assembly")
+    }
+    position = {event: index for index, event in enumerate(events)}
+    for stage in stages:
+        for dependency in stage.depends_on:
+            assert position[("finish", dependency)] < position[("start", stage.name)]
+
+
+async def test_resource_limits_bound_concurrent_stages(session_factory) -> None:
+    running: dict[str, int] = {"cpu": 0, "model": 0}
+    peak: dict[str, int] = {"cpu": 0, "model": 0}
+
+    def _tracked(name: str, resource: str) -> Stage:
+        async def _run(session: AsyncSession) -> dict[str, Any]:
+            running[resource] += 1
+            peak[resource] = max(peak[resource], running[resource])
+            await asyncio.sleep(0.01)
+            running[resource] -= 1
+            return {}
+
+        return Stage(name, _run, resource=resource)
+
+    stages = [_tracked(f"cpu_{index}", "cpu") for index in range(4)] + [
+        _tracked(f"model_{index}", "model") for index in range(3)
+    ]
+    await _execute(stages, session_factory, [], limits={"cpu": 2, "model": 1})
+
+    assert peak == {"cpu": 2, "model": 1}
+
+
+async def test_failure_cancels_running_siblings(session_factory) -> None:
+    cancelled = asyncio.Event()
+
+    async def _slow(session: AsyncSession) -> dict[str, Any]:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return {}
+
+    async def _broken(session: AsyncSession) -> dict[str, Any]:
+        raise RuntimeError("decode failed")
+
+    events: list[tuple[str, str]] = []
+    stages = [
+        Stage("slow", _slow),
+        Stage("broken", _broken),
+        _stage("after", depends_on=("broken",)),
+    ]
+
+    with pytest.raises(RuntimeError, match="decode failed"):
+        await _execute(stages, session_factory, events)
+
+    assert cancelled.is_set()
+    assert ("start", "after") not in events
+
+
+@pytest.mark.parametrize(
+    ("stages", "message"),
+    [
+        ([_stage("a"), _stage("a")], "Duplicate"),
+        ([_stage("a", depends_on=("missing",))], "unknown"),
+        ([_stage("a", depends_on=("b",)), _stage("b", depends_on=("a",))], "cycle"),
+    ],
+)
+async def test_invalid_graphs_are_rejected(stages: list[Stage], message: str) -> None:
+    events: list[tuple[str, str]] = []
+
+    with pytest.raises(ValueError, match=message):
+        await _execute(stages, async_sessionmaker(), events)
+
+    assert events == []
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm import selectinload
+
+from genesis.config import get_settings
+from genesis.models import MediaFile, Project, Transcript
+from genesis.services import audio, media_probe
+from genesis.services.transcription import (
+    TRANSCRIPT_IN_PROGRESS,
+    TranscriptionService,
+    _segment_row,
+)
+from genesis.utils.ffmpeg import MediaInfo
+
+SEGMENTS = [
+    {"id": 1, "start": 0.0, "end": 1.5, "text": "Fresh bread.", "avg_logprob": -0.2},
+    {"id": 2, "start": 1.5, "end": 3.0, "text": "Still warm.", "avg_logprob": -0.3},
+]
+
+
+async def _transcribed_twin(session_factory) -> tuple[MediaFile, MediaFile]:
+    """One transcribed file and an untranscribed copy of it in another project."""
+
+    async with session_factory() as session:
+        projects = [Project(title="Bakery crawl"), Project(title="Bakery crawl, recut")]
+        session.add_all(projects)
+        await session.flush()
+        source, twin = (
+            MediaFile(
+                project_id=project.id,
+                original_filename="clip.mp4",
+                s3_key=f"/media/{index}/clip.mp4",
+                checksum="abc",
+            )
+            for index, project in enumerate(projects)
+        )
+        session.add_all([source, twin])
+        await session.flush()
+        TranscriptionService(session)._store_transcript(
+            source, SEGMENTS, {"duration": 3.0, "language": "en"}
+        )
+        await session.commit()
+        return source, twin
+
+
+async def test_cached_transcript_is_cloned_with_its_segments(session_factory) -> None:
+    source, twin = await _transcribed_twin(session_factory)
+
+    async with session_factory() as session:
+        twin = await session.get(MediaFile, twin.id)
+        twin.transcript = None
+        reused, pending = await TranscriptionService(session)._reuse_cached_transcripts([twin])
+        await session.refresh(reused[0], ["segments"])
+
+    assert pending == []
+    [clone] = reused
+    assert clone.media_file_id == twin.id
+    assert clone.text == "Fresh bread. Still warm."
+    assert [(s.segment_index, s.start_ms, s.end_ms) for s in clone.segments] == [
+        (1, 0, 1500),
+        (2, 1500, 3000),
+    ]
+    assert all(s.media_file_id == twin.id for s in clone.segments)
+
+
+@pytest.mark.parametrize(
+    ("name", "value"),
+    [
+        ("GENESIS_WHISPER_MODEL_SIZE", "medium"),
+        ("GENESIS_WHISPER_BEAM_SIZE", "1"),
+        ("GENESIS_WHISPER_WORD_TIMESTAMPS", "true"),
+        ("GENESIS_WHISPER_BATCH_SIZE", "8"),
+    ],
+)
+async def test_cached_transcript_needs_matching_whisper_settings(
+    session_factory, monkeypatch: pytest.MonkeyPatch, name: str, value: str
+) -> None:
+    source, twin = await _transcribed_twin(session_factory)
+    monkeypatch.setenv(name, value)
+    get_settings.cache_clear()
+
+    async with session_factory() as session:
+        assert await TranscriptionService(session)._find_cached_transcript(twin) is None
+
+
+@pytest.fixture
+def whisper_runs(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> list[Path]:
+    """Answer probes, audio extraction and whisper without running ffmpeg or a model."""
+
+    runs: list[Path] = []
+
+    def _probe_media(media_path: Path) -> MediaInfo:
+        return MediaInfo(
+            duration_ms=3000,
+            fps=None,
+            width=None,
+            height=None,
+            video_codec=None,
+            video_profile=None,
+            video_level=None,
+            pix_fmt=None,
+            video_time_base=None,
+            audio_codec="aac",
+            audio_channels=1,
+            audio_channel_layout="mono",
+            audio_sample_rate=48000,
+            format_name="wav",
+        )
+
+    async def _extract_audio_pcm(media_path: Path, output_path: Path, sample_rate: int) -> None:
+        output_path.write_bytes(b"\0" * 1024)
+
+    async def _run_whisper(self, audio_path: Path):
+        # The WAV must still be cached when its turn on the model comes.
+        assert audio_path.exists()
+        runs.append(audio_path)
+        await asyncio.sleep(0)
+        return SEGMENTS, {"duration": 3.0, "language": "en"}
+
+    monkeypatch.setattr(media_probe, "probe_media", _probe_media)
+    monkeypatch.setattr(audio, "extract_audio_pcm", _extract_audio_pcm)
+    monkeypatch.setattr(TranscriptionService, "_run_whisper", _run_whisper)
+    return runs
+
+
+async def test_transcripts_from_other_whisper_settings_are_redone(
+    session_factory, whisper_runs: list[Path], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"")
+    async with session_factory() as session:
+        project = Project(title="Bakery crawl")
+        session.add(project)
+        await session.flush()
+        media = MediaFile(project_id=project.id, original_filename="clip.mp4", s3_key=str(clip))
+        session.add(media)
+        await session.commit()
+
+    async def _transcript():
+        async with session_factory() as session:
+            await TranscriptionService(session).transcribe_project(project.id)
+        async with session_factory() as session:
+            stored = await session.get(
+                MediaFile, media.id, options=(selectinload(MediaFile.transcript),)
+            )
+            return stored.transcript
+
+    first = await _transcript()
+    assert (await _transcript()).id == first.id
+    assert len(whisper_runs) == 1
+
+    monkeypatch.setenv("GENESIS_WHISPER_BEAM_SIZE", "1")
+    get_settings.cache_clear()
+    redone = await _transcript()
+
+    assert len(whisper_runs) == 2
+    assert redone.id != first.id
+    assert redone.decode_options.startswith("beam=1;")
+
+
+async def test_finished_stream_keeps_segments_in_metadata(session_factory) -> None:
+    async with session_factory() as session:
+        project = Project(title="Bakery crawl")
+        session.add(project)
+        await session.flush()
+        media = MediaFile(project_id=project.id, original_filename="clip.mp4", s3_key="clip.mp4")
+        session.add(media)
+        await session.flush()
+        transcript = Transcript(
+            media_file_id=media.id, text="", metadata_json={"status": TRANSCRIPT_IN_PROGRESS}
+        )
+        session.add(transcript)
+        await session.flush()
+        session.add_all(_segment_row(transcript, media, segment) for segment in SEGMENTS)
+        await session.commit()
+
+        await TranscriptionService(session)._finish_streamed_transcript(transcript, media)
+
+    assert transcript.text == "Fresh bread. Still warm."
+    assert transcript.metadata_json["segments"] == SEGMENTS
+    assert transcript.metadata_json["segment_count"] == 2
+
+
+async def test_audio_cache_keeps_every_file_a_run_needs(
+    session_factory, whisper_runs: list[Path], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    # Room for one extracted WAV only.
+    monkeypatch.setenv("GENESIS_AUDIO_CACHE_MAX_BYTES", "1024")
+    get_settings.cache_clear()
+    async with session_factory() as session:
+        project = Project(title="Bakery crawl")
+        session.add(project)
+        await session.flush()
+        for index in range(3):
+            clip = tmp_path / f"clip{index}.mp4"
+            clip.write_bytes(b"")
+            session.add(
+                MediaFile(
+                    project_id=project.id,
+                    original_filename=clip.name,
+                    s3_key=str(clip),
+                    checksum=f"clip{index}",
+                )
+            )
+        await session.commit()
+
+        await TranscriptionService(session).transcribe_project(project.id)
+
+    # Over the cap, but only older runs' files are evicted to make room.
+    assert len(whisper_runs) == 3
+    assert all(path.exists() for path in whisper_runs)